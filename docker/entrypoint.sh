@@ -27,6 +27,7 @@ log "=============================================="
 log "Timezone      : ${TZ}"
 log "Cron schedule : ${CRON_SCHEDULE}"
 log "Scraper flags : ${SCRAPER_FLAGS}"
+log "Change filter : ${SIGNIFICANCE_FLAGS:-defaults}"
 log "Git branch    : ${GIT_BRANCH}"
 log "Run on startup: ${RUN_ON_STARTUP}"
 
@@ -93,7 +94,7 @@ fi
 log "Setting up cron schedule: ${CRON_SCHEDULE}"
 
 # Export all environment variables for cron
-printenv | grep -E '^(OPENAI_API_KEY|GITHUB_TOKEN|GITHUB_REPO|GIT_USER_NAME|GIT_USER_EMAIL|GIT_BRANCH|SCRAPER_FLAGS|TZ|PATH|HOME|PYTHONUNBUFFERED|PYTHONDONTWRITEBYTECODE)=' \
+printenv | grep -E '^(OPENAI_API_KEY|GITHUB_TOKEN|GITHUB_REPO|GIT_USER_NAME|GIT_USER_EMAIL|GIT_BRANCH|SCRAPER_FLAGS|SIGNIFICANCE_FLAGS|TZ|PATH|HOME|PYTHONUNBUFFERED|PYTHONDONTWRITEBYTECODE)=' \
     > /app/env.sh
 
 # Create cron job file
@@ -4,8 +4,10 @@
 #
 # Called by cron or on startup. This script:
 #   1. Pulls the latest code from GitHub
-#   2. Runs the scraper with configured flags
-#   3. Commits and pushes any data changes
+#   2. Runs the scraper with configured flags into a scratch file
+#   3. Publishes the scrape only if a visitor would see a difference
+#      (significant_changes.py; small churn goes to a side cache)
+#   4. Commits and pushes any data changes
 # =============================================================================
 set -euo pipefail
 
@@ -40,7 +42,12 @@ log "Repository updated."
 log "Running scraper with flags: ${SCRAPER_FLAGS:-}"
 SCRAPE_START=$(date +%s)
 
-python3 scripts/scrape_alternatives_optimized.py ${SCRAPER_FLAGS:-} --stats || {
+# Scrape into a scratch copy; --update reads the existing data from --output
+CANDIDATE=$(mktemp /tmp/lovevery_alternatives.XXXXXX.json)
+trap 'rm -f "$CANDIDATE"' EXIT
+cp scripts/lovevery_alternatives.json "$CANDIDATE"
+
+python3 scripts/scrape_alternatives_optimized.py ${SCRAPER_FLAGS:-} --stats --output "$CANDIDATE" || {
     log "ERROR: Scraper exited with non-zero status ($?)"
     log "====== Scraper run FAILED ======"
     exit 1
@@ -50,6 +57,19 @@ SCRAPE_END=$(date +%s)
 SCRAPE_DURATION=$(( SCRAPE_END - SCRAPE_START ))
 log "Scraper finished in ${SCRAPE_DURATION} seconds."
 
+# Every scrape goes into the local history, published or not
+python3 scripts/price_history.py record -i "$CANDIDATE" || log "WARNING: Could not record price history"
+
+# ---------------------------------------------------------------------------
+# Keep only user-visible changes
+# ---------------------------------------------------------------------------
+log "Filtering insignificant changes with flags: ${SIGNIFICANCE_FLAGS:-}"
+python3 scripts/significant_changes.py --candidate "$CANDIDATE" ${SIGNIFICANCE_FLAGS:-} || {
+    log "ERROR: Change filter exited with non-zero status ($?)"
+    log "====== Scraper run FAILED ======"
+    exit 1
+}
+
 # ---------------------------------------------------------------------------
 # Check for changes and push
 # ---------------------------------------------------------------------------
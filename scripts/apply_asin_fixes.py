@@ -4,10 +4,14 @@ Apply ASIN fixes to lovevery_alternatives.json using the mapping from parallel s
 Also handles the 2 failed searches and 6 same-ASIN cases that need manual attention.
 """
 import json
+import os
 
-# Load the alternatives data
-with open('/home/ubuntu/loveveryfans/scripts/lovevery_alternatives.json', 'r') as f:
-    data = json.load(f)
+from catalog_store import open_alternatives
+
+# Load the alternatives data (through the catalog store when CATALOG_DB is set)
+catalog = open_alternatives('/home/ubuntu/loveveryfans/scripts/lovevery_alternatives.json',
+                            os.environ.get('CATALOG_DB'))
+data = catalog.data
 
 # Load the ASIN mapping
 with open('/home/ubuntu/loveveryfans/scripts/asin_mapping.json', 'r') as f:
@@ -166,8 +170,7 @@ for kit in data:
                 alt['price'] = price
 
 # Save updated data
-with open('/home/ubuntu/loveveryfans/scripts/lovevery_alternatives.json', 'w') as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
+catalog.save()
 
 print(f"\n{'='*60}")
 print(f"Total changes: {changes}")
@@ -1,16 +1,17 @@
 #!/usr/bin/env python3
 """Apply all fixes to lovevery_alternatives.json based on comprehensive audit."""
 
-import json
+import os
 import re
 
+from catalog_store import open_alternatives
+
 def load_data():
-    with open('/Users/gzxultra/Dev/loveveryfans/scripts/lovevery_alternatives.json', 'r') as f:
-        return json.load(f)
+    return open_alternatives('/Users/gzxultra/Dev/loveveryfans/scripts/lovevery_alternatives.json',
+                             os.environ.get('CATALOG_DB'))
 
-def save_data(data):
-    with open('/Users/gzxultra/Dev/loveveryfans/scripts/lovevery_alternatives.json', 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def save_data(catalog):
+    catalog.save()
     print("Saved lovevery_alternatives.json")
 
 def find_alt(data, kit_id, toy_name, asin):
@@ -46,7 +47,8 @@ def fix(alt, field, new_value, desc=""):
 
 def main():
     global fixes_applied
-    data = load_data()
+    catalog = load_data()
+    data = catalog.data
 
     print("=" * 80)
     print("APPLYING COMPREHENSIVE FIXES")
@@ -179,7 +181,7 @@ def main():
     print(f"TOTAL FIXES APPLIED: {fixes_applied}")
     print(f"{'=' * 80}")
 
-    save_data(data)
+    save_data(catalog)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+bench_cleaning_guide.py — Benchmarks for the hot paths of
+scrape_cleaning_guide.py.
+
+Subcommands:
+  materials — keyword material classification: the previous first-hit
+              substring scan vs the trie-compiled KeywordMatcher, timed over
+              every toy of every kit in one batch, with a count of toys
+              whose material label changed
+  care-page — care page section extraction: the previous per-container
+              find/find_all walk vs the single-pass extract_care_sections,
+              on a saved page or a synthetic deeply nested one
+
+Usage:
+    python bench_cleaning_guide.py materials                       # synthetic corpus
+    python bench_cleaning_guide.py materials -i data/lovevery_kits.json
+    python bench_cleaning_guide.py materials --toys 20000 --repeat 5
+    python bench_cleaning_guide.py materials --extra-keywords 500  # scaling
+    curl -o care.html https://lovevery.com/pages/care-instructions
+    python bench_cleaning_guide.py care-page -i care.html
+    python bench_cleaning_guide.py care-page --sections 40 --depth 12
+
+Requirements:
+    Same as scrape_cleaning_guide.py (it is imported, not run).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import time
+from typing import Any, Callable
+
+from bs4 import BeautifulSoup
+
+from scrape_cleaning_guide import MATERIAL_KEYWORDS, KeywordMatcher, extract_care_sections
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+)
+log = logging.getLogger(__name__)
+
+# Filler words for synthetic descriptions
+FILLER = (
+    "soft gentle colorful toy for baby toddler hands grasp stack sort roll "
+    "sturdy smooth safe finish design play learn explore shapes colors"
+).split()
+# Words containing a keyword as a substring; the old scan mislabels these
+NEAR_MISSES = "absorbent bookshelf sandwich feltham woodland metallic papery".split()
+
+
+# ---------------------------------------------------------------------------
+# Material classification
+# ---------------------------------------------------------------------------
+
+
+def legacy_classifier(keywords: list[str]) -> Callable[[list[str]], list[str | None]]:
+    """The original classifier: first keyword (in table order) found as a substring."""
+
+    def classify(texts: list[str]) -> list[str | None]:
+        labels: list[str | None] = []
+        for text in texts:
+            text_lower = text.lower()
+            labels.append(next((k for k in keywords if k in text_lower), None))
+        return labels
+
+    return classify
+
+
+def synthetic_toys(count: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Build toys with 0-2 material keywords in 20-60 words of filler.
+
+    One toy in four carries no keyword, and one in three a near-miss word.
+    """
+    rng = random.Random(seed)
+    keywords = list(MATERIAL_KEYWORDS)
+    toys = []
+    for i in range(count):
+        words = rng.choices(FILLER, k=rng.randint(20, 60))
+        extras = rng.sample(keywords, rng.choice([0, 1, 1, 2]))
+        if rng.random() < 1 / 3:
+            extras.append(rng.choice(NEAR_MISSES))
+        for word in extras:
+            words.insert(rng.randrange(len(words)), word)
+        toys.append({"name": f"Toy {i}", "description": " ".join(words)})
+    return toys
+
+
+def random_keywords(count: int, seed: int = 1) -> list[str]:
+    """Return *count* made-up keywords that never occur in the filler text."""
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choices("jqxz", k=2)) + "".join(rng.choices("aeiou", k=5))
+        for _ in range(count)
+    ]
+
+
+def load_toys(path: str) -> list[dict[str, Any]]:
+    """Load every toy of every kit from a kits JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [toy for kit in json.load(f) for toy in kit.get("toys", [])]
+
+
+def time_classifier(
+    classify: Callable[[list[str]], list[str | None]], texts: list[str], repeat: int
+) -> tuple[float, list[str | None]]:
+    """Return the best wall time over *repeat* runs and the keywords picked."""
+    best = float("inf")
+    labels: list[str | None] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        labels = classify(texts)
+        best = min(best, time.perf_counter() - start)
+    return best, labels
+
+
+def bench_materials(args: argparse.Namespace) -> None:
+    toys = load_toys(args.input) if args.input else synthetic_toys(args.toys)
+    texts = [f"{t.get('name', '')} {t.get('description', '')}" for t in toys]
+    keywords = list(MATERIAL_KEYWORDS) + random_keywords(args.extra_keywords)
+    log.info(
+        "Classifying %d toys (%d chars) against %d keywords, best of %d runs",
+        len(texts), sum(len(t) for t in texts), len(keywords), args.repeat,
+    )
+
+    legacy_time, legacy_labels = time_classifier(legacy_classifier(keywords), texts, args.repeat)
+    new_time, new_labels = time_classifier(
+        KeywordMatcher(keywords).best_matches, texts, args.repeat
+    )
+
+    for name, elapsed, labels in (
+        ("substring scan", legacy_time, legacy_labels),
+        ("keyword matcher", new_time, new_labels),
+    ):
+        log.info(
+            "  %-15s %8.1f ms  %9.0f toys/s  %d unknown",
+            name,
+            elapsed * 1000,
+            len(texts) / elapsed if elapsed else 0,
+            sum(label is None for label in labels),
+        )
+    changed = [
+        (text, old, new)
+        for text, old, new in zip(texts, legacy_labels, new_labels)
+        if (MATERIAL_KEYWORDS.get(old or "") != MATERIAL_KEYWORDS.get(new or ""))
+    ]
+    log.info("  Speed-up: %.2fx; material changed for %d toys", legacy_time / new_time, len(changed))
+    if args.verbose:
+        for text, old, new in changed:
+            log.info("    %s: %s -> %s", text[:60], old, new)
+
+
+# ---------------------------------------------------------------------------
+# Care page sections
+# ---------------------------------------------------------------------------
+
+
+def legacy_care_sections(html: str) -> tuple[dict[str, str], int]:
+    """The original extractor; also returns how many sections it emitted
+    before later containers overwrote earlier ones."""
+    soup = BeautifulSoup(html, "lxml")
+    care_data: dict[str, str] = {}
+    emitted = 0
+    for section in soup.find_all(["div", "section"]):
+        heading = section.find(["h2", "h3"])
+        if heading:
+            title = heading.get_text(strip=True)
+            paragraphs = section.find_all("p")
+            text = " ".join(p.get_text(strip=True) for p in paragraphs)
+            if text:
+                care_data[title] = text
+                emitted += 1
+    return care_data, emitted
+
+
+def synthetic_care_page(sections: int, depth: int) -> str:
+    """Build a Shopify-style page: every section wrapped in *depth* divs,
+    with a repeated mobile copy of each section block."""
+    blocks = []
+    for i in range(sections):
+        body = f"<h3>Material {i}</h3>" + "".join(
+            f"<p>Care step {j} for material {i}: wipe with a damp cloth.</p>" for j in range(4)
+        )
+        wrapped = "<div class='shopify-section'>" * depth + body + "</div>" * depth
+        blocks.append(wrapped + f"<div class='mobile-only'>{body}</div>")
+    return (
+        "<html><body><div id='MainContent'><h2>Care instructions</h2>"
+        + "".join(blocks)
+        + "</div></body></html>"
+    )
+
+
+def bench_care_page(args: argparse.Namespace) -> None:
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            html = f.read()
+    else:
+        html = synthetic_care_page(args.sections, args.depth)
+    log.info("Extracting care sections from %d bytes, best of %d runs", len(html), args.repeat)
+
+    legacy_time = new_time = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        legacy, emitted = legacy_care_sections(html)
+        legacy_time = min(legacy_time, time.perf_counter() - start)
+        start = time.perf_counter()
+        sections = extract_care_sections(html)
+        new_time = min(new_time, time.perf_counter() - start)
+
+    log.info(
+        "  %-15s %8.1f ms  %d sections (%d emitted, overlapping)",
+        "container walk", legacy_time * 1000, len(legacy), emitted,
+    )
+    log.info("  %-15s %8.1f ms  %d sections", "single pass", new_time * 1000, len(sections))
+    log.info("  Speed-up: %.1fx", legacy_time / new_time)
+    if args.verbose:
+        for title, text in sections.items():
+            log.info("    %s: %s", title, text[:80])
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark scrape_cleaning_guide.py hot paths.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s materials                              # 5000 synthetic toys
+  %(prog)s materials -i data/lovevery_kits.json   # Real kit data
+  %(prog)s materials --toys 20000 -v              # Bigger corpus, list changes
+  %(prog)s materials --extra-keywords 500         # Scaling with table size
+  %(prog)s care-page -i care.html                 # Saved care page
+  %(prog)s care-page --depth 20                   # Deeper synthetic nesting
+        """,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    materials = subparsers.add_parser("materials", help="Material keyword classification")
+    materials.add_argument(
+        "-i", "--input", type=str, help="Kits JSON to take toys from (default: synthetic)"
+    )
+    materials.add_argument(
+        "--toys", type=int, default=5000, help="Synthetic toy count (default: 5000)"
+    )
+    materials.add_argument(
+        "--extra-keywords",
+        type=int,
+        default=0,
+        help="Add N never-matching keywords to show how each approach scales "
+        "with table size (default: 0)",
+    )
+    materials.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs; the best is reported (default: 3)"
+    )
+    materials.add_argument(
+        "--verbose", "-v", action="store_true", help="List every toy whose label changed"
+    )
+    materials.set_defaults(func=bench_materials)
+
+    care = subparsers.add_parser("care-page", help="Care page section extraction")
+    care.add_argument(
+        "-i", "--input", type=str, help="Saved care page HTML (default: synthetic page)"
+    )
+    care.add_argument(
+        "--sections", type=int, default=30, help="Synthetic section count (default: 30)"
+    )
+    care.add_argument(
+        "--depth", type=int, default=8, help="Synthetic wrapper depth (default: 8)"
+    )
+    care.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs; the best is reported (default: 3)"
+    )
+    care.add_argument(
+        "--verbose", "-v", action="store_true", help="List the extracted sections"
+    )
+    care.set_defaults(func=bench_care_page)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
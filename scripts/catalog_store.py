@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+catalog_store.py — Optional SQLite system of record for the Amazon
+alternatives in lovevery_alternatives.json.
+
+Several scripts read, modify and rewrite lovevery_alternatives.json as a
+whole (mobile_refresh.py, scrape_alternatives_optimized.py,
+fix_alternatives.py, apply_fixes.py, apply_asin_fixes.py).  Two of them
+running at once silently lose one side's work.  With a catalog database
+configured (--catalog-db or the CATALOG_DB environment variable), those
+scripts keep their in-memory JSON logic but save through this store:
+
+  - the database is in WAL mode, so readers never block and writers queue
+    on SQLite's lock (busy timeout) instead of overwriting each other;
+  - kits, toys and alternatives are rows (indexed by kit ID, toy name and
+    ASIN), each holding its JSON object verbatim;
+  - saving is a three-way merge: only the fields a script actually changed
+    since it loaded its checkout are written, row by row, so a price refresh
+    and a link fix running side by side both land;
+  - after every save the database is exported back to
+    lovevery_alternatives.json, deterministically (file order, key order and
+    formatting of the existing file), so the site build is unchanged;
+  - the store remembers the hash of the JSON it last wrote or imported, so
+    an edit made to the file outside the store (a git pull, a merged PR, a
+    hand fix) is re-imported on the next open instead of overwritten.
+
+Without a catalog database the scripts read and write the JSON file exactly
+as before.
+
+Usage:
+    python catalog_store.py import                   # JSON -> catalog.sqlite
+    python catalog_store.py export                   # catalog.sqlite -> JSON
+    python catalog_store.py find B0BQXJX5GH          # Where an ASIN is used
+
+    CATALOG_DB=catalog.sqlite python mobile_refresh.py
+
+    from catalog_store import open_alternatives
+
+    catalog = open_alternatives(JSON_PATH, os.environ.get("CATALOG_DB"))
+    for kit in catalog.data: ...                     # mutate as before
+    catalog.save()
+
+Requirements:
+    No external dependencies (stdlib only).
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_JSON = SCRIPT_DIR / "lovevery_alternatives.json"
+DEFAULT_DB = SCRIPT_DIR / "catalog.sqlite"
+BUSY_TIMEOUT = 60.0  # seconds a writer waits for another writer's transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kits (
+    kit_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS toys (
+    id INTEGER PRIMARY KEY,
+    kit_id TEXT NOT NULL REFERENCES kits(kit_id) ON DELETE CASCADE,
+    toy_name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (kit_id, toy_name)
+);
+CREATE TABLE IF NOT EXISTS alternatives (
+    id INTEGER PRIMARY KEY,
+    toy_id INTEGER NOT NULL REFERENCES toys(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    asin TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alternatives_toy ON alternatives(toy_id, position);
+CREATE INDEX IF NOT EXISTS alternatives_asin ON alternatives(asin);
+CREATE TABLE IF NOT EXISTS synced_files (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+"""
+
+log = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# JSON helpers
+# ---------------------------------------------------------------------------
+
+
+def dump_alternatives(data: list[dict[str, Any]]) -> str:
+    """Serialise alternatives exactly like the scripts always have."""
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def write_alternatives(path: Path, data: list[dict[str, Any]]) -> None:
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(dump_alternatives(data))
+    os.replace(tmp, path)
+
+
+def file_digest(path: Path) -> str | None:
+    """SHA-256 of a file's bytes, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def own_fields(obj: dict[str, Any], child_key: str) -> dict[str, Any]:
+    """An object's fields with its child list replaced by a placeholder.
+
+    The placeholder keeps the child list's position among the keys, so the
+    export reproduces the original key order.
+    """
+    return {k: (None if k == child_key else v) for k, v in obj.items()}
+
+
+def merge_fields(
+    current: dict[str, Any], base: dict[str, Any] | None, new: dict[str, Any]
+) -> dict[str, Any]:
+    """Apply the changes from *base* to *new* on top of *current*.
+
+    Fields the writer did not touch keep their current value, which may
+    have been changed by another writer in the meantime.
+    """
+    if base is None:
+        return dict(new)
+    merged = dict(current)
+    for key, value in new.items():
+        if key not in base or base[key] != value:
+            merged[key] = value
+    for key in base:
+        if key not in new:
+            merged.pop(key, None)
+    return merged
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class Checkout:
+    """A writer's working copy of the catalog.
+
+    ``data`` is the usual JSON structure; mutate it in place (or replace
+    objects) and hand the checkout to :meth:`CatalogStore.commit`.  The
+    checkout remembers which database row every alternative came from and
+    what it looked like, so only real changes are written back.
+    """
+
+    def __init__(self, data: list[dict[str, Any]], alt_rows: list[tuple[int, dict[str, Any]]]) -> None:
+        self.data = data
+        self._reset_base(alt_rows)
+
+    def _reset_base(self, alt_rows: list[tuple[int, dict[str, Any]]]) -> None:
+        # Keyed by object identity; the object is kept to pin that identity
+        self.alts: dict[int, tuple[int, dict[str, Any], dict[str, Any]]] = {
+            id(alt): (row_id, alt, copy.deepcopy(alt)) for row_id, alt in alt_rows
+        }
+        self.kits = {kit["kitId"]: own_fields(kit, "toys") for kit in self.data}
+        self.toys = {
+            (kit["kitId"], toy["toyName"]): own_fields(toy, "alternatives")
+            for kit in self.data
+            for toy in kit.get("toys", [])
+        }
+        # Row ids by (kit, toy, ASIN), for objects the writer replaces
+        self.locations: dict[tuple[str, str, Any], list[int]] = {}
+        for kit in self.data:
+            for toy in kit.get("toys", []):
+                for alt in toy.get("alternatives", []):
+                    if id(alt) in self.alts:
+                        key = (kit["kitId"], toy["toyName"], alt.get("asin"))
+                        self.locations.setdefault(key, []).append(self.alts[id(alt)][0])
+
+
+class CatalogStore:
+    """Kits, toys and alternatives in one SQLite database (WAL mode)."""
+
+    def __init__(self, path: Path = DEFAULT_DB) -> None:
+        self.path = path
+        # Autocommit mode; transactions are explicit BEGIN IMMEDIATE blocks
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _write_transaction(self) -> _Transaction:
+        return _Transaction(self.conn, "BEGIN IMMEDIATE")
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM kits LIMIT 1").fetchone() is None
+
+    # -- Reading ------------------------------------------------------------
+
+    def _read(self) -> tuple[list[dict[str, Any]], list[tuple[int, dict[str, Any]]]]:
+        """The whole catalog in file order, plus (row id, object) of every alternative."""
+        kits: list[dict[str, Any]] = []
+        by_kit: dict[str, dict[str, Any]] = {}
+        for kit_id, data in self.conn.execute(
+            "SELECT kit_id, data FROM kits ORDER BY position, kit_id"
+        ):
+            kit = json.loads(data)
+            kit["toys"] = []
+            kits.append(kit)
+            by_kit[kit_id] = kit
+        by_toy: dict[int, dict[str, Any]] = {}
+        for toy_id, kit_id, data in self.conn.execute(
+            "SELECT id, kit_id, data FROM toys ORDER BY kit_id, position, id"
+        ):
+            toy = json.loads(data)
+            toy["alternatives"] = []
+            by_kit[kit_id]["toys"].append(toy)
+            by_toy[toy_id] = toy
+        alt_rows: list[tuple[int, dict[str, Any]]] = []
+        for alt_id, toy_id, data in self.conn.execute(
+            "SELECT id, toy_id, data FROM alternatives ORDER BY toy_id, position, id"
+        ):
+            alt = json.loads(data)
+            by_toy[toy_id]["alternatives"].append(alt)
+            alt_rows.append((alt_id, alt))
+        return kits, alt_rows
+
+    def checkout(self) -> Checkout:
+        """A consistent working copy of the whole catalog."""
+        with _Transaction(self.conn, "BEGIN"):
+            return Checkout(*self._read())
+
+    def find(self, asin: str) -> list[tuple[str, str, dict[str, Any]]]:
+        """(kit ID, toy name, alternative) for every use of *asin*."""
+        rows = self.conn.execute(
+            "SELECT t.kit_id, t.toy_name, a.data FROM alternatives a "
+            "JOIN toys t ON t.id = a.toy_id WHERE a.asin = ? ORDER BY t.kit_id, t.position",
+            (asin,),
+        )
+        return [(kit_id, toy_name, json.loads(data)) for kit_id, toy_name, data in rows]
+
+    # -- Writing ------------------------------------------------------------
+
+    def import_json(self, data: list[dict[str, Any]], source: Path | None = None) -> None:
+        """Replace the whole catalog with *data*, read from the file *source*."""
+        with self._write_transaction():
+            self._replace(data, source)
+
+    def _replace(self, data: list[dict[str, Any]], source: Path | None) -> None:
+        self.conn.execute("DELETE FROM kits")
+        self.commit(Checkout([], []), data, in_transaction=True)
+        if source is not None:
+            self._mark_synced(source)
+
+    def _mark_synced(self, path: Path) -> None:
+        """Record *path*'s current bytes as matching the store."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO synced_files (path, sha256) VALUES (?, ?)",
+            (str(path.resolve()), file_digest(path)),
+        )
+
+    def import_if_changed(self, path: Path) -> bool:
+        """Re-import *path* if it changed since the store last wrote or read it.
+
+        The comparison is against the hash recorded by the last export or
+        import of that file; a store that predates the record compares
+        against its own export instead.  An empty store always imports.
+        Runs under the write lock, so a concurrent writer's export is never
+        mistaken for an outside edit.  Returns True if the file was imported.
+        """
+        with self._write_transaction():
+            digest = file_digest(path)
+            if self.is_empty():
+                if digest is None:
+                    raise FileNotFoundError(path)
+            else:
+                if digest is None:
+                    return False
+                row = self.conn.execute(
+                    "SELECT sha256 FROM synced_files WHERE path = ?", (str(path.resolve()),)
+                ).fetchone()
+                if row is not None:
+                    synced = row[0]
+                else:
+                    data, _ = self._read()
+                    synced = hashlib.sha256(dump_alternatives(data).encode("utf-8")).hexdigest()
+                if digest == synced:
+                    return False
+                log.warning("%s changed outside the catalog store; re-importing it", path)
+            with open(path, "r", encoding="utf-8") as f:
+                self._replace(json.load(f), path)
+            return True
+
+    def commit(
+        self,
+        checkout: Checkout,
+        data: list[dict[str, Any]] | None = None,
+        in_transaction: bool = False,
+    ) -> dict[str, int]:
+        """Write a checkout's changes row by row; returns counts per operation.
+
+        Alternatives are matched to their rows by object identity, or, for
+        objects the writer created anew, by (kit, toy, ASIN).  Rows whose
+        objects are gone from the checkout are deleted.  The checkout is
+        rebased, so it can be edited and committed again.
+        """
+        data = checkout.data if data is None else data
+        if not in_transaction:
+            with self._write_transaction():
+                return self.commit(checkout, data, in_transaction=True)
+
+        counts = dict.fromkeys(("updated", "inserted", "deleted", "unchanged"), 0)
+        # Rows whose loaded object is still present are never claimed by a replacement
+        claimed: set[int] = set()
+        kept = {
+            checkout.alts[id(alt)][0]
+            for kit in data
+            for toy in kit.get("toys", [])
+            for alt in toy.get("alternatives", [])
+            if id(alt) in checkout.alts and checkout.alts[id(alt)][1] is alt
+        }
+        unmatched_base = {row_id: base for row_id, _, base in checkout.alts.values()}
+        written: list[tuple[int, dict[str, Any]]] = []
+
+        for kit_pos, kit in enumerate(data):
+            kit_id = kit["kitId"]
+            self._upsert_kit(kit_id, kit_pos, checkout.kits.get(kit_id), own_fields(kit, "toys"))
+            for toy_pos, toy in enumerate(kit.get("toys", [])):
+                key = (kit_id, toy["toyName"])
+                toy_id = self._upsert_toy(
+                    key, toy_pos, checkout.toys.get(key), own_fields(toy, "alternatives")
+                )
+                for alt_pos, alt in enumerate(toy.get("alternatives", [])):
+                    row_id = self._match(checkout, alt, key, claimed, kept)
+                    base = None
+                    if row_id is not None:
+                        base = unmatched_base.get(row_id)
+                        claimed.add(row_id)
+                        unmatched_base.pop(row_id, None)
+                    row_id, outcome = self._write_alt(row_id, base, alt, toy_id, alt_pos)
+                    counts[outcome] += 1
+                    if row_id is not None:
+                        written.append((row_id, alt))
+
+        for row_id in unmatched_base:
+            self.conn.execute("DELETE FROM alternatives WHERE id = ?", (row_id,))
+            counts["deleted"] += 1
+        kit_ids = {kit["kitId"] for kit in data}
+        toy_keys = {(kit["kitId"], toy["toyName"]) for kit in data for toy in kit.get("toys", [])}
+        for kit_id, toy_name in set(checkout.toys) - toy_keys:
+            self.conn.execute(
+                "DELETE FROM toys WHERE kit_id = ? AND toy_name = ?", (kit_id, toy_name)
+            )
+        for kit_id in set(checkout.kits) - kit_ids:
+            self.conn.execute("DELETE FROM kits WHERE kit_id = ?", (kit_id,))
+
+        checkout.data = data
+        checkout._reset_base(written)
+        return counts
+
+    @staticmethod
+    def _match(
+        checkout: Checkout,
+        alt: dict[str, Any],
+        toy_key: tuple[str, str],
+        claimed: set[int],
+        kept: set[int],
+    ) -> int | None:
+        """Row id of the loaded alternative that *alt* is, or replaces."""
+        entry = checkout.alts.get(id(alt))
+        if entry and entry[1] is alt and entry[0] not in claimed:
+            return entry[0]
+        # A new object standing in for a loaded one (same kit, toy and ASIN)
+        for row_id in checkout.locations.get((*toy_key, alt.get("asin")), []):
+            if row_id not in claimed and row_id not in kept:
+                return row_id
+        return None
+
+    def _upsert_kit(
+        self, kit_id: str, position: int, base: dict[str, Any] | None, new: dict[str, Any]
+    ) -> None:
+        row = self.conn.execute("SELECT data FROM kits WHERE kit_id = ?", (kit_id,)).fetchone()
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO kits VALUES (?, ?, ?)", (kit_id, position, json.dumps(new, ensure_ascii=False))
+            )
+            return
+        merged = merge_fields(json.loads(row[0]), base, new)
+        self.conn.execute(
+            "UPDATE kits SET position = ?, data = ? WHERE kit_id = ?",
+            (position, json.dumps(merged, ensure_ascii=False), kit_id),
+        )
+
+    def _upsert_toy(
+        self,
+        key: tuple[str, str],
+        position: int,
+        base: dict[str, Any] | None,
+        new: dict[str, Any],
+    ) -> int:
+        row = self.conn.execute(
+            "SELECT id, data FROM toys WHERE kit_id = ? AND toy_name = ?", key
+        ).fetchone()
+        if row is None:
+            cursor = self.conn.execute(
+                "INSERT INTO toys (kit_id, toy_name, position, data) VALUES (?, ?, ?, ?)",
+                (*key, position, json.dumps(new, ensure_ascii=False)),
+            )
+            return cursor.lastrowid
+        merged = merge_fields(json.loads(row[1]), base, new)
+        self.conn.execute(
+            "UPDATE toys SET position = ?, data = ? WHERE id = ?",
+            (position, json.dumps(merged, ensure_ascii=False), row[0]),
+        )
+        return row[0]
+
+    def _write_alt(
+        self,
+        row_id: int | None,
+        base: dict[str, Any] | None,
+        alt: dict[str, Any],
+        toy_id: int,
+        position: int,
+    ) -> tuple[int | None, str]:
+        row = None
+        if row_id is not None:
+            row = self.conn.execute(
+                "SELECT toy_id, position, data FROM alternatives WHERE id = ?", (row_id,)
+            ).fetchone()
+            if row is None and alt == base:
+                # Deleted by another writer and not edited here: the deletion stands
+                return None, "deleted"
+        if row is None:
+            # New, or deleted by another writer but edited here
+            cursor = self.conn.execute(
+                "INSERT INTO alternatives (toy_id, position, asin, data) VALUES (?, ?, ?, ?)",
+                (toy_id, position, alt.get("asin"), json.dumps(alt, ensure_ascii=False)),
+            )
+            return cursor.lastrowid, "inserted"
+        current = json.loads(row[2])
+        merged = merge_fields(current, base, alt)
+        if merged == current and (row[0], row[1]) == (toy_id, position) and list(merged) == list(current):
+            return row_id, "unchanged"
+        self.conn.execute(
+            "UPDATE alternatives SET toy_id = ?, position = ?, asin = ?, data = ? WHERE id = ?",
+            (toy_id, position, merged.get("asin"), json.dumps(merged, ensure_ascii=False), row_id),
+        )
+        return row_id, "updated"
+
+    # -- Export -------------------------------------------------------------
+
+    def export(self, path: Path) -> None:
+        """Write the catalog as alternatives JSON.
+
+        Runs under the write lock, so an export can never be overtaken by a
+        concurrent writer's older export.
+        """
+        with self._write_transaction():
+            data, _ = self._read()
+            write_alternatives(path, data)
+            self._mark_synced(path)
+
+
+class _Transaction:
+    """Explicit transaction on an autocommit connection; rolls back on error."""
+
+    def __init__(self, conn: sqlite3.Connection, begin: str) -> None:
+        self.conn = conn
+        self.begin = begin
+
+    def __enter__(self) -> None:
+        self.conn.execute(self.begin)
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+# ---------------------------------------------------------------------------
+# Writer entry point
+# ---------------------------------------------------------------------------
+
+
+class AlternativesCatalog:
+    """What the writer scripts open: the JSON file, optionally backed by the store.
+
+    ``data`` is the alternatives structure.  ``save()`` writes it back: as a
+    plain JSON file without a store, or as a row-level commit followed by a
+    JSON export with one.
+    """
+
+    def __init__(self, json_path: Path, db_path: Path | None = None) -> None:
+        self.json_path = json_path
+        self.store = CatalogStore(db_path) if db_path else None
+        if self.store is None:
+            with open(json_path, "r", encoding="utf-8") as f:
+                self.data: list[dict[str, Any]] = json.load(f)
+            return
+        if self.store.import_if_changed(json_path):
+            log.info("Imported %s into catalog %s", json_path, db_path)
+        self._checkout = self.store.checkout()
+        self.data = self._checkout.data
+
+    def save(self) -> None:
+        if self.store is None:
+            write_alternatives(self.json_path, self.data)
+            return
+        self._checkout.data = self.data
+        counts = self.store.commit(self._checkout)
+        self.data = self._checkout.data
+        self.store.export(self.json_path)
+        log.info(
+            "Catalog: %s",
+            ", ".join(f"{count} {name}" for name, count in counts.items()),
+        )
+
+
+def open_alternatives(json_path: str | Path, db_path: str | Path | None = None) -> AlternativesCatalog:
+    """Open lovevery_alternatives.json, through the catalog store if *db_path* is set."""
+    return AlternativesCatalog(Path(json_path), Path(db_path) if db_path else None)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="SQLite system of record for lovevery_alternatives.json.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s import                      # Load lovevery_alternatives.json into the store
+  %(prog)s export                      # Rewrite lovevery_alternatives.json from the store
+  %(prog)s export -o /tmp/alts.json    # Export elsewhere
+  %(prog)s find B0BQXJX5GH             # Kits and toys using an ASIN
+        """,
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=os.environ.get("CATALOG_DB") or str(DEFAULT_DB),
+        help="Catalog database (default: $CATALOG_DB or scripts/catalog.sqlite)",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Enable debug logging"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("import", "Replace the store's contents with a JSON file"),
+        ("export", "Write the store as alternatives JSON"),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument(
+            "-i" if name == "import" else "-o",
+            dest="path",
+            type=str,
+            default=str(DEFAULT_JSON),
+            help="Alternatives JSON (default: scripts/lovevery_alternatives.json)",
+        )
+    find_parser = subparsers.add_parser("find", help="Show where an ASIN is used")
+    find_parser.add_argument("asin")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    store = CatalogStore(Path(args.db))
+    try:
+        if args.command == "import":
+            with open(args.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            store.import_json(data, Path(args.path))
+            log.info("Imported %d kits from %s into %s", len(data), args.path, args.db)
+        elif args.command == "export":
+            store.export(Path(args.path))
+            log.info("Exported %s to %s", args.db, args.path)
+        else:
+            uses = store.find(args.asin)
+            if not uses:
+                log.error("ASIN %s is not in the catalog", args.asin)
+                sys.exit(1)
+            for kit_id, toy_name, alt in uses:
+                print(f"{kit_id} / {toy_name}: {alt.get('name', '')} ({alt.get('price')})")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
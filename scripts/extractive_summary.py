@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+extractive_summary.py — Local pros/cons summariser for scrape_reviews.py.
+
+An offline alternative to the LLM summary: no API key, no network, a few
+milliseconds per kit.  Review excerpts are split into sentences, scored by
+TextRank over TF-IDF sentence vectors (English words and Chinese character
+bigrams, one NumPy matrix for the similarity graph), and divided into pros
+and cons with a small polarity lexicon that understands simple negation
+("not worth it", "不喜欢").  The highest-ranked sentences of each side,
+skipping near-repeats, form the summary.
+
+The result has the same shape as the LLM summary (pros_cn, pros_en, cons_cn,
+cons_en).  Sentences are quoted, not translated: the Chinese fields use
+Chinese sentences (e.g. from Xiaohongshu) when there are any and otherwise
+repeat the English ones, and vice versa.
+
+Usage (from scrape_reviews.py):
+    from extractive_summary import summarise_excerpts
+
+    summary = summarise_excerpts([{"text": "...", "score": 12}, ...])
+
+Requirements:
+    pip install numpy
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Any
+
+import numpy as np
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SUMMARY_SENTENCES = 3  # sentences per pros/cons field
+MAX_SENTENCES = 800  # highest-scored sentences kept per kit
+MIN_SENTENCE_CHARS = 20
+MIN_CJK_SENTENCE_CHARS = 6
+MAX_SENTENCE_CHARS = 280
+DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+REDUNDANCY_THRESHOLD = 0.5  # cosine above which a sentence repeats a chosen one
+NEGATION_WINDOW = 3  # tokens after a negator whose polarity is flipped
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|(?<=[。！？!?；;])|\n+")
+WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+CJK_RE = re.compile(r"[一-鿿]")
+
+STOPWORDS = frozenset(
+    """a an the and or but if so of to in on at for with from by as is are was were be been
+    it its it's this that these those i i'm we my our me you your he she they them his her
+    their there here have has had do does did just very really also too than then when
+    what which who how all any some more most one two up out about into over after
+    get got can could would will should kit kits lovevery""".split()
+)
+NEGATORS = frozenset(
+    """not no never don't doesn't didn't isn't wasn't aren't weren't won't wouldn't
+    can't couldn't hardly barely""".split()
+)
+POSITIVE_WORDS = frozenset(
+    """love loved loves loving great favorite favourite favorites enjoy enjoyed enjoys
+    engaged engaging worth quality sturdy durable beautiful beautifully fun perfect helpful
+    recommend recommended happy obsessed best amazing excellent useful cute lovely gorgeous
+    clever educational thoughtful adorable awesome nice good well-made versatile""".split()
+)
+NEGATIVE_WORDS = frozenset(
+    """expensive pricey overpriced broke broken breaks cheap cheaply flimsy boring bored
+    waste wasted disappointed disappointing disappointment useless hate hated dangerous
+    choking hazard fragile ignored ignores missing worse worst bad poor annoying loud
+    difficult frustrating mold mould smell smells peeling chipped chipping cancel
+    cancelled meh unused""".split()
+)
+# Longest first, so "不喜欢" wins over the "喜欢" it contains
+CJK_POLARITY = {
+    **dict.fromkeys(
+        "喜欢 好玩 推荐 值得 结实 耐用 精致 漂亮 可爱 有趣 实用 满意 超爱 爱玩 惊喜 专注 质量好 做工好".split(),
+        1,
+    ),
+    **dict.fromkeys(
+        "贵 不值 坏了 容易坏 无聊 失望 鸡肋 闲置 吃灰 危险 掉漆 异味 太小 不喜欢 不玩 不爱玩 后悔 性价比低 质量差".split(),
+        -1,
+    ),
+}
+CJK_POLARITY_RE = re.compile("|".join(sorted(CJK_POLARITY, key=len, reverse=True)))
+
+# ---------------------------------------------------------------------------
+# Sentences and features
+# ---------------------------------------------------------------------------
+
+
+def is_chinese(text: str) -> bool:
+    """Whether at least a third of *text*'s letters are CJK characters."""
+    cjk = len(CJK_RE.findall(text))
+    return cjk > 0 and cjk * 3 >= sum(ch.isalpha() for ch in text)
+
+
+def split_sentences(excerpts: list[dict[str, Any]]) -> list[tuple[str, float]]:
+    """Split excerpts into (sentence, weight) pairs; weight grows with Reddit score."""
+    sentences: list[tuple[str, float]] = []
+    seen: set[str] = set()
+    for excerpt in excerpts:
+        weight = 1.0 + math.log1p(max(excerpt.get("score", 0) or 0, 0))
+        for raw in SENTENCE_SPLIT_RE.split(excerpt["text"]):
+            sentence = " ".join(raw.split())
+            minimum = MIN_CJK_SENTENCE_CHARS if is_chinese(sentence) else MIN_SENTENCE_CHARS
+            if len(sentence) < minimum or len(sentence) > MAX_SENTENCE_CHARS:
+                continue
+            if sentence.lower() in seen:
+                continue
+            seen.add(sentence.lower())
+            sentences.append((sentence, weight))
+    return sentences[:MAX_SENTENCES]
+
+
+def sentence_terms(sentence: str) -> list[str]:
+    """English content words plus Chinese character bigrams."""
+    lower = sentence.lower()
+    terms = [w for w in WORD_RE.findall(lower) if w not in STOPWORDS and len(w) > 1]
+    for run in re.findall(r"[一-鿿]+", lower):
+        terms.extend(run[i : i + 2] for i in range(max(len(run) - 1, 1)))
+    return terms
+
+
+def tfidf_matrix(docs: list[list[str]]) -> np.ndarray:
+    """Row-normalised TF-IDF matrix of *docs* (sentences x terms)."""
+    vocab: dict[str, int] = {}
+    for doc in docs:
+        for term in doc:
+            vocab.setdefault(term, len(vocab))
+    matrix = np.zeros((len(docs), max(len(vocab), 1)), dtype=np.float32)
+    for row, doc in enumerate(docs):
+        for term in doc:
+            matrix[row, vocab[term]] += 1
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1 + len(docs)) / (1 + df)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def polarity(sentence: str) -> int:
+    """Net lexicon polarity of a sentence; negators flip the next few words."""
+    score = 0
+    flip_until = -1
+    for i, token in enumerate(WORD_RE.findall(sentence.lower())):
+        if token in NEGATORS:
+            flip_until = i + NEGATION_WINDOW
+            continue
+        value = (token in POSITIVE_WORDS) - (token in NEGATIVE_WORDS)
+        score += -value if i <= flip_until else value
+    for match in CJK_POLARITY_RE.finditer(sentence):
+        score += CJK_POLARITY[match.group()]
+    return score
+
+
+# ---------------------------------------------------------------------------
+# Ranking and selection
+# ---------------------------------------------------------------------------
+
+
+def textrank(similarity: np.ndarray) -> np.ndarray:
+    """PageRank over a sentence similarity matrix (power iteration)."""
+    n = similarity.shape[0]
+    graph = similarity.copy()
+    np.fill_diagonal(graph, 0)
+    out_weight = graph.sum(axis=1, keepdims=True)
+    # Sentences sharing no term with any other spread their rank uniformly
+    transition = np.where(out_weight > 0, graph / np.maximum(out_weight, 1e-12), 1.0 / n)
+    rank = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ rank)
+        if np.abs(updated - rank).sum() < 1e-6:
+            return updated
+        rank = updated
+    return rank
+
+
+def select(
+    candidates: list[int], scores: np.ndarray, similarity: np.ndarray, count: int
+) -> list[int]:
+    """Pick the *count* best candidates, skipping near-repeats of earlier picks."""
+    chosen: list[int] = []
+    for i in sorted(candidates, key=lambda i: -scores[i]):
+        if all(similarity[i, j] < REDUNDANCY_THRESHOLD for j in chosen):
+            chosen.append(i)
+            if len(chosen) == count:
+                break
+    return chosen
+
+
+def summarise_excerpts(
+    excerpts: list[dict[str, Any]], count: int = SUMMARY_SENTENCES
+) -> dict[str, str] | None:
+    """Summarise ``{text, score}`` excerpts into pros/cons in both languages.
+
+    Returns the LLM summary shape (pros_cn, pros_en, cons_cn, cons_en), or
+    None when there is no usable sentence.  A side with no polar sentence
+    is left empty.
+    """
+    sentences = split_sentences(excerpts)
+    if not sentences:
+        return None
+    texts = [s for s, _ in sentences]
+    matrix = tfidf_matrix([sentence_terms(s) for s in texts])
+    similarity = matrix @ matrix.T
+    scores = textrank(similarity) * np.array([w for _, w in sentences], dtype=np.float32)
+
+    polarities = [polarity(s) for s in texts]
+    chinese = [is_chinese(s) for s in texts]
+    summary: dict[str, str] = {}
+    for side, sign in (("pros", 1), ("cons", -1)):
+        polar = [i for i, p in enumerate(polarities) if p * sign > 0]
+        picks = {
+            # Chinese sentences keep their own full-width punctuation
+            lang: ("" if lang == "cn" else " ").join(
+                texts[i]
+                for i in select(
+                    [i for i in polar if chinese[i] == (lang == "cn")], scores, similarity, count
+                )
+            )
+            for lang in ("cn", "en")
+        }
+        summary[f"{side}_cn"] = picks["cn"] or picks["en"]
+        summary[f"{side}_en"] = picks["en"] or picks["cn"]
+    return summary
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
-"""Fix all Amazon alternatives data: prices, URLs, affiliate tags, and image URLs."""
-import json
+"""Fix all Amazon alternatives data: prices, URLs, affiliate tags, and image URLs.
+
+Set CATALOG_DB to save through the catalog store (catalog_store.py).
+"""
 import re
 import os
 import time
 import concurrent.futures
 import urllib.request
 
+from catalog_store import open_alternatives
+
 AFFILIATE_TAG = "loveveryfans-20"
 JSON_PATH = "scripts/lovevery_alternatives.json"
 
@@ -60,8 +64,8 @@ def check_asin_valid(asin):
         return False
 
 def main():
-    with open(JSON_PATH) as f:
-        data = json.load(f)
+    catalog = open_alternatives(JSON_PATH, os.environ.get("CATALOG_DB"))
+    data = catalog.data
     
     fixed_prices = 0
     fixed_urls = 0
@@ -100,8 +104,7 @@ def main():
     print(f"Fixed images: {fixed_images}")
     
     # Write back
-    with open(JSON_PATH, 'w') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    catalog.save()
     print(f"\nSaved to {JSON_PATH}")
     
     # Verify no more bad prices
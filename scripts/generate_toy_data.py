@@ -9,12 +9,26 @@ React frontend:
   - toyReviews.ts     — Parent review pros/cons per toy
   - toyCleaningGuide.ts — Cleaning instructions per toy
   - toyImages.ts      — Hero and toy image URLs (merge/update mode)
+  - kitShards.ts + kits/*.json — Per-kit data shards for lazy loading,
+    optionally split into language-neutral and per-language files
+  - alternatives.{shared,cn,en}.json — Language-split alternatives export
 
 Usage:
     python generate_toy_data.py reviews   -i reviews.json   -o ../client/src/data/
     python generate_toy_data.py cleaning  -i cleaning.json  -o ../client/src/data/
     python generate_toy_data.py images    -i kits.json       -o ../client/src/data/
+    python generate_toy_data.py images    -i kits.json --image-manifest image_manifest.json -o ...
     python generate_toy_data.py all       --reviews-input r.json --cleaning-input c.json
+    python generate_toy_data.py shards    --images-input kits.json --alternatives-input a.json -o out/
+
+Each generated file records a hash of its inputs and the generator version in
+its header.  When that hash is unchanged the generator is skipped entirely, and
+files are only rewritten when their bytes actually differ, so a no-op data
+refresh leaves every mtime (and the Vite module graph) untouched.  Pass
+--force to regenerate regardless.
+
+Inputs may be JSON arrays or the JSONL streams written by the scrapers'
+--stream mode; JSONL inputs are read one record at a time.
 
 Requirements:
     No external dependencies (stdlib only).
@@ -23,12 +37,16 @@ Requirements:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import logging
 import re
 import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+from urllib.parse import urlsplit
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -41,6 +59,15 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+# Bump whenever the emitted TypeScript changes shape, so that stale outputs
+# are regenerated even though their input JSON did not change.
+GENERATOR_VERSION = "3"
+
+SOURCE_HASH_RE = re.compile(r"^ \* Source hash: ([0-9a-f]{64})$", re.MULTILINE)
+
+# The site's toy names, pre-resolved into the alias tables by default
+DEFAULT_SITE_NAMES = Path(__file__).resolve().parent.parent / "client" / "src" / "data" / "kits.ts"
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -57,12 +84,279 @@ def load_json(path: str) -> Any:
         return json.load(f)
 
 
-def write_ts(path: Path, content: str) -> None:
-    """Write TypeScript content to a file."""
+def load_records(path: str) -> Iterator[dict[str, Any]]:
+    """Yield the kit records of a scraper output file one at a time.
+
+    ``.jsonl`` files (the --stream output of the scrapers) are read line by
+    line, so the whole file is never held in memory; anything else is
+    loaded as a JSON array.  An unterminated trailing line left by an
+    interrupted stream is skipped.
+    """
+    if not path.endswith(".jsonl"):
+        yield from load_json(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                log.warning("  Skipping truncated last record in %s", path)
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_ts(path: Path, content: str) -> bool:
+    """Write generated TypeScript (or JSON) content to a file.
+
+    The file is left untouched (mtime included) when its current bytes
+    already match *content*.  Returns True if the file was written.
+    """
+    data = content.encode("utf-8")
+    if path.is_file() and path.read_bytes() == data:
+        log.info("  Unchanged: %s (%d bytes)", path, len(data))
+        return False
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
-    log.info("  Written: %s (%d bytes)", path, len(content))
+    with open(path, "wb") as f:
+        f.write(data)
+    log.info("  Written: %s (%d bytes)", path, len(data))
+    return True
+
+
+def source_hash(kind: str, *input_paths: str) -> str:
+    """Return a SHA-256 over the generator kind/version and the input files."""
+    h = hashlib.sha256()
+    h.update(f"{kind}:{GENERATOR_VERSION}".encode("utf-8"))
+    for path in input_paths:
+        # The file name is echoed into the generated header, so it counts too
+        h.update(b"\0" + Path(path).name.encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def is_up_to_date(output_path: Path, digest: str) -> bool:
+    """Check whether *output_path* was generated from inputs hashing to *digest*."""
+    if not output_path.is_file():
+        return False
+    with open(output_path, "r", encoding="utf-8") as f:
+        header = f.read(1024)
+    match = SOURCE_HASH_RE.search(header)
+    return bool(match) and match.group(1) == digest
+
+
+# ---------------------------------------------------------------------------
+# Alias index
+# ---------------------------------------------------------------------------
+
+# Must stay in sync with the normalizeToyName() emitted into the .ts files
+TS_NORMALIZE_FN = [
+    "function normalizeToyName(name: string): string {",
+    '  return name.normalize("NFKC").toLowerCase().replace(/[\\s\\p{P}\\p{S}]+/gu, "");',
+    "}",
+]
+
+SITE_KIT_OR_TOY_RE = re.compile(
+    r'^    id: "(?P<kit>[^"]+)"'
+    r'|\{\s*name: "(?P<name>(?:[^"\\]|\\.)*)",\s*englishName: "(?P<en>(?:[^"\\]|\\.)*)"',
+    re.MULTILINE,
+)
+
+
+def normalize_toy_name(name: str) -> str:
+    """Normalise a toy name the same way the generated normalizeToyName() does."""
+    name = unicodedata.normalize("NFKC", name).lower()
+    return "".join(
+        c for c in name
+        if not c.isspace() and unicodedata.category(c)[0] not in "PS"
+    )
+
+
+def load_site_toy_names(path: str) -> dict[str, list[list[str]]]:
+    """Collect the names the site looks toys up by, per kit, from kits.ts.
+
+    Each toy contributes one group holding its Chinese and English names.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+
+    names: dict[str, list[list[str]]] = {}
+    kit_id = ""
+    for m in SITE_KIT_OR_TOY_RE.finditer(source):
+        if m.group("kit"):
+            kit_id = m.group("kit")
+            names.setdefault(kit_id, [])
+        elif kit_id:
+            # TS string literals here only use JSON-compatible escapes
+            names[kit_id].append([json.loads(f'"{m.group(g)}"') for g in ("name", "en")])
+    return names
+
+
+def build_alias_index(
+    entries: list[tuple[str, str, list[str]]],
+    site_names: dict[str, list[list[str]]] | None = None,
+) -> tuple[dict[str, str], dict[str, int]]:
+    """Map every known name variant of a toy to its canonical data key.
+
+    *entries* holds ``(kit_id, canonical_name, other_names)`` for each record;
+    keys of the result are ``"kitId::normalizedName"``.  When *site_names* is
+    given, each toy the site looks up is resolved ahead of time with the
+    substring rule the runtime lookup used to apply on every miss, and all of
+    its names are aliased to the match.
+
+    Conflicts keep the first candidate in data order (matching the old
+    runtime behaviour) and are counted as ambiguous.
+    """
+    aliases: dict[str, str] = {}
+    by_kit: dict[str, list[tuple[str, list[str]]]] = {}
+    stats = {"aliases": 0, "ambiguous": 0, "unresolved": 0}
+
+    def add(kit_id: str, norm: str, key: str) -> None:
+        if not norm:
+            return
+        existing = aliases.setdefault(f"{kit_id}::{norm}", key)
+        if existing != key:
+            stats["ambiguous"] += 1
+            log.debug("  Ambiguous alias %s::%s: %s vs %s", kit_id, norm, existing, key)
+
+    for kit_id, canonical, others in entries:
+        key = f"{kit_id}::{canonical}"
+        variants = [normalize_toy_name(v) for v in (canonical, *others) if v]
+        by_kit.setdefault(kit_id, []).append((key, variants))
+        for norm in variants:
+            add(kit_id, norm, key)
+
+    for kit_id, toys in (site_names or {}).items():
+        for toy_names in toys:
+            norms = [n for n in map(normalize_toy_name, toy_names) if n]
+            known = [aliases[f"{kit_id}::{n}"] for n in norms if f"{kit_id}::{n}" in aliases]
+            if known:
+                key = known[0]
+            else:
+                matches = [
+                    key for key, variants in by_kit.get(kit_id, [])
+                    if any(v in n or n in v for v in variants for n in norms)
+                ]
+                if not matches:
+                    stats["unresolved"] += 1
+                    log.debug("  Unresolved toy %s::%s", kit_id, " / ".join(toy_names))
+                    continue
+                if len(matches) > 1:
+                    stats["ambiguous"] += 1
+                    log.debug("  Ambiguous toy %s::%s -> %s", kit_id, toy_names[0], matches)
+                key = matches[0]
+            for n in norms:
+                aliases.setdefault(f"{kit_id}::{n}", key)
+
+    # Identity aliases are redundant: the exact-key probe already hits them
+    aliases = {alias: key for alias, key in aliases.items() if alias != key}
+    stats["aliases"] = len(aliases)
+    return aliases, stats
+
+
+def emit_alias_table(lines: list[str], var_name: str, aliases: dict[str, str]) -> None:
+    """Append the alias table and normalizeToyName() to *lines*."""
+    lines.append('// Alias format: "kitId::normalizedName" -> data key')
+    lines.append(f"const {var_name}: Record<string, string> = {{")
+    for alias, key in sorted(aliases.items()):
+        lines.append(f'  "{escape_ts_string(alias)}": "{escape_ts_string(key)}",')
+    lines.append("};")
+    lines.append("")
+    lines.extend(TS_NORMALIZE_FN)
+    lines.append("")
+
+
+def log_alias_stats(stats: dict[str, int]) -> None:
+    """Report alias index coverage at build time."""
+    log.info(
+        "  Alias index: %d aliases, %d ambiguous, %d unresolved",
+        stats["aliases"], stats["ambiguous"], stats["unresolved"],
+    )
+    if stats["ambiguous"] or stats["unresolved"]:
+        log.warning(
+            "  %d ambiguous / %d unresolved toys (run with -v for details)",
+            stats["ambiguous"], stats["unresolved"],
+        )
+
+
+# ---------------------------------------------------------------------------
+# Record extraction
+# ---------------------------------------------------------------------------
+
+# Cleaning entries with these instructions carry no useful data
+SKIP_CLEANING_ZH = {"无", "无可用清洗建议", "无可用清洁说明", "None"}
+SKIP_CLEANING_EN = {
+    "No cleaning instructions available.",
+    "No cleaning instructions available",
+    "None",
+}
+
+# (kit_id, data_name, other_names, fields)
+ToyRecord = tuple[str, str, list[str], dict[str, str]]
+
+
+def parse_material(mat_str: str) -> tuple[str, str]:
+    """Split a "中文/English" material label into its two halves."""
+    if "/" in mat_str:
+        parts = mat_str.split("/", 1)
+        return parts[0].strip(), parts[1].strip()
+    return mat_str, mat_str
+
+
+def collect_review_records(data: Iterable[dict[str, Any]]) -> list[ToyRecord]:
+    """Extract one record per reviewed toy from a reviews JSON payload."""
+    records: list[ToyRecord] = []
+    for kit in data:
+        kit_id = kit.get("kit_id", "")
+        for toy in kit.get("toys", []):
+            name = toy.get("name", "")
+            if not name:
+                continue
+            fields = {k: toy.get(k, "") for k in ("pros_cn", "pros_en", "cons_cn", "cons_en")}
+            records.append((kit_id, name, [toy.get("english_name", "")], fields))
+    return records
+
+
+def collect_cleaning_records(data: Iterable[dict[str, Any]]) -> list[ToyRecord]:
+    """Extract one record per toy with usable cleaning info."""
+    records: list[ToyRecord] = []
+    for kit in data:
+        kit_id = kit.get("kit_id", "")
+        for toy in kit.get("toys", []):
+            material = toy.get("material", "")
+            cleaning_zh = toy.get("cleaning_zh", "")
+            cleaning_en = toy.get("cleaning_en", "")
+            if cleaning_zh in SKIP_CLEANING_ZH or cleaning_en in SKIP_CLEANING_EN:
+                continue
+
+            mat_cn, mat_en = parse_material(material)
+            fields = {
+                "material": material,
+                "materialCn": mat_cn,
+                "materialEn": mat_en,
+                "cleaningCn": cleaning_zh,
+                "cleaningEn": cleaning_en,
+            }
+            records.append((kit_id, toy.get("name_zh", ""), [toy.get("name", "")], fields))
+    return records
+
+
+def collect_kit_images(data: Iterable[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Pick the hero image and toy images for each kit in a kits JSON payload."""
+    kit_images: dict[str, dict[str, Any]] = {}
+    for kit in data:
+        hero = kit.get("og_image", "")
+        images = kit.get("images", [])
+        toy_images = [t.get("image", "") for t in kit.get("toys", []) if t.get("image")]
+
+        # Use first Contentful image as hero if og_image is empty
+        if not hero and images:
+            hero = images[0]
+
+        kit_images[kit.get("slug", "")] = {
+            "heroImage": hero,
+            "toyImages": toy_images or images[:10],
+        }
+    return kit_images
 
 
 # ---------------------------------------------------------------------------
@@ -70,7 +364,12 @@ def write_ts(path: Path, content: str) -> None:
 # ---------------------------------------------------------------------------
 
 
-def generate_reviews_ts(input_path: str, output_dir: str) -> None:
+def generate_reviews_ts(
+    input_path: str,
+    output_dir: str,
+    force: bool = False,
+    names_path: str | None = None,
+) -> bool:
     """Generate toyReviews.ts from a reviews JSON file.
 
     Expected input format (lovevery_reviews_final.json):
@@ -90,14 +389,26 @@ def generate_reviews_ts(input_path: str, output_dir: str) -> None:
         ]
       }
     ]
+
+    If *names_path* points at the site's kits.ts, the toy names used there
+    are resolved into the alias table as well.
+
+    Returns True if toyReviews.ts was rewritten.
     """
+    output_path = Path(output_dir) / "toyReviews.ts"
+    digest = source_hash("reviews", input_path, *filter(None, [names_path]))
+    if not force and is_up_to_date(output_path, digest):
+        log.info("Skipping toyReviews.ts: %s unchanged", input_path)
+        return False
+
     log.info("Generating toyReviews.ts from %s", input_path)
-    data = load_json(input_path)
+    records = collect_review_records(load_records(input_path))
 
     lines: list[str] = []
     lines.append("/**")
     lines.append(" * Toy Review Data (Pros & Cons)")
     lines.append(f" * Auto-generated from {Path(input_path).name}")
+    lines.append(f" * Source hash: {digest}")
     lines.append(" */")
     lines.append("")
     lines.append("export interface ToyReview {")
@@ -108,58 +419,38 @@ def generate_reviews_ts(input_path: str, output_dir: str) -> None:
     lines.append("// Key format: \"kitId::toyName\"")
     lines.append("const reviewData: Record<string, { pros_cn: string; pros_en: string; cons_cn: string; cons_en: string }> = {")
 
-    entry_count = 0
-    for kit in data:
-        kit_id = kit.get("kit_id", "")
-        for toy in kit.get("toys", []):
-            name = toy.get("name", "")
-            if not name:
-                continue
-
-            pros_cn = escape_ts_string(toy.get("pros_cn", ""))
-            pros_en = escape_ts_string(toy.get("pros_en", ""))
-            cons_cn = escape_ts_string(toy.get("cons_cn", ""))
-            cons_en = escape_ts_string(toy.get("cons_en", ""))
-
-            key = escape_ts_string(f"{kit_id}::{name}")
-            lines.append(f'  "{key}": {{')
-            lines.append(f'    pros_cn: "{pros_cn}",')
-            lines.append(f'    pros_en: "{pros_en}",')
-            lines.append(f'    cons_cn: "{cons_cn}",')
-            lines.append(f'    cons_en: "{cons_en}",')
-            lines.append("  },")
-            entry_count += 1
+    for kit_id, name, _, fields in records:
+        key = escape_ts_string(f"{kit_id}::{name}")
+        lines.append(f'  "{key}": {{')
+        for field, value in fields.items():
+            lines.append(f'    {field}: "{escape_ts_string(value)}",')
+        lines.append("  },")
 
     lines.append("};")
     lines.append("")
+
+    site_names = load_site_toy_names(names_path) if names_path else None
+    aliases, alias_stats = build_alias_index([r[:3] for r in records], site_names)
+    emit_alias_table(lines, "reviewAliases", aliases)
+
     lines.append("/**")
     lines.append(" * Look up review data for a toy.")
     lines.append(" * @param kitId - Kit identifier (e.g. \"charmer\")")
-    lines.append(" * @param toyName - Toy name in Chinese")
+    lines.append(" * @param toyName - Toy name (Chinese, English, or a known variant)")
     lines.append(" * @param lang - Language code (\"cn\" or \"en\")")
     lines.append(" */")
     lines.append('export function getToyReview(kitId: string, toyName: string, lang: "cn" | "en" = "cn"): ToyReview | null {')
-    lines.append("  const key = `${kitId}::${toyName}`;")
-    lines.append("  const entry = reviewData[key];")
-    lines.append("  if (!entry) {")
-    lines.append("    // Fuzzy match")
-    lines.append("    for (const k of Object.keys(reviewData)) {")
-    lines.append('      if (!k.startsWith(kitId + "::")) continue;')
-    lines.append('      const name = k.split("::")[1];')
-    lines.append("      if (name.includes(toyName) || toyName.includes(name)) {")
-    lines.append("        const e = reviewData[k];")
-    lines.append('        return { pros: lang === "cn" ? e.pros_cn : e.pros_en, cons: lang === "cn" ? e.cons_cn : e.cons_en };')
-    lines.append("      }")
-    lines.append("    }")
-    lines.append("    return null;")
-    lines.append("  }")
+    lines.append("  const entry =")
+    lines.append("    reviewData[`${kitId}::${toyName}`] ||")
+    lines.append("    reviewData[reviewAliases[`${kitId}::${normalizeToyName(toyName)}`] ?? \"\"];")
+    lines.append("  if (!entry) return null;")
     lines.append('  return { pros: lang === "cn" ? entry.pros_cn : entry.pros_en, cons: lang === "cn" ? entry.cons_cn : entry.cons_en };')
     lines.append("}")
     lines.append("")
 
-    output_path = Path(output_dir) / "toyReviews.ts"
-    write_ts(output_path, "\n".join(lines))
-    log.info("  Generated %d review entries", entry_count)
+    log.info("  Generated %d review entries", len(records))
+    log_alias_stats(alias_stats)
+    return write_ts(output_path, "\n".join(lines))
 
 
 # ---------------------------------------------------------------------------
@@ -167,7 +458,12 @@ def generate_reviews_ts(input_path: str, output_dir: str) -> None:
 # ---------------------------------------------------------------------------
 
 
-def generate_cleaning_ts(input_path: str, output_dir: str) -> None:
+def generate_cleaning_ts(
+    input_path: str,
+    output_dir: str,
+    force: bool = False,
+    names_path: str | None = None,
+) -> bool:
     """Generate toyCleaningGuide.ts from a cleaning guide JSON file.
 
     Expected input format (lovevery_cleaning_guide.json):
@@ -186,25 +482,26 @@ def generate_cleaning_ts(input_path: str, output_dir: str) -> None:
         ]
       }
     ]
-    """
-    log.info("Generating toyCleaningGuide.ts from %s", input_path)
-    data = load_json(input_path)
 
-    # Material parsing helper
-    def parse_material(mat_str: str) -> tuple[str, str]:
-        if "/" in mat_str:
-            parts = mat_str.split("/", 1)
-            return parts[0].strip(), parts[1].strip()
-        return mat_str, mat_str
+    If *names_path* points at the site's kits.ts, the toy names used there
+    are resolved into the alias table as well.
+
+    Returns True if toyCleaningGuide.ts was rewritten.
+    """
+    output_path = Path(output_dir) / "toyCleaningGuide.ts"
+    digest = source_hash("cleaning", input_path, *filter(None, [names_path]))
+    if not force and is_up_to_date(output_path, digest):
+        log.info("Skipping toyCleaningGuide.ts: %s unchanged", input_path)
+        return False
 
-    # Skip entries with no useful data
-    skip_materials = {"未知/Unknown"}
-    skip_cleaning = {"无", "无可用清洗建议", "无可用清洁说明", "None"}
+    log.info("Generating toyCleaningGuide.ts from %s", input_path)
+    records = collect_cleaning_records(load_records(input_path))
 
     lines: list[str] = []
     lines.append("/**")
     lines.append(" * Toy Cleaning Guide Data")
     lines.append(f" * Auto-generated from {Path(input_path).name}")
+    lines.append(f" * Source hash: {digest}")
     lines.append(" */")
     lines.append("")
     lines.append("export interface CleaningInfo {")
@@ -218,59 +515,35 @@ def generate_cleaning_ts(input_path: str, output_dir: str) -> None:
     lines.append('// Key format: "kitId::toyNameZh"')
     lines.append("const cleaningData: Record<string, CleaningInfo> = {")
 
-    entry_count = 0
-    for kit in data:
-        kit_id = kit.get("kit_id", "")
-        for toy in kit.get("toys", []):
-            material = toy.get("material", "")
-            cleaning_zh = toy.get("cleaning_zh", "")
-            cleaning_en = toy.get("cleaning_en", "")
-            name_zh = toy.get("name_zh", "")
-
-            # Skip useless entries
-            if material in skip_materials and cleaning_zh in skip_cleaning:
-                continue
-            if cleaning_zh in skip_cleaning:
-                continue
-            if cleaning_en in ("No cleaning instructions available.", "No cleaning instructions available", "None"):
-                continue
-
-            mat_cn, mat_en = parse_material(material)
-            key = escape_ts_string(f"{kit_id}::{name_zh}")
-
-            lines.append(f'  "{key}": {{')
-            lines.append(f'    material: "{escape_ts_string(material)}",')
-            lines.append(f'    materialCn: "{escape_ts_string(mat_cn)}",')
-            lines.append(f'    materialEn: "{escape_ts_string(mat_en)}",')
-            lines.append(f'    cleaningCn: "{escape_ts_string(cleaning_zh)}",')
-            lines.append(f'    cleaningEn: "{escape_ts_string(cleaning_en)}",')
-            lines.append("  },")
-            entry_count += 1
+    for kit_id, name_zh, _, fields in records:
+        key = escape_ts_string(f"{kit_id}::{name_zh}")
+        lines.append(f'  "{key}": {{')
+        for field, value in fields.items():
+            lines.append(f'    {field}: "{escape_ts_string(value)}",')
+        lines.append("  },")
 
     lines.append("};")
     lines.append("")
+
+    site_names = load_site_toy_names(names_path) if names_path else None
+    aliases, alias_stats = build_alias_index([r[:3] for r in records], site_names)
+    emit_alias_table(lines, "cleaningAliases", aliases)
+
     lines.append("/**")
-    lines.append(" * Look up cleaning info for a toy by kit ID and toy name (Chinese).")
+    lines.append(" * Look up cleaning info for a toy by kit ID and toy name (Chinese, English, or a known variant).")
     lines.append(" */")
     lines.append("export function getCleaningInfo(kitId: string, toyNameZh: string): CleaningInfo | null {")
-    lines.append("  const key = `${kitId}::${toyNameZh}`;")
-    lines.append("  if (cleaningData[key]) return cleaningData[key];")
-    lines.append("")
-    lines.append("  // Fuzzy match")
-    lines.append("  for (const k of Object.keys(cleaningData)) {")
-    lines.append('    if (!k.startsWith(kitId + "::")) continue;')
-    lines.append('    const name = k.split("::")[1];')
-    lines.append("    if (name.includes(toyNameZh) || toyNameZh.includes(name)) {")
-    lines.append("      return cleaningData[k];")
-    lines.append("    }")
-    lines.append("  }")
-    lines.append("  return null;")
+    lines.append("  return (")
+    lines.append("    cleaningData[`${kitId}::${toyNameZh}`] ||")
+    lines.append("    cleaningData[cleaningAliases[`${kitId}::${normalizeToyName(toyNameZh)}`] ?? \"\"] ||")
+    lines.append("    null")
+    lines.append("  );")
     lines.append("}")
     lines.append("")
 
-    output_path = Path(output_dir) / "toyCleaningGuide.ts"
-    write_ts(output_path, "\n".join(lines))
-    log.info("  Generated %d cleaning entries", entry_count)
+    log.info("  Generated %d cleaning entries", len(records))
+    log_alias_stats(alias_stats)
+    return write_ts(output_path, "\n".join(lines))
 
 
 # ---------------------------------------------------------------------------
@@ -278,11 +551,85 @@ def generate_cleaning_ts(input_path: str, output_dir: str) -> None:
 # ---------------------------------------------------------------------------
 
 
-def generate_images_ts(input_path: str, output_dir: str) -> None:
+# Contentful Images API widths, matching the display sizes in
+# client/src/lib/imageUtils.ts (thumbnail, hero, lightbox)
+IMAGE_TRANSFORM_WIDTHS = (224, 576, 1200)
+# Only this host serves the Images API; others (e.g. the Shopify CDN og:image)
+# ignore or reject the transform parameters
+CONTENTFUL_IMAGE_HOST = "images.ctfassets.net"
+
+
+def is_contentful_image(url: str) -> bool:
+    """Whether *url* is served by the Contentful Images API."""
+    return urlsplit(url).hostname == CONTENTFUL_IMAGE_HOST
+
+
+def contentful_transform_url(url: str, width: int) -> str:
+    """Return the Contentful Images API URL of *url* as WebP at *width* pixels."""
+    return f"{url.split('?', 1)[0]}?w={width}&fm=webp"
+
+
+def image_variants(url: str, width: int) -> tuple[str, str]:
+    """Return (largest WebP URL, srcset) for an image *width* pixels wide.
+
+    Transform widths above the intrinsic width are left out, since
+    Contentful would only upscale.
+    """
+    largest = min(width, IMAGE_TRANSFORM_WIDTHS[-1])
+    widths = [w for w in IMAGE_TRANSFORM_WIDTHS if w < largest] + [largest]
+    srcset = ", ".join(f"{contentful_transform_url(url, w)} {w}w" for w in widths)
+    return contentful_transform_url(url, widths[-1]), srcset
+
+
+def emit_image_meta(
+    lines: list[str], kit_images: dict[str, dict[str, Any]], manifest: dict[str, Any]
+) -> int:
+    """Append the imageMeta table for every kit image found in *manifest*.
+
+    WebP and srcset transforms are only emitted for Contentful images;
+    other hosts get their dimensions alone.
+    """
+    lines.append("interface ImageMeta {")
+    lines.append("  width: number;")
+    lines.append("  height: number;")
+    lines.append("  webp?: string;")
+    lines.append("  srcSet?: string;")
+    lines.append("}")
+    lines.append("")
+    lines.append("const imageMeta: Record<string, ImageMeta> = {")
+    emitted: set[str] = set()
+    for entry in kit_images.values():
+        for url in [entry["heroImage"], *entry["toyImages"]]:
+            info = manifest.get(url)
+            if not info or url in emitted:
+                continue
+            emitted.add(url)
+            lines.append(f'  "{escape_ts_string(url)}": {{')
+            lines.append(f'    width: {info["width"]},')
+            lines.append(f'    height: {info["height"]},')
+            if is_contentful_image(url):
+                webp, srcset = image_variants(url, info["width"])
+                lines.append(f'    webp: "{escape_ts_string(webp)}",')
+                lines.append(f'    srcSet: "{escape_ts_string(srcset)}",')
+            lines.append("  },")
+    lines.append("};")
+    lines.append("")
+    return len(emitted)
+
+
+def generate_images_ts(
+    input_path: str,
+    output_dir: str,
+    force: bool = False,
+    image_manifest: str | None = None,
+) -> bool:
     """Generate or update toyImages.ts from a kits JSON file.
 
     This reads the output of scrape_lovevery_official.py and extracts
-    hero images and toy images for each kit.
+    hero images and toy images for each kit.  With an *image_manifest*
+    from probe_images.py, the width and height of each probed image are
+    emitted too (getImageMeta), plus a WebP transform URL and srcset for
+    Contentful images.
 
     Expected input format:
     [
@@ -293,14 +640,23 @@ def generate_images_ts(input_path: str, output_dir: str) -> None:
         "toys": [{"name": "...", "image": "..."}]
       }
     ]
+
+    Returns True if toyImages.ts was rewritten.
     """
+    output_path = Path(output_dir) / "toyImages.ts"
+    digest = source_hash("images", input_path, *([image_manifest] if image_manifest else []))
+    if not force and is_up_to_date(output_path, digest):
+        log.info("Skipping toyImages.ts: %s unchanged", input_path)
+        return False
+
     log.info("Generating toyImages.ts from %s", input_path)
-    data = load_json(input_path)
+    kit_images = collect_kit_images(load_records(input_path))
 
     lines: list[str] = []
     lines.append("/**")
     lines.append(" * Toy Image URLs")
     lines.append(f" * Auto-generated from {Path(input_path).name}")
+    lines.append(f" * Source hash: {digest}")
     lines.append(" */")
     lines.append("")
     lines.append("interface KitImages {")
@@ -308,22 +664,17 @@ def generate_images_ts(input_path: str, output_dir: str) -> None:
     lines.append("  toyImages: string[];")
     lines.append("}")
     lines.append("")
-    lines.append("const kitImageData: Record<string, KitImages> = {")
-
-    for kit in data:
-        slug = kit.get("slug", "")
-        hero = kit.get("og_image", "")
-        images = kit.get("images", [])
-        toy_images = [t.get("image", "") for t in kit.get("toys", []) if t.get("image")]
+    meta_count = 0
+    if image_manifest:
+        meta_count = emit_image_meta(lines, kit_images, load_json(image_manifest))
 
-        # Use first Contentful image as hero if og_image is empty
-        if not hero and images:
-            hero = images[0]
+    lines.append("const kitImageData: Record<string, KitImages> = {")
 
+    for slug, entry in kit_images.items():
         lines.append(f'  "{escape_ts_string(slug)}": {{')
-        lines.append(f'    heroImage: "{escape_ts_string(hero)}",')
+        lines.append(f'    heroImage: "{escape_ts_string(entry["heroImage"])}",')
         lines.append(f"    toyImages: [")
-        for img in (toy_images or images[:10]):
+        for img in entry["toyImages"]:
             lines.append(f'      "{escape_ts_string(img)}",')
         lines.append("    ],")
         lines.append("  },")
@@ -343,10 +694,468 @@ def generate_images_ts(input_path: str, output_dir: str) -> None:
     lines.append("  return kitImageData[kitId]?.toyImages || [];")
     lines.append("}")
     lines.append("")
+    if image_manifest:
+        lines.append("export function getImageMeta(url: string): ImageMeta | undefined {")
+        lines.append("  return imageMeta[url];")
+        lines.append("}")
+        lines.append("")
 
-    output_path = Path(output_dir) / "toyImages.ts"
-    write_ts(output_path, "\n".join(lines))
-    log.info("  Generated image data for %d kits", len(data))
+    log.info("  Generated image data for %d kits", len(kit_images))
+    if image_manifest:
+        log.info("  Dimensions for %d images from %s", meta_count, image_manifest)
+    return write_ts(output_path, "\n".join(lines))
+
+
+# ---------------------------------------------------------------------------
+# Generator: per-kit shards (kits/*.json + kitShards.ts)
+# ---------------------------------------------------------------------------
+
+SHARD_DIR = "kits"
+
+# Shard files referenced by the kitShards.ts manifest
+SHARD_IMPORT_RE = re.compile(rf'import\("\./{SHARD_DIR}/([^"]+)"\)')
+
+# Fields of a scraped kit (scrape_lovevery_official.py) kept as kit content
+KIT_CONTENT_FIELDS = ("title", "description", "price", "currency", "url", "toys")
+
+
+def site_kit_id(slug: str) -> str:
+    """Return the site's kitId for a scraper slug ("free-spirit" -> "freeSpirit").
+
+    The scrapers key kits by their lovevery.com slug while kits.ts and the
+    alternatives data use camelCase IDs; shards are keyed by the latter.
+    """
+    head, *rest = slug.split("-")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+def shards_present(manifest_path: Path) -> bool:
+    """Check that every shard file named in a kitShards.ts manifest exists."""
+    shard_root = manifest_path.parent
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        names = SHARD_IMPORT_RE.findall(f.read())
+    return all((shard_root / SHARD_DIR / name).is_file() for name in names)
+
+# ---------------------------------------------------------------------------
+# Language split
+# ---------------------------------------------------------------------------
+
+LANGUAGES = ("cn", "en")
+
+# Per-language text fields, as {output field: source field}
+REVIEW_LANG_FIELDS = {
+    "cn": {"pros": "pros_cn", "cons": "cons_cn"},
+    "en": {"pros": "pros_en", "cons": "cons_en"},
+}
+CLEANING_LANG_FIELDS = {
+    "cn": {"material": "materialCn", "cleaning": "cleaningCn"},
+    "en": {"material": "materialEn", "cleaning": "cleaningEn"},
+}
+ALTERNATIVE_REASON_FIELDS = {"cn": "reasonCn", "en": "reasonEn"}
+
+# Language-neutral fields, shipped once regardless of locale.  The Amazon
+# product name is English in both UIs, so it counts as neutral.
+ALTERNATIVE_SHARED_FIELDS = (
+    "name", "asin", "price", "rating", "reviewCount", "imageUrl", "amazonUrl",
+)
+KIT_SHARED_FIELDS = ("price", "currency", "url")
+# Scraped kit copy is English-only; the Chinese UI takes its copy from kits.ts
+KIT_TEXT_LANGUAGE = "en"
+
+
+def split_alternatives(
+    toys: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], dict[str, list[dict[str, Any]]]]:
+    """Split one kit's alternatives into shared fields and per-language text.
+
+    The per-language lists are index-parallel to the shared list: entry *i*
+    carries the localized toy name and one reason per alternative of toy *i*.
+    """
+    shared: list[dict[str, Any]] = []
+    text: dict[str, list[dict[str, Any]]] = {lang: [] for lang in LANGUAGES}
+    for toy in toys:
+        alts = toy.get("alternatives", [])
+        shared.append({
+            "toyName": toy.get("toyName", ""),
+            "alternatives": [
+                {k: alt[k] for k in ALTERNATIVE_SHARED_FIELDS if k in alt} for alt in alts
+            ],
+        })
+        for lang in LANGUAGES:
+            text[lang].append({
+                "toyName": toy.get("toyNameCn", "") if lang == "cn" else toy.get("toyName", ""),
+                "reasons": [alt.get(ALTERNATIVE_REASON_FIELDS[lang], "") for alt in alts],
+            })
+    return shared, text
+
+
+def split_shard_languages(
+    payload: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Split a combined kit shard into a shared part and one part per language.
+
+    Keys never overlap between the parts, so the client can merge a shared
+    part and one locale part with a plain object spread.
+    """
+    kit = payload["kit"]
+    shared = {
+        "kitId": payload["kitId"],
+        "kit": {k: kit[k] for k in KIT_SHARED_FIELDS if k in kit} if kit else None,
+        "images": payload["images"],
+        "reviewAliases": payload["reviewAliases"],
+        "cleaningAliases": payload["cleaningAliases"],
+    }
+    shared_alts, alt_text = split_alternatives(payload["alternatives"])
+    shared["alternatives"] = shared_alts
+
+    locales: dict[str, dict[str, Any]] = {}
+    for lang in LANGUAGES:
+        locales[lang] = {
+            "kitText": (
+                {k: v for k, v in kit.items() if k not in KIT_SHARED_FIELDS}
+                if kit and lang == KIT_TEXT_LANGUAGE else None
+            ),
+            "reviews": {
+                name: {out: fields[src] for out, src in REVIEW_LANG_FIELDS[lang].items()}
+                for name, fields in payload["reviews"].items()
+            },
+            "cleaning": {
+                name: {out: fields[src] for out, src in CLEANING_LANG_FIELDS[lang].items()}
+                for name, fields in payload["cleaning"].items()
+            },
+            "alternativeText": alt_text[lang],
+        }
+    return shared, locales
+
+
+def to_json(payload: Any) -> str:
+    """Serialise a payload compactly and deterministically."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def describe_split_size(split_bytes: int, combined_bytes: int) -> str:
+    """Compare a language split's per-page size with the combined payload.
+
+    A saving is only claimed when there is one: on small inputs the extra
+    shared file can outweigh what the split removes.
+    """
+    text = f"{split_bytes} bytes vs {combined_bytes} combined"
+    if split_bytes < combined_bytes:
+        return f"{text} ({100 * (1 - split_bytes / combined_bytes):.0f}% smaller)"
+    return f"{text} (no saving)"
+
+
+def split_aliases(aliases: dict[str, str]) -> dict[str, dict[str, str]]:
+    """Turn "kitId::alias" -> "kitId::name" into per-kit alias -> name maps."""
+    per_kit: dict[str, dict[str, str]] = {}
+    for alias, key in aliases.items():
+        kit_id, _, norm = alias.partition("::")
+        per_kit.setdefault(kit_id, {})[norm] = key.partition("::")[2]
+    return per_kit
+
+
+def generate_kit_shards(
+    output_dir: str,
+    reviews_input: str | None = None,
+    cleaning_input: str | None = None,
+    images_input: str | None = None,
+    alternatives_input: str | None = None,
+    force: bool = False,
+    names_path: str | None = None,
+    split_languages: bool = False,
+) -> bool:
+    """Write one lazily importable JSON shard per kit plus a kitShards.ts manifest.
+
+    Each ``kits/<kitId>.json`` holds that kit's reviews, cleaning info,
+    images, Amazon alternatives and scraped kit content, with per-kit alias
+    tables so lookups need no other data.  kitShards.ts maps kit IDs to
+    dynamic ``import()`` calls, which Vite splits into one chunk per kit.
+
+    With *split_languages*, ``kits/<kitId>.json`` keeps only language-neutral
+    data and the text for each language goes to ``kits/<kitId>.<lang>.json``,
+    so a page downloads one language only.
+
+    Returns True if any file was written or removed.
+    """
+    inputs = [p for p in (reviews_input, cleaning_input, images_input, alternatives_input) if p]
+    output_path = Path(output_dir) / "kitShards.ts"
+    # The kind records which slot each input filled, not just its bytes
+    slots = "".join(
+        "1" if p else "0"
+        for p in (reviews_input, cleaning_input, images_input, alternatives_input)
+    ) + (":split" if split_languages else "")
+    digest = source_hash(f"shards:{slots}", *inputs, *filter(None, [names_path]))
+    if not force and is_up_to_date(output_path, digest) and shards_present(output_path):
+        log.info("Skipping kit shards: inputs unchanged")
+        return False
+
+    log.info("Generating per-kit shards from %s", ", ".join(inputs))
+    shards: dict[str, dict[str, Any]] = {}
+
+    def shard(kit_id: str) -> dict[str, Any]:
+        return shards.setdefault(kit_id, {
+            "kitId": kit_id,
+            "kit": None,
+            "reviews": {},
+            "reviewAliases": {},
+            "cleaning": {},
+            "cleaningAliases": {},
+            "images": None,
+            "alternatives": [],
+        })
+
+    site_names = load_site_toy_names(names_path) if names_path else None
+
+    if images_input:
+        for kit in load_records(images_input):
+            slug = kit.get("slug", "")
+            kit_id = site_kit_id(slug)
+            content = {k: kit[k] for k in KIT_CONTENT_FIELDS if k in kit}
+            # Images live in their own section; drop them from toy content
+            content["toys"] = [
+                {k: v for k, v in toy.items() if k != "image"}
+                for toy in content.get("toys", [])
+            ]
+            shard(kit_id)["kit"] = content
+            shard(kit_id)["images"] = collect_kit_images([kit])[slug]
+
+    for path, data_key, alias_key, collect in (
+        (reviews_input, "reviews", "reviewAliases", collect_review_records),
+        (cleaning_input, "cleaning", "cleaningAliases", collect_cleaning_records),
+    ):
+        if not path:
+            continue
+        records = [
+            (site_kit_id(kit_id), name, others, fields)
+            for kit_id, name, others, fields in collect(load_records(path))
+        ]
+        for kit_id, name, _, fields in records:
+            shard(kit_id)[data_key][name] = fields
+        aliases, alias_stats = build_alias_index([r[:3] for r in records], site_names)
+        for kit_id, kit_aliases in split_aliases(aliases).items():
+            shard(kit_id)[alias_key] = dict(sorted(kit_aliases.items()))
+        log.info("  %s:", data_key)
+        log_alias_stats(alias_stats)
+
+    if alternatives_input:
+        for kit in load_json(alternatives_input):
+            shard(site_kit_id(kit.get("kitId", "")))["alternatives"] = kit.get("toys", [])
+
+    shards.pop("", None)
+    shard_dir = Path(output_dir) / SHARD_DIR
+    files: dict[str, str] = {}
+    if split_languages:
+        combined_bytes = split_bytes = 0
+        for kit_id, payload in shards.items():
+            shared, locales = split_shard_languages(payload)
+            files[f"{kit_id}.json"] = to_json(shared)
+            for lang, text in locales.items():
+                files[f"{kit_id}.{lang}.json"] = to_json(text)
+            combined_bytes += len(to_json(payload).encode("utf-8"))
+            split_bytes += len(files[f"{kit_id}.json"].encode("utf-8")) + max(
+                len(files[f"{kit_id}.{lang}.json"].encode("utf-8")) for lang in LANGUAGES
+            )
+        log.info(
+            "  Language split, per page worst case: %s",
+            describe_split_size(split_bytes, combined_bytes),
+        )
+    else:
+        for kit_id, payload in shards.items():
+            files[f"{kit_id}.json"] = to_json(payload)
+
+    changed = False
+    for name, content in files.items():
+        changed |= write_ts(shard_dir / name, content)
+
+    # Remove shards for kits (or languages) that are no longer generated
+    for stale in sorted(shard_dir.glob("*.json")):
+        if stale.name not in files:
+            stale.unlink()
+            log.info("  Removed stale shard: %s", stale)
+            changed = True
+
+    lines: list[str] = []
+    lines.append("/**")
+    lines.append(" * Per-Kit Data Shards (lazy-loaded)")
+    lines.append(f" * Auto-generated from {', '.join(Path(p).name for p in inputs)}")
+    lines.append(f" * Source hash: {digest}")
+    lines.append(" */")
+    lines.append("")
+    if split_languages:
+        emit_split_shard_manifest(lines, list(shards))
+    else:
+        emit_shard_manifest(lines, list(shards))
+    lines.extend(TS_NORMALIZE_FN)
+    lines.append("")
+    lines.append("/**")
+    lines.append(" * Look up a toy in one of a shard's sections by name or known variant.")
+    lines.append(" * @example lookupShardToy(shard.reviews, shard.reviewAliases, toy.name)")
+    lines.append(" */")
+    lines.append("export function lookupShardToy<T>(data: Record<string, T>, aliases: Record<string, string>, toyName: string): T | null {")
+    lines.append('  return data[toyName] || data[aliases[normalizeToyName(toyName)] ?? ""] || null;')
+    lines.append("}")
+    lines.append("")
+
+    changed |= write_ts(output_path, "\n".join(lines))
+    log.info("  Generated %d kit shards", len(shards))
+    return changed
+
+
+def emit_shard_manifest(lines: list[str], kit_ids: list[str]) -> None:
+    """Append the KitShard type and loaders for combined-language shards."""
+    lines.append("export interface KitShard {")
+    lines.append("  kitId: string;")
+    lines.append("  kit: Record<string, unknown> | null;")
+    lines.append("  reviews: Record<string, { pros_cn: string; pros_en: string; cons_cn: string; cons_en: string }>;")
+    lines.append("  reviewAliases: Record<string, string>;")
+    lines.append("  cleaning: Record<string, { material: string; materialCn: string; materialEn: string; cleaningCn: string; cleaningEn: string }>;")
+    lines.append("  cleaningAliases: Record<string, string>;")
+    lines.append("  images: { heroImage: string; toyImages: string[] } | null;")
+    lines.append("  alternatives: unknown[];")
+    lines.append("}")
+    lines.append("")
+    lines.append("const shardLoaders: Record<string, () => Promise<{ default: unknown }>> = {")
+    for kit_id in kit_ids:
+        kid = escape_ts_string(kit_id)
+        lines.append(f'  "{kid}": () => import("./{SHARD_DIR}/{kid}.json"),')
+    lines.append("};")
+    lines.append("")
+    lines.append("export const kitShardIds: string[] = Object.keys(shardLoaders);")
+    lines.append("")
+    lines.append("/**")
+    lines.append(" * Load the data shard for one kit; resolves to null for unknown kits.")
+    lines.append(" */")
+    lines.append("export async function loadKitShard(kitId: string): Promise<KitShard | null> {")
+    lines.append("  const load = shardLoaders[kitId];")
+    lines.append("  return load ? ((await load()).default as KitShard) : null;")
+    lines.append("}")
+    lines.append("")
+
+
+def emit_split_shard_manifest(lines: list[str], kit_ids: list[str]) -> None:
+    """Append the KitShard type and loaders for language-split shards."""
+    lines.append('export type ShardLang = "cn" | "en";')
+    lines.append("")
+    lines.append("export interface KitShard {")
+    lines.append("  kitId: string;")
+    lines.append("  kit: { price?: string | null; currency?: string; url?: string } | null;")
+    lines.append("  images: { heroImage: string; toyImages: string[] } | null;")
+    lines.append("  reviewAliases: Record<string, string>;")
+    lines.append("  cleaningAliases: Record<string, string>;")
+    lines.append("  alternatives: { toyName: string; alternatives: Record<string, unknown>[] }[];")
+    lines.append("  // Language-specific part")
+    lines.append("  kitText: Record<string, unknown> | null;")
+    lines.append("  reviews: Record<string, { pros: string; cons: string }>;")
+    lines.append("  cleaning: Record<string, { material: string; cleaning: string }>;")
+    lines.append("  // Index-parallel to alternatives: one toy name and one reason per alternative")
+    lines.append("  alternativeText: { toyName: string; reasons: string[] }[];")
+    lines.append("}")
+    lines.append("")
+    lines.append("type Loader = () => Promise<{ default: unknown }>;")
+    lines.append("")
+    lines.append("const shardLoaders: Record<string, { shared: Loader } & Record<ShardLang, Loader>> = {")
+    for kit_id in kit_ids:
+        kid = escape_ts_string(kit_id)
+        lines.append(f'  "{kid}": {{')
+        lines.append(f'    shared: () => import("./{SHARD_DIR}/{kid}.json"),')
+        for lang in LANGUAGES:
+            lines.append(f'    {lang}: () => import("./{SHARD_DIR}/{kid}.{lang}.json"),')
+        lines.append("  },")
+    lines.append("};")
+    lines.append("")
+    lines.append("export const kitShardIds: string[] = Object.keys(shardLoaders);")
+    lines.append("")
+    lines.append("/**")
+    lines.append(" * Load one kit's shared data plus the text for a single language;")
+    lines.append(" * resolves to null for unknown kits.")
+    lines.append(" */")
+    lines.append("export async function loadKitShard(kitId: string, lang: ShardLang): Promise<KitShard | null> {")
+    lines.append("  const loaders = shardLoaders[kitId];")
+    lines.append("  if (!loaders) return null;")
+    lines.append("  const [shared, text] = await Promise.all([loaders.shared(), loaders[lang]()]);")
+    lines.append("  return { ...(shared.default as object), ...(text.default as object) } as KitShard;")
+    lines.append("}")
+    lines.append("")
+
+
+# ---------------------------------------------------------------------------
+# Generator: language-split alternatives export
+# ---------------------------------------------------------------------------
+
+
+def generate_alternatives_split(input_path: str, output_dir: str, force: bool = False) -> bool:
+    """Split lovevery_alternatives.json into a shared file and one file per language.
+
+    Writes ``alternatives.shared.json`` (kit/toy structure with ASIN, price,
+    rating, review count, image and link) and ``alternatives.<lang>.json``
+    holding, per kit, the localized toy names and reasons index-parallel to
+    the shared file.  Each file records the input hash under ``"sourceHash"``.
+
+    Returns True if any file was rewritten.
+    """
+    out_dir = Path(output_dir)
+    shared_path = out_dir / "alternatives.shared.json"
+    digest = source_hash("alternatives", input_path)
+    if not force and shared_path.is_file():
+        try:
+            if load_json(str(shared_path)).get("sourceHash") == digest:
+                log.info("Skipping alternatives split: %s unchanged", input_path)
+                return False
+        except (json.JSONDecodeError, AttributeError):
+            pass
+
+    log.info("Splitting alternatives by language from %s", input_path)
+    data = load_json(input_path)
+
+    shared_kits: list[dict[str, Any]] = []
+    locales: dict[str, dict[str, Any]] = {
+        lang: {"sourceHash": digest, "kits": {}} for lang in LANGUAGES
+    }
+    for kit in data:
+        kit_id = kit.get("kitId", "")
+        shared_toys, text = split_alternatives(kit.get("toys", []))
+        shared_kits.append({"kitId": kit_id, "kitName": kit.get("kitName", ""), "toys": shared_toys})
+        for lang in LANGUAGES:
+            locales[lang]["kits"][kit_id] = text[lang]
+
+    changed = False
+    for lang, payload in locales.items():
+        changed |= write_ts(out_dir / f"alternatives.{lang}.json", to_json(payload))
+    # Shared file last: its hash marks the whole set as complete
+    changed |= write_ts(shared_path, to_json({"sourceHash": digest, "kits": shared_kits}))
+
+    combined = len(to_json(data).encode("utf-8"))
+    per_page = shared_path.stat().st_size + max(
+        (out_dir / f"alternatives.{lang}.json").stat().st_size for lang in LANGUAGES
+    )
+    log.info("  Per-page payload: %s", describe_split_size(per_page, combined))
+    return changed
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def run_generators(
+    jobs: list[tuple[Any, str, dict[str, Any]]],
+    output_dir: str,
+    force: bool = False,
+    max_workers: int | None = None,
+) -> int:
+    """Run (generator, input_path, kwargs) jobs, in parallel when there are several.
+
+    Returns the number of files that were actually rewritten.
+    """
+    if len(jobs) == 1 or max_workers == 1:
+        results = [gen(path, output_dir, force, **kw) for gen, path, kw in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers or len(jobs)) as pool:
+            futures = [
+                pool.submit(gen, path, output_dir, force, **kw) for gen, path, kw in jobs
+            ]
+            results = [f.result() for f in futures]
+    return sum(1 for changed in results if changed)
 
 
 # ---------------------------------------------------------------------------
@@ -369,6 +1178,24 @@ Examples:
   # Generate toyImages.ts
   %(prog)s images -i data/lovevery_kits.json -o ../client/src/data/
 
+  # Same, with image dimensions and WebP URLs (see probe_images.py)
+  %(prog)s images -i data/lovevery_kits.json --image-manifest data/image_manifest.json \\
+    -o ../client/src/data/
+
+  # Generate per-kit shards (kits/*.json) and kitShards.ts
+  %(prog)s shards \\
+    --reviews-input data/reviews.json \\
+    --cleaning-input data/cleaning.json \\
+    --images-input data/kits.json \\
+    --alternatives-input lovevery_alternatives.json \\
+    -o ../client/src/data/
+
+  # Same, with each kit's text split into one file per language
+  %(prog)s shards --split-languages --images-input data/kits.json -o ../client/src/data/
+
+  # Split lovevery_alternatives.json into shared + per-language files
+  %(prog)s alternatives -i lovevery_alternatives.json -o ../client/src/data/
+
   # Generate all TypeScript files at once
   %(prog)s all \\
     --reviews-input data/reviews.json \\
@@ -379,6 +1206,9 @@ Examples:
     )
 
     subparsers = parser.add_subparsers(dest="command", help="Data type to generate")
+    # Without the site's names, lookups by a name that is neither a data key
+    # nor one of its variants would miss, so they are resolved by default
+    default_names = str(DEFAULT_SITE_NAMES) if DEFAULT_SITE_NAMES.is_file() else None
 
     # Reviews subcommand
     reviews_parser = subparsers.add_parser("reviews", help="Generate toyReviews.ts")
@@ -388,6 +1218,11 @@ Examples:
     reviews_parser.add_argument(
         "-o", "--output-dir", required=True, help="Output directory for .ts file"
     )
+    reviews_parser.add_argument(
+        "--names", default=default_names,
+        help="Site kits.ts whose toy names are pre-resolved into the alias table "
+        "(default: client/src/data/kits.ts if present)",
+    )
 
     # Cleaning subcommand
     cleaning_parser = subparsers.add_parser("cleaning", help="Generate toyCleaningGuide.ts")
@@ -397,6 +1232,11 @@ Examples:
     cleaning_parser.add_argument(
         "-o", "--output-dir", required=True, help="Output directory for .ts file"
     )
+    cleaning_parser.add_argument(
+        "--names", default=default_names,
+        help="Site kits.ts whose toy names are pre-resolved into the alias table "
+        "(default: client/src/data/kits.ts if present)",
+    )
 
     # Images subcommand
     images_parser = subparsers.add_parser("images", help="Generate toyImages.ts")
@@ -406,6 +1246,46 @@ Examples:
     images_parser.add_argument(
         "-o", "--output-dir", required=True, help="Output directory for .ts file"
     )
+    images_parser.add_argument(
+        "--image-manifest",
+        help="Image manifest from probe_images.py; adds dimensions and WebP URLs",
+    )
+
+    # Shards subcommand
+    shards_parser = subparsers.add_parser(
+        "shards", help="Generate per-kit JSON shards and the kitShards.ts manifest"
+    )
+    shards_parser.add_argument("--reviews-input", help="Input reviews JSON file")
+    shards_parser.add_argument("--cleaning-input", help="Input cleaning guide JSON file")
+    shards_parser.add_argument(
+        "--images-input", help="Input kits JSON file (images and kit content)"
+    )
+    shards_parser.add_argument(
+        "--alternatives-input", help="Input alternatives JSON file (lovevery_alternatives.json)"
+    )
+    shards_parser.add_argument(
+        "--names", default=default_names,
+        help="Site kits.ts whose toy names are pre-resolved into the alias tables "
+        "(default: client/src/data/kits.ts if present)",
+    )
+    shards_parser.add_argument(
+        "-o", "--output-dir", required=True, help="Output directory for shards and manifest"
+    )
+    shards_parser.add_argument(
+        "--split-languages", action="store_true",
+        help="Write language-neutral data and per-language text to separate shard files",
+    )
+
+    # Alternatives subcommand
+    alternatives_parser = subparsers.add_parser(
+        "alternatives", help="Split alternatives JSON into shared + per-language files"
+    )
+    alternatives_parser.add_argument(
+        "-i", "--input", required=True, help="Input alternatives JSON file"
+    )
+    alternatives_parser.add_argument(
+        "-o", "--output-dir", required=True, help="Output directory for the split files"
+    )
 
     # All subcommand
     all_parser = subparsers.add_parser("all", help="Generate all TypeScript files")
@@ -421,6 +1301,28 @@ Examples:
     all_parser.add_argument(
         "-o", "--output-dir", required=True, help="Output directory for .ts files"
     )
+    all_parser.add_argument(
+        "--names", default=default_names,
+        help="Site kits.ts whose toy names are pre-resolved into the alias tables "
+        "(default: client/src/data/kits.ts if present)",
+    )
+    all_parser.add_argument(
+        "--image-manifest",
+        help="Image manifest from probe_images.py; adds dimensions and WebP URLs",
+    )
+    all_parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="Maximum number of generators to run in parallel (default: one per input)",
+    )
+
+    for sub in (
+        reviews_parser, cleaning_parser, images_parser,
+        shards_parser, alternatives_parser, all_parser,
+    ):
+        sub.add_argument(
+            "--force", action="store_true",
+            help="Regenerate even if the inputs are unchanged",
+        )
 
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable debug logging"
@@ -436,26 +1338,48 @@ Examples:
         sys.exit(1)
 
     if args.command == "reviews":
-        generate_reviews_ts(args.input, args.output_dir)
+        generate_reviews_ts(args.input, args.output_dir, args.force, args.names)
 
     elif args.command == "cleaning":
-        generate_cleaning_ts(args.input, args.output_dir)
+        generate_cleaning_ts(args.input, args.output_dir, args.force, args.names)
 
     elif args.command == "images":
-        generate_images_ts(args.input, args.output_dir)
+        generate_images_ts(args.input, args.output_dir, args.force, args.image_manifest)
+
+    elif args.command == "shards":
+        inputs = [args.reviews_input, args.cleaning_input, args.images_input, args.alternatives_input]
+        if not any(inputs):
+            log.error(
+                "No input files specified. Use --reviews-input, --cleaning-input, "
+                "--images-input, or --alternatives-input."
+            )
+            sys.exit(1)
+        generate_kit_shards(
+            args.output_dir, *inputs,
+            force=args.force, names_path=args.names, split_languages=args.split_languages,
+        )
+
+    elif args.command == "alternatives":
+        generate_alternatives_split(args.input, args.output_dir, args.force)
 
     elif args.command == "all":
+        jobs: list[tuple[Any, str, dict[str, Any]]] = []
         if args.reviews_input:
-            generate_reviews_ts(args.reviews_input, args.output_dir)
+            jobs.append((generate_reviews_ts, args.reviews_input, {"names_path": args.names}))
         if args.cleaning_input:
-            generate_cleaning_ts(args.cleaning_input, args.output_dir)
+            jobs.append((generate_cleaning_ts, args.cleaning_input, {"names_path": args.names}))
         if args.images_input:
-            generate_images_ts(args.images_input, args.output_dir)
+            jobs.append(
+                (generate_images_ts, args.images_input, {"image_manifest": args.image_manifest})
+            )
 
-        if not any([args.reviews_input, args.cleaning_input, args.images_input]):
+        if not jobs:
             log.error("No input files specified. Use --reviews-input, --cleaning-input, or --images-input.")
             sys.exit(1)
 
+        changed = run_generators(jobs, args.output_dir, args.force, args.jobs)
+        log.info("%d of %d file(s) rewritten", changed, len(jobs))
+
     log.info("All done!")
 
 
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+jsonl_stream.py — Resumable JSONL output shared by the --stream scrapers.
+
+scrape_reviews.py and scrape_cleaning_guide.py can append each kit to
+<output>.jsonl as soon as it is finished instead of holding every kit in
+memory until the end:
+
+  - each record is one line, flushed and fsynced before the next kit starts,
+    so a crash keeps every kit already written;
+  - reopening a stream indexes the records already in it (one line at a
+    time) and truncates an unterminated trailing line, so a rerun resumes;
+  - at the end the stream is copied record by record into the usual JSON
+    array through a temporary file and an atomic rename.
+
+Usage (from another script in this directory):
+    from jsonl_stream import append_record, finalize_stream, open_stream, stream_path
+
+    stream = stream_path(Path("lovevery_reviews.json"))
+    f, done = open_stream(stream, "kit_slug")
+    append_record(f, {"kit_slug": "looker", ...})
+    f.close()
+    finalize_stream(stream, Path("lovevery_reviews.json"), "kit_slug")
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+def stream_path(output: Path) -> Path:
+    """Return the JSONL stream kept next to an output file."""
+    return output.with_suffix(".jsonl")
+
+
+def index_stream(path: Path, key: str) -> tuple[dict[str, int], int]:
+    """Scan a JSONL stream one line at a time.
+
+    Returns a map from each record's *key* to the byte offset of its last
+    line, and the offset just past the last complete line.  An unterminated
+    trailing line (from an interrupted write) is not counted.
+    """
+    index: dict[str, int] = {}
+    end = 0
+    if not path.is_file():
+        return index, end
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                index[json.loads(line)[key]] = end
+            except (json.JSONDecodeError, KeyError, TypeError):
+                log.warning("Ignoring unreadable record at byte %d of %s", end, path)
+            end += len(line)
+    return index, end
+
+
+def open_stream(path: Path, key: str) -> tuple[Any, dict[str, int]]:
+    """Open a JSONL stream for appending, resuming any records already in it.
+
+    A partial trailing line is truncated so new records start cleanly.
+    Returns the binary file handle and the index from index_stream.
+    """
+    index, end = index_stream(path, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(path, "ab")
+    f.truncate(end)
+    return f, index
+
+
+def append_record(f: Any, record: dict[str, Any]) -> None:
+    """Append one record to a JSONL stream and flush it to disk."""
+    f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def finalize_stream(
+    stream: Path, output: Path, key: str, order: list[str] | None = None
+) -> int:
+    """Atomically rewrite a JSONL stream as the JSON array in *output*.
+
+    Records are copied one at a time (the last one per *key* wins), in
+    *order* when given and stream order otherwise, formatted exactly as
+    ``json.dump(..., indent=2)`` would.  The stream is removed afterwards.
+    Returns the number of records written.
+    """
+    index, _ = index_stream(stream, key)
+    keys = [k for k in order if k in index] if order is not None else list(index)
+    tmp = output.with_suffix(output.suffix + ".tmp")
+    with open(stream, "rb") as src, open(tmp, "w", encoding="utf-8") as dst:
+        dst.write("[" if keys else "[]")
+        for i, k in enumerate(keys):
+            src.seek(index[k])
+            record = json.loads(src.readline())
+            body = json.dumps(record, ensure_ascii=False, indent=2)
+            dst.write(("," if i else "") + "\n  " + body.replace("\n", "\n  "))
+        if keys:
+            dst.write("\n]")
+    os.replace(tmp, output)
+    stream.unlink()
+    return len(keys)
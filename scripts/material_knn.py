@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+material_knn.py — Offline nearest-neighbour toy material classifier.
+
+Trained on toys whose material is already known, from either the generated
+toyCleaningGuide.ts (entry keys give the Chinese name, alias tables add the
+English and site names) or a cleaning guide JSON/JSONL from
+scrape_cleaning_guide.py.  Names are normalised like the site's
+normalizeToyName() and turned into TF-IDF weighted character 1/2/3-gram
+vectors; a toy is labelled by a similarity-weighted vote of its k nearest
+neighbours (cosine, one NumPy matrix product per batch).  A label is only
+accepted when the nearest neighbour is similar enough and the vote is
+clear; the defaults favour precision over coverage.
+
+scrape_cleaning_guide.py runs it after the keyword rules and before --enrich,
+so only toys the classifier is unsure about reach the LLM.  The `evaluate`
+command measures accuracy and coverage by holding out one kit at a time.
+
+Usage:
+    python material_knn.py evaluate
+    python material_knn.py evaluate --data lovevery_cleaning_guide.json -v
+    python material_knn.py predict "Wooden Stacking Rings" "Organic Cotton Sling"
+
+Requirements:
+    pip install numpy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from generate_toy_data import load_records, normalize_toy_name
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DEFAULT_TRAINING_DATA = (
+    Path(__file__).resolve().parent.parent / "client" / "src" / "data" / "toyCleaningGuide.ts"
+)
+NGRAM_SIZES = (1, 2, 3)  # unigrams matter for Chinese (木, 棉, 纸)
+DEFAULT_K = 7
+MIN_SIMILARITY = 0.25  # cosine of the nearest neighbour
+MIN_CONFIDENCE = 0.75  # winning label's share of the neighbour vote
+MIN_COVERAGE = 0.5  # share of the query's n-grams seen in training
+
+UNKNOWN_MATERIALS = {"", "未知", "Unknown"}
+
+_TS_STRING = r'"((?:[^"\\]|\\.)*)"'
+TS_ENTRY_RE = re.compile(
+    rf"^  {_TS_STRING}: \{{\s*material: {_TS_STRING},\s*materialCn: {_TS_STRING},"
+    rf"\s*materialEn: {_TS_STRING},\s*cleaningCn: {_TS_STRING},\s*cleaningEn: {_TS_STRING},",
+    re.MULTILINE,
+)
+TS_ALIAS_RE = re.compile(rf"^  {_TS_STRING}: {_TS_STRING},$", re.MULTILINE)
+
+log = logging.getLogger(__name__)
+
+
+class Sample(NamedTuple):
+    """One labelled toy: every name it is known by, its material and cleaning."""
+
+    names: list[str]
+    material: tuple[str, str]
+    cleaning: tuple[str, str]
+
+
+class Prediction(NamedTuple):
+    material: tuple[str, str]
+    cleaning: tuple[str, str]
+    confidence: float  # winning label's share of the neighbour vote
+    similarity: float  # cosine similarity of the nearest neighbour
+    coverage: float  # share of the query's n-grams seen in training
+
+
+# ---------------------------------------------------------------------------
+# Training data
+# ---------------------------------------------------------------------------
+
+
+def _ts_unescape(s: str) -> str:
+    return json.loads(f'"{s}"')
+
+
+def load_samples_from_ts(path: Path) -> list[tuple[str, Sample]]:
+    """Read (kit_id, sample) pairs from a generated toyCleaningGuide.ts."""
+    text = path.read_text(encoding="utf-8")
+    samples: dict[str, Sample] = {}
+    for match in TS_ENTRY_RE.finditer(text):
+        key, _, cn, en, clean_cn, clean_en = map(_ts_unescape, match.groups())
+        if cn in UNKNOWN_MATERIALS:
+            continue
+        samples[key] = Sample([key.split("::", 1)[1]], (cn, en), (clean_cn, clean_en))
+    # Alias tables map "kitId::normalizedName" to an entry key
+    for match in TS_ALIAS_RE.finditer(text):
+        alias, key = map(_ts_unescape, match.groups())
+        if key in samples:
+            samples[key].names.append(alias.split("::", 1)[1])
+    return [(key.split("::", 1)[0], sample) for key, sample in samples.items()]
+
+
+def load_samples_from_json(path: Path) -> list[tuple[str, Sample]]:
+    """Read (kit_id, sample) pairs from a cleaning guide JSON or JSONL file."""
+    pairs: list[tuple[str, Sample]] = []
+    for kit in load_records(str(path)):
+        for toy in kit.get("toys", []):
+            cn, _, en = toy.get("material", "").partition("/")
+            if cn in UNKNOWN_MATERIALS:
+                continue
+            names = [n for n in (toy.get("name_zh"), toy.get("name")) if n]
+            cleaning = (toy.get("cleaning_zh", ""), toy.get("cleaning_en", ""))
+            pairs.append((kit.get("kit_id", ""), Sample(names, (cn, en), cleaning)))
+    return pairs
+
+
+def load_samples(path: Path) -> list[tuple[str, Sample]]:
+    """Load labelled toys from a toyCleaningGuide.ts or cleaning guide JSON."""
+    if path.suffix == ".ts":
+        return load_samples_from_ts(path)
+    return load_samples_from_json(path)
+
+
+# ---------------------------------------------------------------------------
+# Classifier
+# ---------------------------------------------------------------------------
+
+
+def char_ngrams(names: list[str]) -> list[str]:
+    """Character 1-3-grams of every normalised name, with boundary markers."""
+    grams: list[str] = []
+    for name in names:
+        padded = f"^{normalize_toy_name(name)}$"
+        for n in NGRAM_SIZES:
+            grams.extend(padded[i : i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+class MaterialKNN:
+    """Cosine kNN over TF-IDF weighted character n-grams of toy names."""
+
+    def __init__(self, samples: list[Sample], k: int = DEFAULT_K) -> None:
+        self.k = k
+        self.labels = [s.material for s in samples]
+        self.cleaning = [s.cleaning for s in samples]
+        docs = [char_ngrams(s.names) for s in samples]
+        self.vocab: dict[str, int] = {}
+        for doc in docs:
+            for gram in doc:
+                self.vocab.setdefault(gram, len(self.vocab))
+        df = np.zeros(len(self.vocab), dtype=np.float32)
+        for doc in docs:
+            df[[self.vocab[g] for g in set(doc)]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+        self.matrix = self._vectorize(docs)
+
+    def _vectorize(self, docs: list[list[str]]) -> np.ndarray:
+        matrix = np.zeros((len(docs), len(self.vocab)), dtype=np.float32)
+        for row, doc in enumerate(docs):
+            for gram in doc:
+                col = self.vocab.get(gram)
+                if col is not None:
+                    matrix[row, col] += 1
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def predict(self, queries: list[list[str]]) -> list[Prediction | None]:
+        """Label each query (a list of names for one toy); None if no n-gram is known."""
+        if not queries or not len(self.labels):
+            return [None] * len(queries)
+        docs = [char_ngrams(q) for q in queries]
+        sims = self._vectorize(docs) @ self.matrix.T
+        k = min(self.k, sims.shape[1])
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+
+        predictions: list[Prediction | None] = []
+        for doc, row, neighbours in zip(docs, sims, top):
+            neighbours = neighbours[np.argsort(-row[neighbours])]
+            if row[neighbours[0]] <= 0:
+                predictions.append(None)
+                continue
+            votes: dict[tuple[str, str], float] = defaultdict(float)
+            for i in neighbours:
+                votes[self.labels[i]] += float(row[i])
+            label = max(votes, key=votes.__getitem__)
+            nearest = next(i for i in neighbours if self.labels[i] == label)
+            predictions.append(
+                Prediction(
+                    label,
+                    self.cleaning[nearest],
+                    votes[label] / sum(votes.values()),
+                    float(row[neighbours[0]]),
+                    sum(g in self.vocab for g in doc) / len(doc),
+                )
+            )
+        return predictions
+
+
+def is_confident(
+    prediction: Prediction | None,
+    min_similarity: float = MIN_SIMILARITY,
+    min_confidence: float = MIN_CONFIDENCE,
+) -> bool:
+    """Whether a prediction is trustworthy enough to skip the LLM.
+
+    Coverage guards against a query in a script the training names do not
+    use (an English name against Chinese-only data), where a handful of
+    shared n-grams can produce a confident-looking vote.
+    """
+    return (
+        prediction is not None
+        and prediction.similarity >= min_similarity
+        and prediction.confidence >= min_confidence
+        and prediction.coverage >= MIN_COVERAGE
+    )
+
+
+# ---------------------------------------------------------------------------
+# Evaluation
+# ---------------------------------------------------------------------------
+
+
+def evaluate(args: argparse.Namespace) -> None:
+    pairs = load_samples(Path(args.data))
+    kits = sorted({kit for kit, _ in pairs})
+    log.info("Loaded %d labelled toys from %d kits in %s", len(pairs), len(kits), args.data)
+
+    accepted = correct = total = 0
+    for kit in kits:
+        train = [s for k, s in pairs if k != kit]
+        test = [s for k, s in pairs if k == kit]
+        predictions = MaterialKNN(train, args.k).predict([s.names for s in test])
+        for sample, prediction in zip(test, predictions):
+            total += 1
+            if not is_confident(prediction, args.min_similarity, args.min_confidence):
+                continue
+            accepted += 1
+            if prediction.material == sample.material:
+                correct += 1
+            elif args.verbose:
+                log.info(
+                    "  %s: %s, predicted %s (sim %.2f, conf %.2f)",
+                    sample.names[0], sample.material[1], prediction.material[1],
+                    prediction.similarity, prediction.confidence,
+                )
+    log.info(
+        "Held-out kits: %d/%d toys resolved locally (%.0f%%), %.1f%% of those correct",
+        accepted, total, 100 * accepted / max(total, 1), 100 * correct / max(accepted, 1),
+    )
+
+
+def predict(args: argparse.Namespace) -> None:
+    model = MaterialKNN([s for _, s in load_samples(Path(args.data))], args.k)
+    for name, prediction in zip(args.names, model.predict([[n] for n in args.names])):
+        if prediction is None:
+            log.info("%s: no similar toy", name)
+            continue
+        log.info(
+            "%s: %s/%s (sim %.2f, conf %.2f, coverage %.2f)%s",
+            name, *prediction.material, prediction.similarity, prediction.confidence,
+            prediction.coverage,
+            "" if is_confident(prediction, args.min_similarity, args.min_confidence)
+            else " — low confidence, would go to the LLM",
+        )
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        datefmt="%H:%M:%S",
+    )
+    parser = argparse.ArgumentParser(
+        description="Evaluate or query the offline toy material classifier.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s evaluate                                   # Hold out each kit in turn
+  %(prog)s evaluate --min-similarity 0.6 -v           # Stricter, list mistakes
+  %(prog)s predict "Wooden Stacking Rings"            # Classify names
+        """,
+    )
+    parser.add_argument(
+        "--data",
+        default=str(DEFAULT_TRAINING_DATA),
+        help="toyCleaningGuide.ts or cleaning guide JSON/JSONL "
+        "(default: client/src/data/toyCleaningGuide.ts)",
+    )
+    parser.add_argument("-k", type=int, default=DEFAULT_K, help=f"Neighbours (default: {DEFAULT_K})")
+    parser.add_argument(
+        "--min-similarity", type=float, default=MIN_SIMILARITY,
+        help=f"Nearest-neighbour cosine needed to accept (default: {MIN_SIMILARITY})",
+    )
+    parser.add_argument(
+        "--min-confidence", type=float, default=MIN_CONFIDENCE,
+        help=f"Vote share needed to accept (default: {MIN_CONFIDENCE})",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    evaluate_parser = subparsers.add_parser(
+        "evaluate", help="Leave-one-kit-out accuracy and coverage"
+    )
+    evaluate_parser.add_argument(
+        "--verbose", "-v", action="store_true", help="List wrong predictions"
+    )
+    predict_parser = subparsers.add_parser("predict", help="Classify toy names")
+    predict_parser.add_argument("names", nargs="+", help="Toy names")
+
+    args = parser.parse_args()
+    if args.command == "evaluate":
+        evaluate(args)
+    else:
+        predict(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ Mobile-endpoint Amazon product data refresher for Lovevery alternatives.
 Uses Amazon's mobile endpoint which is less likely to trigger CAPTCHA.
 Reads existing lovevery_alternatives.json and updates price, rating,
 reviewCount, and imageUrl for all products with ASINs.
+
+Set CATALOG_DB to save through the catalog store (catalog_store.py), so the
+refresh can run alongside other writers of the alternatives data.
 """
 
 import json
@@ -18,6 +21,8 @@ from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 
+from catalog_store import open_alternatives
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -224,8 +229,8 @@ def scrape_asin(session: requests.Session, asin: str) -> tuple:
 def main():
     # Load existing data
     print(f"Loading data from {DATA_FILE}...", flush=True)
-    with open(DATA_FILE) as f:
-        data = json.load(f)
+    catalog = open_alternatives(DATA_FILE, os.environ.get("CATALOG_DB"))
+    data = catalog.data
 
     # Collect all products with ASINs
     products = []
@@ -276,13 +281,11 @@ def main():
 
         # Save progress every 10 products
         if (i + 1) % 10 == 0:
-            with open(DATA_FILE, "w") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            catalog.save()
             print(f"  --- Saved ({i+1}/{len(products)}, ✓{success} ✗{failed}) ---", flush=True)
 
     # Final save
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    catalog.save()
 
     # Summary
     print(f"\n{'='*60}", flush=True)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+page_cache.py — Shared fetch layer for lovevery.com pages.
+
+scrape_lovevery_official.py and scrape_cleaning_guide.py both read the kit
+product pages (and the cleaning guide also reads the care page).  Fetching
+through one PageCache means:
+
+  - within a run, each URL is downloaded at most once, even when several
+    threads ask for it at the same time;
+  - across runs, responses are kept on disk with their ETag/Last-Modified
+    validators.  A copy younger than --page-cache-max-age is used without
+    any request; an older one is revalidated with a conditional GET, and a
+    304 Not Modified costs no body download;
+  - if a request fails, a stale cached copy is served instead of nothing;
+  - only real network requests wait for the rate limiter (one per host,
+    shared by all threads), so cache hits add no delay.
+
+Usage (from another script in this directory):
+    from page_cache import PageCache
+
+    pages = PageCache(Path(".page_cache"), delay=1.5)
+    html = pages.fetch("https://lovevery.com/products/the-play-kits-the-looker")
+    pages.log_stats()
+
+Requirements:
+    pip install requests
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".page_cache"
+DEFAULT_MAX_AGE_MINUTES = 60.0  # cached pages younger than this skip the network
+REQUEST_DELAY = 1.5  # seconds between network requests
+
+log = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Page cache
+# ---------------------------------------------------------------------------
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least *interval* seconds apart."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class PageCache:
+    """Fetch pages once per run and revalidate on-disk copies with conditional GETs.
+
+    *cache_dir* of None keeps the cache in memory only.  *max_age* is in
+    seconds.  ``stats`` counts how each fetch was served: ``memory``,
+    ``fresh`` (disk, no request), ``not_modified`` (304), ``downloaded``,
+    ``stale`` (request failed, disk copy used) and ``failed``;
+    ``bytes_downloaded`` sums the response bodies actually transferred.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = DEFAULT_CACHE_DIR,
+        max_age: float = DEFAULT_MAX_AGE_MINUTES * 60,
+        delay: float = REQUEST_DELAY,
+        session: requests.Session | None = None,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.session = session or requests.Session()
+        self.delay = delay
+        self._limiters: dict[str, RateLimiter] = {}
+        self.stats = dict.fromkeys(
+            ("memory", "fresh", "not_modified", "downloaded", "stale", "failed"), 0
+        )
+        self.bytes_downloaded = 0
+        self._pages: dict[str, str | None] = {}
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str) -> str | None:
+        """Return the body of *url*, or None if it cannot be fetched or cached."""
+        with self._lock:
+            if url in self._pages:
+                self.stats["memory"] += 1
+                return self._pages[url]
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = self._inflight[url] = Future()
+            else:
+                self.stats["memory"] += 1
+        if not owner:
+            return future.result()
+
+        text: str | None = None
+        try:
+            text = self._fetch(url)
+        finally:
+            with self._lock:
+                self._pages[url] = text
+                self._inflight.pop(url)
+            future.set_result(text)
+        return text
+
+    def _fetch(self, url: str) -> str | None:
+        entry = self._load(url)
+        if entry and time.time() - entry["fetched_at"] < self.max_age:
+            log.debug("Cache fresh: %s", url)
+            self._count("fresh")
+            return entry["body"]
+
+        headers = dict(HEADERS)
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        self._limiter(url).wait()
+        try:
+            resp = self.session.get(url, headers=headers, timeout=30)
+            if resp.status_code == 304 and entry:
+                log.debug("Not modified: %s", url)
+                entry["fetched_at"] = time.time()
+                self._store(url, entry)
+                self._count("not_modified")
+                return entry["body"]
+            resp.raise_for_status()
+        except requests.RequestException as exc:
+            if entry:
+                log.warning("Failed to fetch %s (%s); using cached copy", url, exc)
+                self._count("stale")
+                return entry["body"]
+            log.error("Failed to fetch %s: %s", url, exc)
+            self._count("failed")
+            return None
+
+        self._store(
+            url,
+            {
+                "url": url,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "body": resp.text,
+            },
+        )
+        with self._lock:
+            self.stats["downloaded"] += 1
+            self.bytes_downloaded += len(resp.content)
+        return resp.text
+
+    def _limiter(self, url: str) -> RateLimiter:
+        """Return the rate limiter of *url*'s host; each host is limited separately."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.delay)
+            return self._limiters[host]
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _path(self, url: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:24] + ".json")
+
+    def _load(self, url: str) -> dict[str, Any] | None:
+        path = self._path(url)
+        if path is None or not path.is_file():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            log.warning("Ignoring unreadable cache entry %s: %s", path, exc)
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _store(self, url: str, entry: dict[str, Any]) -> None:
+        path = self._path(url)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def log_stats(self) -> None:
+        """Log how the fetches of this run were served."""
+        log.info(
+            "Page cache: %s (%.1f KB downloaded)",
+            ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in self.stats.items()),
+            self.bytes_downloaded / 1024,
+        )
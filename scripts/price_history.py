@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+price_history.py — Append-only price, rating and review-count history of the
+Amazon alternatives.
+
+Every refresh of lovevery_alternatives.json overwrites price, rating and
+reviewCount in place.  This store keeps one observation per ASIN per scrape,
+(asin, ts, price_cents, rating, reviews), in a local SQLite file, so trends,
+price drops and volatility can be read without replaying the JSON's git
+history.
+
+Rows are delta encoded: each observation stores the change since the
+previous one for that ASIN (price in cents, rating in hundredths, reviews),
+which SQLite writes as 0-2 byte integers, and every KEYFRAME_INTERVAL-th row
+(or the first row after a value was unknown) is a keyframe holding absolute
+values.  The table is clustered on (asin, ts), so a range query seeks to the
+last keyframe at or before the start of the range and decodes at most
+KEYFRAME_INTERVAL extra rows.  Appends are O(1): the decoded latest values of
+each ASIN are kept in a small head table.
+
+Usage:
+    python price_history.py record -i lovevery_alternatives.json
+    python price_history.py backfill                 # every committed version
+    python price_history.py show B0BQXJX5GH --since 2026-01-01
+    python price_history.py stats
+
+    from price_history import PriceHistory
+
+    with PriceHistory(DEFAULT_DB) as history:
+        for obs in history.range("B0BQXJX5GH", start=ts0):
+            print(obs.ts, obs.price_cents, obs.rating, obs.reviews)
+
+Requirements:
+    No external dependencies (stdlib only); backfill needs git.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple
+
+from significant_changes import parse_price
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_DB = SCRIPT_DIR / "price_history.sqlite"
+DEFAULT_INPUT = SCRIPT_DIR / "lovevery_alternatives.json"
+
+KEYFRAME_INTERVAL = 32  # rows between absolute-valued rows of one ASIN
+RATING_SCALE = 100  # ratings are stored as integer hundredths
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    asin TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    keyframe INTEGER NOT NULL,
+    price INTEGER,
+    rating INTEGER,
+    reviews INTEGER,
+    PRIMARY KEY (asin, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS heads (
+    asin TEXT PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    price INTEGER,
+    rating INTEGER,
+    reviews INTEGER,
+    since_keyframe INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+)
+log = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+Values = tuple[int | None, int | None, int | None]  # price cents, rating x100, reviews
+
+
+class Observation(NamedTuple):
+    ts: int
+    price_cents: int | None
+    rating: float | None
+    reviews: int | None
+
+
+def to_values(alt: dict[str, Any]) -> Values:
+    """Integer (price cents, rating hundredths, reviews) of one alternative."""
+    price = parse_price(alt.get("price"))
+    rating = alt.get("rating")
+    reviews = alt.get("reviewCount")
+    return (
+        round(price * 100) if price is not None else None,
+        round(float(rating) * RATING_SCALE) if rating else None,
+        int(reviews) if reviews else None,
+    )
+
+
+def encode(previous: Values | None, values: Values, since_keyframe: int) -> tuple[bool, Values]:
+    """Return (keyframe, stored values) for a row following *previous*.
+
+    A delta row stores ``value - previous`` per column and NULL for a value
+    not observed this time.  Deltas need a known previous value, so a value
+    reappearing after an unknown one forces a keyframe.
+    """
+    keyframe = (
+        previous is None
+        or since_keyframe + 1 >= KEYFRAME_INTERVAL
+        or any(v is not None and p is None for p, v in zip(previous, values))
+    )
+    if keyframe:
+        return True, values
+    return False, tuple(  # type: ignore[return-value]
+        None if v is None else v - p for p, v in zip(previous, values)
+    )
+
+
+def decode(running: Values | None, keyframe: bool, stored: Values) -> tuple[Values, Values]:
+    """Return (observed values, last-known values) for a stored row.
+
+    A keyframe resets the last-known values, so decoding can start at any
+    keyframe; an unknown value in a delta row keeps the previous one as the
+    base of the next delta.
+    """
+    if keyframe or running is None:
+        return stored, stored
+    observed: Values = tuple(  # type: ignore[assignment]
+        None if d is None else r + d for r, d in zip(running, stored)
+    )
+    return observed, tuple(o if o is not None else r for o, r in zip(observed, running))  # type: ignore[return-value]
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class PriceHistory:
+    """Append-only, delta-encoded observation store in one SQLite file."""
+
+    def __init__(self, path: Path = DEFAULT_DB) -> None:
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> PriceHistory:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def append(self, asin: str, ts: int, values: Values) -> bool:
+        """Append one observation; returns False if *ts* is not after the last one."""
+        head = self.conn.execute(
+            "SELECT ts, price, rating, reviews, since_keyframe FROM heads WHERE asin = ?",
+            (asin,),
+        ).fetchone()
+        if head and ts <= head[0]:
+            return False
+        previous: Values | None = head[1:4] if head else None
+        keyframe, stored = encode(previous, values, head[4] if head else 0)
+        _, running = decode(previous, keyframe, stored)
+        self.conn.execute(
+            "INSERT INTO observations VALUES (?, ?, ?, ?, ?, ?)",
+            (asin, ts, int(keyframe), *stored),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO heads VALUES (?, ?, ?, ?, ?, ?)",
+            (asin, ts, *running, 0 if keyframe else head[4] + 1),
+        )
+        return True
+
+    def record_snapshot(self, data: Iterable[dict[str, Any]], ts: int) -> int:
+        """Append one observation per ASIN in an alternatives JSON document.
+
+        An ASIN listed under several toys is recorded once.  Returns the
+        number of rows appended.
+        """
+        seen: set[str] = set()
+        appended = 0
+        with self.conn:
+            for kit in data:
+                for toy in kit.get("toys", []):
+                    for alt in toy.get("alternatives", []):
+                        asin = alt.get("asin")
+                        if not asin or asin in seen:
+                            continue
+                        seen.add(asin)
+                        appended += self.append(asin, ts, to_values(alt))
+        return appended
+
+    def range(self, asin: str, start: int | None = None, end: int | None = None) -> list[Observation]:
+        """Observations of *asin* with ``start <= ts <= end``, oldest first."""
+        start = start if start is not None else 0
+        end = end if end is not None else 2**62
+        # Decoding starts at the last keyframe at or before the range
+        row = self.conn.execute(
+            "SELECT ts FROM observations WHERE asin = ? AND ts <= ? AND keyframe = 1 "
+            "ORDER BY ts DESC LIMIT 1",
+            (asin, start),
+        ).fetchone()
+        rows = self.conn.execute(
+            "SELECT ts, keyframe, price, rating, reviews FROM observations "
+            "WHERE asin = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+            (asin, row[0] if row else start, end),
+        )
+        running: Values | None = None
+        result: list[Observation] = []
+        for ts, keyframe, *stored in rows:
+            observed, running = decode(running, bool(keyframe), tuple(stored))  # type: ignore[arg-type]
+            if ts >= start:
+                price, rating, reviews = observed
+                result.append(
+                    Observation(ts, price, None if rating is None else rating / RATING_SCALE, reviews)
+                )
+        return result
+
+    def latest(self, asin: str) -> Observation | None:
+        """The most recent last-known values of *asin*."""
+        head = self.conn.execute(
+            "SELECT ts, price, rating, reviews FROM heads WHERE asin = ?", (asin,)
+        ).fetchone()
+        if not head:
+            return None
+        ts, price, rating, reviews = head
+        return Observation(ts, price, None if rating is None else rating / RATING_SCALE, reviews)
+
+    def stats(self) -> dict[str, int]:
+        rows, asins, keyframes, first, last = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT asin), SUM(keyframe), MIN(ts), MAX(ts) FROM observations"
+        ).fetchone()
+        return {
+            "rows": rows,
+            "asins": asins,
+            "keyframes": keyframes or 0,
+            "first_ts": first or 0,
+            "last_ts": last or 0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Backfill from git
+# ---------------------------------------------------------------------------
+
+
+def committed_versions(path: Path) -> list[tuple[int, str]]:
+    """(commit timestamp, commit hash) of every commit touching *path*, oldest first."""
+    out = subprocess.run(
+        ["git", "log", "--reverse", "--format=%ct %H", "--", path.name],
+        cwd=path.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return [(int(ts), commit) for ts, commit in (line.split() for line in out.splitlines())]
+
+
+def backfill(history: PriceHistory, path: Path) -> int:
+    """Record every committed version of *path*; returns the rows appended."""
+    appended = 0
+    for ts, commit in committed_versions(path):
+        blob = subprocess.run(
+            ["git", "show", f"{commit}:./{path.name}"],
+            cwd=path.parent,
+            capture_output=True,
+            check=True,
+        ).stdout
+        try:
+            data = json.loads(blob)
+        except json.JSONDecodeError:
+            log.warning("  %s: not valid JSON, skipped", commit[:10])
+            continue
+        count = history.record_snapshot(data, ts)
+        log.debug("  %s: %d rows", commit[:10], count)
+        appended += count
+    return appended
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def parse_time(value: str) -> int:
+    """Unix timestamp of an ISO date/time (UTC when no zone) or of a number."""
+    if value.isdigit():
+        return int(value)
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def format_time(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Append-only price/rating history of the Amazon alternatives.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s record                              # Snapshot lovevery_alternatives.json now
+  %(prog)s record -i /tmp/scrape.json          # Snapshot a scrape that was not published
+  %(prog)s backfill                            # Import every committed version
+  %(prog)s show B0BQXJX5GH --since 2026-01-01  # One ASIN's history
+  %(prog)s stats
+        """,
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=str(DEFAULT_DB),
+        help="History database (default: scripts/price_history.sqlite)",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Enable debug logging"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Append a snapshot of an alternatives file")
+    record_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(DEFAULT_INPUT),
+        help="Alternatives JSON (default: scripts/lovevery_alternatives.json)",
+    )
+    record_parser.add_argument(
+        "--ts", type=parse_time, help="Observation time, ISO or Unix seconds (default: now)"
+    )
+
+    backfill_parser = subparsers.add_parser(
+        "backfill", help="Append every committed version of an alternatives file"
+    )
+    backfill_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(DEFAULT_INPUT),
+        help="Tracked alternatives JSON (default: scripts/lovevery_alternatives.json)",
+    )
+
+    show_parser = subparsers.add_parser("show", help="Print the history of one ASIN")
+    show_parser.add_argument("asin")
+    show_parser.add_argument("--since", type=parse_time, help="Start, ISO or Unix seconds")
+    show_parser.add_argument("--until", type=parse_time, help="End, ISO or Unix seconds")
+
+    subparsers.add_parser("stats", help="Summarise the store")
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    with PriceHistory(Path(args.db)) as history:
+        if args.command == "record":
+            with open(args.input, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            ts = args.ts if args.ts is not None else int(time.time())
+            appended = history.record_snapshot(data, ts)
+            log.info("Recorded %d observations at %s", appended, format_time(ts))
+
+        elif args.command == "backfill":
+            try:
+                appended = backfill(history, Path(args.input).resolve())
+            except (OSError, subprocess.CalledProcessError) as exc:
+                log.error("Cannot read git history of %s: %s", args.input, exc)
+                sys.exit(1)
+            log.info("Backfilled %d observations", appended)
+
+        elif args.command == "show":
+            observations = history.range(args.asin, args.since, args.until)
+            if not observations:
+                log.error("No observations for %s in that range", args.asin)
+                sys.exit(1)
+            print(f"{'time (UTC)':<17} {'price':>9} {'rating':>6} {'reviews':>8}")
+            for obs in observations:
+                price = "-" if obs.price_cents is None else f"${obs.price_cents / 100:.2f}"
+                rating = "-" if obs.rating is None else f"{obs.rating:.2f}"
+                reviews = "-" if obs.reviews is None else str(obs.reviews)
+                print(f"{format_time(obs.ts):<17} {price:>9} {rating:>6} {reviews:>8}")
+
+        else:
+            s = history.stats()
+            log.info(
+                "%d observations of %d ASINs (%d keyframes), %s to %s, %.1f KB on disk",
+                s["rows"],
+                s["asins"],
+                s["keyframes"],
+                format_time(s["first_ts"]),
+                format_time(s["last_ts"]),
+                Path(args.db).stat().st_size / 1024,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+probe_images.py — Build an image manifest (width, height, format) for the
+kit images referenced by scrape_lovevery_official.py output.
+
+Dimensions are read from the image header, so only the first few KB of each
+image are requested (an HTTP Range GET; if a server ignores the range, the
+response is streamed and the connection dropped after the same number of
+bytes).  PNG, GIF, WebP (lossy, lossless and extended) and JPEG headers are
+understood; a JPEG whose frame header sits behind a large EXIF block is
+re-probed with a bigger range.
+
+The manifest doubles as the cache: it maps each image URL to its metadata.
+Contentful asset URLs already in it are never requested again (they are
+content-addressed, so an entry cannot go stale); images on other hosts, such
+as the Shopify CDN og:image, are probed again on every run.
+generate_toy_data.py images --image-manifest reads it to emit dimensions
+into toyImages.ts, plus WebP transform URLs for the Contentful images.
+
+Usage:
+    python probe_images.py -i data/lovevery_kits.json
+    python probe_images.py -i data/lovevery_kits.json -m data/image_manifest.json
+    python probe_images.py -i data/lovevery_kits.json --concurrency 16 -v
+
+Requirements:
+    pip install requests
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from generate_toy_data import collect_kit_images, is_contentful_image, load_records
+from page_cache import HEADERS
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DEFAULT_MANIFEST = "image_manifest.json"
+PROBE_BYTES = 4096  # first request; enough for PNG/GIF/WebP and most JPEGs
+MAX_PROBE_BYTES = 65536  # largest range tried for a JPEG with a big EXIF block
+DEFAULT_CONCURRENCY = 8
+
+IMAGE_HEADERS = {**HEADERS, "Accept": "image/*,*/*;q=0.8"}
+
+# JPEG start-of-frame markers carry the dimensions (DHT, JPG and DAC excluded)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers without a length field
+JPEG_STANDALONE_MARKERS = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8}
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+)
+log = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Header parsing
+# ---------------------------------------------------------------------------
+
+
+def jpeg_size(head: bytes) -> tuple[int, int] | None:
+    """Walk the JPEG segments up to the first start-of-frame marker."""
+    pos = 2
+    while pos + 4 <= len(head):
+        if head[pos] != 0xFF:
+            return None
+        marker = head[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker in JPEG_STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            if pos + 9 > len(head):
+                return None
+            height, width = struct.unpack(">HH", head[pos + 5 : pos + 9])
+            return width, height
+        (length,) = struct.unpack(">H", head[pos + 2 : pos + 4])
+        pos += 2 + length
+    return None
+
+
+def webp_size(head: bytes) -> tuple[int, int] | None:
+    """Read the dimensions from a WebP VP8, VP8L or VP8X chunk."""
+    chunk = head[12:16]
+    if chunk == b"VP8 " and len(head) >= 30 and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(head) >= 25 and head[20] == 0x2F:
+        (bits,) = struct.unpack("<I", head[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(head) >= 30:
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def parse_image_size(head: bytes) -> dict[str, Any] | None:
+    """Return ``{format, width, height}`` from the first bytes of an image.
+
+    Returns None for unknown formats, and for a JPEG whose frame header lies
+    beyond *head* (ask for more bytes and try again).
+    """
+    size: tuple[int, int] | None = None
+    fmt = ""
+    if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+        fmt, size = "png", struct.unpack(">II", head[16:24])
+    elif head[:6] in (b"GIF87a", b"GIF89a") and len(head) >= 10:
+        fmt, size = "gif", struct.unpack("<HH", head[6:10])
+    elif head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        fmt, size = "webp", webp_size(head)
+    elif head[:2] == b"\xff\xd8":
+        fmt, size = "jpeg", jpeg_size(head)
+    if not size or not all(size):
+        return None
+    return {"format": fmt, "width": size[0], "height": size[1]}
+
+
+# ---------------------------------------------------------------------------
+# Probing
+# ---------------------------------------------------------------------------
+
+
+class ImageProbe:
+    """Read image dimensions with ranged GETs, caching the results by URL.
+
+    *manifest* maps URL -> ``{format, width, height}`` and is updated in
+    place; Contentful URLs already present are not requested, other hosts
+    are re-probed (keeping the old entry if that fails).  ``stats`` counts
+    ``cached``, ``probed`` and ``failed`` URLs, and ``bytes_downloaded``
+    the header bytes actually transferred.
+    """
+
+    def __init__(
+        self,
+        manifest: dict[str, dict[str, Any]] | None = None,
+        probe_bytes: int = PROBE_BYTES,
+        session: requests.Session | None = None,
+    ) -> None:
+        self.manifest = manifest if manifest is not None else {}
+        self.probe_bytes = probe_bytes
+        self.session = session or requests.Session()
+        self.stats = dict.fromkeys(("cached", "probed", "failed"), 0)
+        self.bytes_downloaded = 0
+        self._lock = threading.Lock()
+
+    def read_head(self, url: str, size: int) -> bytes:
+        """Return at most the first *size* bytes of *url*."""
+        headers = {**IMAGE_HEADERS, "Range": f"bytes=0-{size - 1}"}
+        with self.session.get(url, headers=headers, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            head = b""
+            # A 200 means the range was ignored; stop reading after *size* bytes
+            for chunk in resp.iter_content(chunk_size=min(size, 16384)):
+                head += chunk
+                if len(head) >= size:
+                    break
+        with self._lock:
+            self.bytes_downloaded += len(head[:size])
+        return head[:size]
+
+    def probe(self, url: str) -> dict[str, Any] | None:
+        """Return the metadata of *url*, from the manifest or from its header."""
+        with self._lock:
+            if url in self.manifest and is_contentful_image(url):
+                self.stats["cached"] += 1
+                return self.manifest[url]
+
+        info = None
+        error = False
+        size = self.probe_bytes
+        try:
+            while True:
+                head = self.read_head(url, size)
+                info = parse_image_size(head)
+                # Only a JPEG can need more bytes: its frame header follows
+                # the APPn segments, which may hold a large EXIF thumbnail
+                if info or not head.startswith(b"\xff\xd8") or len(head) < size:
+                    break
+                if size >= MAX_PROBE_BYTES:
+                    break
+                log.debug("  JPEG frame header not in first %d bytes, retrying: %s", size, url)
+                size = min(size * 4, MAX_PROBE_BYTES)
+        except requests.RequestException as exc:
+            log.warning("  Failed to probe %s: %s", url, exc)
+            error = True
+
+        with self._lock:
+            if info:
+                self.manifest[url] = info
+                self.stats["probed"] += 1
+            else:
+                self.stats["failed"] += 1
+        if info:
+            log.debug("  %s %dx%d: %s", info["format"], info["width"], info["height"], url)
+        elif not error:
+            log.warning("  Could not read image size: %s", url)
+        return info or self.manifest.get(url)
+
+    def probe_all(self, urls: list[str], concurrency: int = DEFAULT_CONCURRENCY) -> None:
+        """Probe every URL the manifest cannot answer, *concurrency* at a time."""
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            list(pool.map(self.probe, urls))
+
+    def log_stats(self) -> None:
+        log.info(
+            "Image probe: %d cached, %d probed, %d failed (%.1f KB downloaded)",
+            self.stats["cached"],
+            self.stats["probed"],
+            self.stats["failed"],
+            self.bytes_downloaded / 1024,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Manifest I/O
+# ---------------------------------------------------------------------------
+
+
+def load_manifest(path: Path) -> dict[str, dict[str, Any]]:
+    """Load an image manifest, or return an empty one if it does not exist."""
+    if not path.is_file():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(path: Path, manifest: dict[str, dict[str, Any]]) -> None:
+    """Write the manifest sorted by URL, so unchanged runs produce no diff."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(manifest.items())), f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def collect_image_urls(input_paths: list[str]) -> list[str]:
+    """Return every hero and toy image URL that toyImages.ts will reference."""
+    urls: dict[str, None] = {}
+    for path in input_paths:
+        for entry in collect_kit_images(load_records(path)).values():
+            for url in [entry["heroImage"], *entry["toyImages"]]:
+                if url:
+                    urls[url] = None
+    return list(urls)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Probe Contentful image dimensions into an image manifest.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s -i data/lovevery_kits.json                   # Probe new images only
+  %(prog)s -i data/lovevery_kits.json -m data/image_manifest.json
+  %(prog)s -i data/lovevery_kits.json --refresh         # Re-probe everything
+        """,
+    )
+    parser.add_argument(
+        "-i", "--input", nargs="+", required=True,
+        help="Kits JSON/JSONL file(s) from scrape_lovevery_official.py",
+    )
+    parser.add_argument(
+        "-m", "--manifest", default=DEFAULT_MANIFEST,
+        help=f"Image manifest to update (default: {DEFAULT_MANIFEST})",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Images probed in parallel (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--probe-bytes", type=int, default=PROBE_BYTES,
+        help=f"Bytes requested per image on the first try (default: {PROBE_BYTES})",
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="Ignore the manifest and probe every image"
+    )
+    parser.add_argument(
+        "--prune", action="store_true",
+        help="Drop manifest entries for images no longer referenced by the input",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Enable debug logging"
+    )
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    manifest_path = Path(args.manifest)
+    manifest = {} if args.refresh else load_manifest(manifest_path)
+    urls = collect_image_urls(args.input)
+    if not urls:
+        log.error("No image URLs found in %s", ", ".join(args.input))
+        sys.exit(1)
+    log.info("Probing %d image URLs (%d already in the manifest)",
+             len(urls), sum(1 for u in urls if u in manifest))
+
+    probe = ImageProbe(manifest, args.probe_bytes)
+    probe.probe_all(urls, args.concurrency)
+    if args.prune:
+        referenced = set(urls)
+        for url in [u for u in manifest if u not in referenced]:
+            del manifest[url]
+    save_manifest(manifest_path, manifest)
+
+    probe.log_stats()
+    log.info("Done! %d images in %s", len(manifest), manifest_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+run_pipeline.py — Run the whole data refresh as a dependency graph.
+
+The data scripts form two independent branches that end in the TypeScript
+files under client/src/data/:
+
+    official ──→ cleaning ──→ gen-cleaning      (toyCleaningGuide.ts)
+        │
+        ├──────→ probe ─────→ gen-images        (toyImages.ts)
+        └─────────────────────↗
+    reviews ──────────────────→ gen-reviews     (toyReviews.ts)
+
+Every stage declares the files it reads and writes; a stage starts as soon
+as the stages producing its inputs have finished, so the reviews branch (the
+slowest, rate-limited on three hosts) runs alongside the official-site
+branch, and independent generators run side by side.
+
+Stages are memoised.  After a stage succeeds, the state file records a key
+over its command line, its script's source and the content hashes of its
+input files.  On the next run a stage whose key is unchanged and whose
+outputs still exist is skipped.  Because downstream inputs are hashed by
+content, not mtime, a scrape that produces byte-identical JSON skips
+everything after it, so a full refresh only does the work that is actually
+stale.  Scraping stages have no input files; they run every time unless
+--source-max-age says their last output is recent enough.
+
+A failing stage does not stop the others: only the stages that depend on it
+are abandoned.  Each stage's output is streamed to the log with its name as
+prefix, and a timing table is printed at the end.
+
+Usage:
+    python run_pipeline.py                       # Refresh everything that is stale
+    python run_pipeline.py --dry-run             # Show what would run
+    python run_pipeline.py --target gen-reviews  # One branch (and its upstream)
+    python run_pipeline.py --source-max-age 720  # Reuse scrapes from the last 12h
+
+Requirements:
+    No external dependencies (stdlib only); the stages need the packages in
+    requirements.txt.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_DATA_DIR = SCRIPT_DIR / "data"
+DEFAULT_OUTPUT_DIR = SCRIPT_DIR.parent / "client" / "src" / "data"
+SITE_NAMES = SCRIPT_DIR.parent / "client" / "src" / "data" / "kits.ts"
+STATE_FILE_NAME = ".pipeline_state.json"
+STATE_VERSION = 1
+DEFAULT_JOBS = 4
+
+SUMMARY_BACKENDS = ("auto", "llm", "local")
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+)
+log = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+
+class Stage(NamedTuple):
+    """One step of the pipeline: a script invocation and the files it touches."""
+
+    name: str
+    script: str  # file name in scripts/
+    args: list[str]
+    inputs: list[Path]
+    outputs: list[Path]
+
+
+def build_stages(
+    data_dir: Path,
+    output_dir: Path,
+    enrich: bool = False,
+    summary_backend: str = "auto",
+) -> list[Stage]:
+    """Declare the pipeline's stages, in a valid (topological) order."""
+    kits = data_dir / "lovevery_kits.json"
+    cleaning = data_dir / "lovevery_cleaning_guide.json"
+    reviews = data_dir / "lovevery_reviews.json"
+    manifest = data_dir / "image_manifest.json"
+    out = str(output_dir)
+    # The site's toy names feed the generated alias tables
+    names = [SITE_NAMES] if SITE_NAMES.is_file() else []
+    names_args = ["--names", str(SITE_NAMES)] if names else []
+    return [
+        Stage("official", "scrape_lovevery_official.py", ["-o", str(kits)], [], [kits]),
+        Stage(
+            "reviews",
+            "scrape_reviews.py",
+            ["--summarise", "--summary-backend", summary_backend, "-o", str(reviews)],
+            [],
+            [reviews],
+        ),
+        Stage(
+            "cleaning",
+            "scrape_cleaning_guide.py",
+            ["--input", str(kits), "-o", str(cleaning)] + (["--enrich"] if enrich else []),
+            [kits],
+            [cleaning],
+        ),
+        Stage("probe", "probe_images.py", ["-i", str(kits), "-m", str(manifest)], [kits], [manifest]),
+        Stage(
+            "gen-cleaning",
+            "generate_toy_data.py",
+            ["cleaning", "-i", str(cleaning), *names_args, "-o", out],
+            [cleaning, *names],
+            [output_dir / "toyCleaningGuide.ts"],
+        ),
+        Stage(
+            "gen-images",
+            "generate_toy_data.py",
+            ["images", "-i", str(kits), "--image-manifest", str(manifest), "-o", out],
+            [kits, manifest],
+            [output_dir / "toyImages.ts"],
+        ),
+        Stage(
+            "gen-reviews",
+            "generate_toy_data.py",
+            ["reviews", "-i", str(reviews), *names_args, "-o", out],
+            [reviews, *names],
+            [output_dir / "toyReviews.ts"],
+        ),
+    ]
+
+
+def stage_dependencies(stages: list[Stage]) -> dict[str, set[str]]:
+    """Map each stage to the stages producing its inputs."""
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    return {
+        stage.name: {producers[path] for path in stage.inputs if path in producers}
+        for stage in stages
+    }
+
+
+def select_stages(stages: list[Stage], targets: list[str]) -> list[Stage]:
+    """Keep the *targets* and every stage they (transitively) depend on."""
+    deps = stage_dependencies(stages)
+    wanted: set[str] = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(deps[name])
+    return [stage for stage in stages if stage.name in wanted]
+
+
+# ---------------------------------------------------------------------------
+# Memoisation
+# ---------------------------------------------------------------------------
+
+
+def file_hash(path: Path) -> str | None:
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    if not path.is_file():
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def stage_key(stage: Stage) -> str:
+    """Hash of everything a stage's result depends on: command, script, inputs."""
+    h = hashlib.sha256()
+    h.update(json.dumps([STATE_VERSION, stage.script, stage.args]).encode("utf-8"))
+    # Editing the script reruns its stage
+    h.update((file_hash(SCRIPT_DIR / stage.script) or "").encode("ascii"))
+    for path in stage.inputs:
+        h.update(b"\0" + str(path).encode("utf-8") + b"\0")
+        h.update((file_hash(path) or "missing").encode("ascii"))
+    return h.hexdigest()
+
+
+def load_state(path: Path) -> dict[str, Any]:
+    """Load the per-stage memo file; a missing or unreadable one is empty."""
+    if not path.is_file():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError) as exc:
+        log.warning("Ignoring unreadable pipeline state %s: %s", path, exc)
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(path: Path, state: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def is_fresh(stage: Stage, key: str, entry: dict[str, Any] | None, source_max_age: float) -> bool:
+    """Whether a stage's recorded run still stands for *key*."""
+    if not entry or entry.get("key") != key:
+        return False
+    if not all(path.is_file() for path in stage.outputs):
+        return False
+    if not stage.inputs:
+        # Scrapers read the network, which no hash can vouch for
+        return time.time() - entry.get("finished_at", 0) < source_max_age
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+class Pipeline:
+    """Run stages in dependency order, in parallel, skipping memoised ones.
+
+    ``results`` maps each stage name to ``(status, seconds)`` with status one
+    of ``ran``, ``skipped``, ``failed`` or ``blocked`` (an upstream failed);
+    with *dry_run*, stages that would run are ``stale`` instead.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        state_path: Path,
+        jobs: int = DEFAULT_JOBS,
+        force: bool = False,
+        source_max_age: float = 0.0,
+        dry_run: bool = False,
+    ) -> None:
+        self.stages = {stage.name: stage for stage in stages}
+        self.deps = stage_dependencies(stages)
+        self.state_path = state_path
+        self.state = load_state(state_path)
+        self.jobs = jobs
+        self.force = force
+        self.source_max_age = source_max_age
+        self.dry_run = dry_run
+        self.results: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def run(self) -> bool:
+        """Run the pipeline; returns True if no stage failed."""
+        remaining = dict(self.deps)
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while remaining or running:
+                for name in [n for n, deps in remaining.items() if deps <= self.results.keys()]:
+                    del remaining[name]
+                    upstream = [self.results[d][0] for d in self.deps[name]]
+                    if any(status in ("failed", "blocked") for status in upstream):
+                        log.warning("[%s] blocked: an upstream stage failed", name)
+                        self.results[name] = ("blocked", 0.0)
+                    else:
+                        stage = self.stages[name]
+                        stale = any(status in ("ran", "stale") for status in upstream)
+                        running[pool.submit(self.run_stage, stage, stale)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.results[running.pop(future)] = future.result()
+        return all(status != "failed" for status, _ in self.results.values())
+
+    def run_stage(self, stage: Stage, upstream_stale: bool = False) -> tuple[str, float]:
+        if self.dry_run and upstream_stale and not self.force:
+            # Its inputs are not produced yet, so its key cannot be known
+            log.info("[%s] would run if its inputs change", stage.name)
+            return "stale", 0.0
+        key = stage_key(stage)
+        if not self.force and is_fresh(
+            stage, key, self.state.get(stage.name), self.source_max_age
+        ):
+            log.info("[%s] up to date, skipped", stage.name)
+            return "skipped", 0.0
+
+        command = [sys.executable, str(SCRIPT_DIR / stage.script), *stage.args]
+        if self.dry_run:
+            log.info("[%s] would run: %s", stage.name, " ".join(command[1:]))
+            return "stale", 0.0
+
+        log.info("[%s] running: %s", stage.name, " ".join(command[1:]))
+        for path in stage.outputs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            command,
+            cwd=SCRIPT_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            log.info("[%s] %s", stage.name, line.rstrip())
+        returncode = proc.wait()
+        elapsed = time.perf_counter() - start
+        if returncode != 0:
+            log.error("[%s] failed with exit status %d", stage.name, returncode)
+            return "failed", elapsed
+        missing = [str(path) for path in stage.outputs if not path.is_file()]
+        if missing:
+            log.error("[%s] did not write %s", stage.name, ", ".join(missing))
+            return "failed", elapsed
+
+        with self._lock:
+            # Record the key from before the run: inputs are not changed by the stage
+            self.state[stage.name] = {
+                "key": key,
+                "finished_at": time.time(),
+                "seconds": round(elapsed, 2),
+                "outputs": {str(path): file_hash(path) for path in stage.outputs},
+            }
+            save_state(self.state_path, self.state)
+        return "ran", elapsed
+
+    def log_timings(self, wall: float) -> None:
+        """Log a per-stage timing table and the wall-clock total."""
+        log.info("Stage timings:")
+        for name in self.stages:
+            if name in self.results:
+                status, seconds = self.results[name]
+                log.info("  %-14s %-8s %8.1fs", name, status, seconds)
+        busy = sum(seconds for _, seconds in self.results.values())
+        log.info("Total: %.1fs of stage time in %.1fs wall clock", busy, wall)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    stage_names = [stage.name for stage in build_stages(DEFAULT_DATA_DIR, DEFAULT_OUTPUT_DIR)]
+    parser = argparse.ArgumentParser(
+        description="Run the data refresh pipeline, skipping stages whose inputs are unchanged.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s                                  # Everything that is stale
+  %(prog)s --dry-run                        # Show what would run
+  %(prog)s --target gen-cleaning gen-images # Official-site branch only
+  %(prog)s --source-max-age 720             # Reuse scrapes younger than 12h
+  %(prog)s --enrich --summary-backend local # LLM cleaning data, offline summaries
+  %(prog)s --force                          # Rerun every stage
+        """,
+    )
+    parser.add_argument(
+        "--target",
+        nargs="+",
+        choices=stage_names,
+        metavar="STAGE",
+        help=f"Stages to bring up to date, with their upstream stages "
+        f"(default: all). Stages: {', '.join(stage_names)}",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default=str(DEFAULT_DATA_DIR),
+        help="Directory for the scraped JSON and the pipeline state (default: scripts/data)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default=str(DEFAULT_OUTPUT_DIR),
+        help="Directory for the generated TypeScript files (default: client/src/data)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Maximum number of stages running at once (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--source-max-age",
+        type=float,
+        default=0.0,
+        metavar="MINUTES",
+        help="Skip scraping stages whose last successful run is younger than this "
+        "(default: 0, always scrape)",
+    )
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="Pass --enrich to scrape_cleaning_guide.py (requires OPENAI_API_KEY)",
+    )
+    parser.add_argument(
+        "--summary-backend",
+        choices=SUMMARY_BACKENDS,
+        default="auto",
+        help="Summary backend for scrape_reviews.py (default: auto)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Run every selected stage, even if up to date"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report which stages would run"
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Enable debug logging"
+    )
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    data_dir = Path(args.data_dir).resolve()
+    stages = build_stages(
+        data_dir, Path(args.output_dir).resolve(), args.enrich, args.summary_backend
+    )
+    if args.target:
+        stages = select_stages(stages, args.target)
+
+    pipeline = Pipeline(
+        stages,
+        data_dir / STATE_FILE_NAME,
+        jobs=max(args.jobs, 1),
+        force=args.force,
+        source_max_age=args.source_max_age * 60,
+        dry_run=args.dry_run,
+    )
+    start = time.perf_counter()
+    ok = pipeline.run()
+    pipeline.log_timings(time.perf_counter() - start)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
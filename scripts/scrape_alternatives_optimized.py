@@ -23,6 +23,7 @@ Options:
     --output FILE       Output JSON file path (default: lovevery_alternatives.json)
     --update            Update existing data instead of overwriting
     --refresh-prices    Refresh prices/ratings for existing ASINs without AI search
+    --catalog-db FILE   Save through the catalog store (default: $CATALOG_DB)
     --verbose           Print detailed progress information
     --stats             Print detailed statistics at the end
 
@@ -60,6 +61,8 @@ except ImportError:
     print("Warning: openai package not installed. AI-powered search disabled.")
     print("Install with: pip3 install openai")
 
+from catalog_store import open_alternatives
+
 
 # ============================================================================
 # Configuration
@@ -815,6 +818,12 @@ def main():
         action="store_true",
         help="Refresh prices/ratings for existing ASINs (no AI search needed)",
     )
+    parser.add_argument(
+        "--catalog-db",
+        type=str,
+        default=os.environ.get("CATALOG_DB"),
+        help="SQLite catalog store to save through (default: $CATALOG_DB)",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -842,10 +851,16 @@ def main():
 
     # Load existing data if updating
     existing_data = {}
+    catalog = None
+    if args.catalog_db and os.path.exists(args.output):
+        catalog = open_alternatives(args.output, args.catalog_db)
     if (args.update or args.refresh_prices) and os.path.exists(args.output):
         print(f"Loading existing data from {args.output}...")
-        with open(args.output) as f:
-            existing = json.load(f)
+        if catalog is not None:
+            existing = catalog.data
+        else:
+            with open(args.output) as f:
+                existing = json.load(f)
         existing_data = {k["kitId"]: k for k in existing}
         print(f"Loaded data for {len(existing_data)} kits")
 
@@ -876,8 +891,13 @@ def main():
     # Save results
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    if catalog is not None:
+        # Row-level commit: edits other writers made meanwhile are kept
+        catalog.data = results
+        catalog.save()
+    else:
+        with open(output_path, "w") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
 
     # Print summary
     total_toys = sum(len(k["toys"]) for k in results)
@@ -6,35 +6,60 @@ help pages, product pages, and community sources, then classify by material.
 The script:
   1. Scrapes Lovevery's official care/cleaning pages
   2. Extracts material types from product descriptions
-  3. Optionally uses an LLM to generate cleaning advice for toys whose
-     material is known but cleaning instructions are missing
-  4. Outputs a structured JSON file with per-toy cleaning info
+  3. Labels toys the keyword rules missed by their nearest neighbours among
+     already-classified toys (material_knn.py, needs numpy)
+  4. Optionally uses an LLM to identify the material and cleaning advice of
+     toys that are still unknown
+  5. Outputs a structured JSON file with per-toy cleaning info
+
+lovevery.com pages are fetched through the on-disk page cache shared with
+scrape_lovevery_official.py (page_cache.py): a kit page already fetched by
+that script is reused, and unchanged pages are revalidated with conditional
+GETs rather than downloaded again.
+
+With --enrich, unknown toys from all kits are deduplicated and sent to the
+LLM in size-bounded batches, several requests at a time.  Answers are kept
+in a per-toy cache (normalised name + description hash), so a toy is only
+ever asked about once, across kits and across runs.
+
+With --stream, each kit's guide is appended to <output>.jsonl as soon as it
+is built, then converted atomically to the JSON array at the end.  An
+interrupted run keeps the kits it finished, and rerunning resumes from them.
 
 Usage:
     python scrape_cleaning_guide.py                        # all kits
     python scrape_cleaning_guide.py --kit looker senser     # specific kits
     python scrape_cleaning_guide.py --enrich                # use LLM to fill gaps
     python scrape_cleaning_guide.py -o cleaning.json        # custom output
+    python scrape_cleaning_guide.py --stream                # resumable JSONL stream
 
 Requirements:
     pip install requests beautifulsoup4 lxml openai
+    pip install numpy   (optional, for the nearest-neighbour classifier)
     Environment variable: OPENAI_API_KEY (only needed with --enrich)
 """
 
 from __future__ import annotations
 
 import argparse
+import bisect
+import functools
+import hashlib
 import json
 import logging
 import os
 import re
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from generate_toy_data import normalize_toy_name
+from jsonl_stream import append_record, finalize_stream, open_stream, stream_path
+from page_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_AGE_MINUTES, PageCache
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -51,16 +76,20 @@ ALL_KIT_SLUGS = [
 LOVEVERY_CARE_URL = "https://lovevery.com/pages/care-instructions"
 LOVEVERY_HELP_URL = "https://help.lovevery.com"
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    ),
-}
-
 REQUEST_DELAY = 1.5
 
+# LLM enrichment
+ENRICH_MODEL = "gpt-4.1-mini"
+ENRICH_BATCH_TOYS = 25  # toys per request
+ENRICH_BATCH_CHARS = 6000  # approximate prompt characters per request
+DEFAULT_LLM_CONCURRENCY = 4
+DEFAULT_ENRICH_CACHE = Path(__file__).resolve().parent / "toy_enrichment_cache.json"
+
+# Labelled toys for the offline nearest-neighbour classifier (material_knn.py)
+DEFAULT_CLASSIFIER_DATA = (
+    Path(__file__).resolve().parent.parent / "client" / "src" / "data" / "toyCleaningGuide.ts"
+)
+
 # ---------------------------------------------------------------------------
 # Material classification rules
 # ---------------------------------------------------------------------------
@@ -162,29 +191,181 @@ log = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
-def fetch_page(url: str, session: requests.Session) -> str | None:
-    """Fetch a page and return HTML text, or None on failure."""
+def get_cleaning_for_material(material_cn: str) -> tuple[str, str] | None:
+    """Look up default cleaning instructions for a material type."""
+    return DEFAULT_CLEANING.get(material_cn)
+
+
+# ---------------------------------------------------------------------------
+# Material classification
+# ---------------------------------------------------------------------------
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Compile keywords into a regex shaped like their prefix trie.
+
+    ``["beech", "birch", "book", "board book"]`` becomes
+    ``b(?:eech|irch|o(?:ard\\ book|ok))``: shared prefixes are matched once,
+    so the regex engine walks the trie instead of retrying every keyword at
+    every position.  Optional suffixes are greedy, so at any position the
+    longest keyword is tried first.
+    """
+    trie: dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword.lower():
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict[str, Any]) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return (body if len(branches) > 1 else "(?:" + body + ")") + "?"
+        return body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """Multi-keyword matcher with word boundaries and longest-match priority.
+
+    All keywords are compiled into one trie-shaped pattern, so a text is
+    scanned once no matter how many keywords there are.  Keywords match
+    case-insensitively on (ASCII) word boundaries only -- "abs" does not
+    fire inside "absorbent" -- and a plural "s"/"es" is allowed, so "book"
+    matches "books".
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.pattern = re.compile(
+            r"(?<![a-z0-9])(" + _trie_pattern(keywords) + r")(?:e?s)?(?![a-z0-9])"
+        )
+
+    def find_all(self, text: str) -> list[tuple[int, str]]:
+        """Return ``(start, keyword)`` for every keyword found in *text*."""
+        return [(m.start(), m.group(1)) for m in self.pattern.finditer(text.lower())]
+
+    def best_match(self, text: str) -> str | None:
+        """Return the most specific keyword in *text*: longest, then earliest."""
+        return self.best_matches([text])[0]
+
+    def best_matches(self, texts: list[str]) -> list[str | None]:
+        """Return best_match for each of *texts*, scanning them in one pass."""
+        lowered = [t.lower() for t in texts]
+        starts: list[int] = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+        best: list[str | None] = [None] * len(texts)
+        for m in self.pattern.finditer("\n".join(lowered)):
+            i = bisect.bisect_right(starts, m.start()) - 1
+            keyword = m.group(1)
+            # finditer runs left to right, so ">" keeps the earliest on ties
+            if best[i] is None or len(keyword) > len(best[i]):
+                best[i] = keyword
+        return best
+
+
+MATERIAL_MATCHER = KeywordMatcher(MATERIAL_KEYWORDS)
+
+
+def detect_material(text: str) -> tuple[str, str] | None:
+    """Detect material type from a text description. Returns (cn, en) or None.
+
+    The longest whole-word keyword wins, so "natural rubber" beats
+    "rubber" and "board book" beats "book".
+    """
+    keyword = MATERIAL_MATCHER.best_match(text)
+    return MATERIAL_KEYWORDS[keyword] if keyword else None
+
+
+def classify_toy_materials(toys: Iterable[dict[str, Any]]) -> int:
+    """Fill in material_cn/material_en for every toy whose material is unknown.
+
+    Takes the toys of any number of kits at once and classifies them in one
+    pass over all names, then one over the descriptions of toys still
+    unresolved.  The toy name is checked before its description, since a
+    description often mentions packaging or accessories.  Returns the
+    number of toys newly classified.
+    """
+    pending = [t for t in toys if t.get("material_cn", "未知") == "未知"]
+    by_name = MATERIAL_MATCHER.best_matches([t.get("name", "") for t in pending])
+    by_desc = MATERIAL_MATCHER.best_matches(
+        [t.get("description", "") if not k else "" for t, k in zip(pending, by_name)]
+    )
+    classified = 0
+    for toy, name_kw, desc_kw in zip(pending, by_name, by_desc):
+        keyword = name_kw or desc_kw
+        toy["material_cn"], toy["material_en"] = (
+            MATERIAL_KEYWORDS[keyword] if keyword else ("未知", "Unknown")
+        )
+        classified += keyword is not None
+    return classified
+
+
+# ---------------------------------------------------------------------------
+# Nearest-neighbour classification
+# ---------------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=None)
+def load_knn_model(training_data: Path) -> Any | None:
+    """Train material_knn.py on *training_data* once per run; None if unavailable."""
     try:
-        resp = session.get(url, headers=HEADERS, timeout=30)
-        resp.raise_for_status()
-        return resp.text
-    except requests.RequestException as exc:
-        log.error("Failed to fetch %s: %s", url, exc)
+        from material_knn import MaterialKNN, load_samples
+    except ImportError:
+        log.warning("numpy not installed; skipping the nearest-neighbour classifier")
+        return None
+    if not training_data.is_file():
+        log.warning("Classifier training data not found: %s", training_data)
         return None
+    return MaterialKNN([sample for _, sample in load_samples(training_data)])
 
 
-def detect_material(text: str) -> tuple[str, str] | None:
-    """Detect material type from a text description. Returns (cn, en) or None."""
-    text_lower = text.lower()
-    for keyword, labels in MATERIAL_KEYWORDS.items():
-        if keyword in text_lower:
-            return labels
-    return None
+def classify_with_knn(toys: Iterable[dict[str, Any]], training_data: Path) -> int:
+    """Label still-unknown toys by their nearest neighbours in labelled data.
 
+    Uses material_knn.py (NumPy) trained on *training_data*, a generated
+    toyCleaningGuide.ts or a previous cleaning guide JSON.  Only confident
+    predictions are applied; the rest stay unknown for --enrich.  Returns
+    the number of toys resolved.
+    """
+    unknown = [t for t in toys if t.get("material_cn") == "未知"]
+    if not unknown:
+        return 0
+    model = load_knn_model(training_data)
+    if model is None:
+        return 0
+    from material_knn import is_confident
+
+    # English and Chinese names are queried separately (a name in a script
+    # the training data lacks would dilute the other); the more similar
+    # confident prediction wins
+    queries = [
+        (i, name)
+        for i, toy in enumerate(unknown)
+        for name in (toy.get("name"), toy.get("name_zh"))
+        if name
+    ]
+    predictions = model.predict([[name] for _, name in queries])
+    best: dict[int, Any] = {}
+    for (i, _), prediction in zip(queries, predictions):
+        if not is_confident(prediction):
+            continue
+        if i not in best or prediction.similarity > best[i].similarity:
+            best[i] = prediction
 
-def get_cleaning_for_material(material_cn: str) -> tuple[str, str] | None:
-    """Look up default cleaning instructions for a material type."""
-    return DEFAULT_CLEANING.get(material_cn)
+    for i, prediction in best.items():
+        toy = unknown[i]
+        toy["material_cn"], toy["material_en"] = prediction.material
+        # Composite labels have no default; borrow the neighbour's advice
+        if get_cleaning_for_material(prediction.material[0]) is None:
+            toy["cleaning_cn"], toy["cleaning_en"] = prediction.cleaning
+    return len(best)
 
 
 # ---------------------------------------------------------------------------
@@ -192,37 +373,50 @@ def get_cleaning_for_material(material_cn: str) -> tuple[str, str] | None:
 # ---------------------------------------------------------------------------
 
 
-def scrape_lovevery_care_page(session: requests.Session) -> dict[str, Any]:
+def extract_care_sections(html: str) -> dict[str, str]:
+    """Group the paragraphs of a care page under their nearest preceding heading.
+
+    Only ``h2``/``h3``/``p`` elements are parsed, and they are visited once
+    in document order, so the cost is linear in the page size however
+    deeply the theme nests its wrappers.  A heading that appears more than
+    once (e.g. desktop and mobile copies of the same block) yields one
+    section, and repeated paragraphs are kept only once per section.
+    Paragraphs before the first heading are ignored.
+    """
+    soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer(["h2", "h3", "p"]))
+    sections: dict[str, dict[str, None]] = {}
+    current: dict[str, None] | None = None
+    for el in soup.find_all(["h2", "h3", "p"]):
+        text = " ".join(el.get_text().split())
+        if el.name == "p":
+            if current is not None and text:
+                current[text] = None
+        elif text:
+            current = sections.setdefault(text, {})
+    return {
+        title: " ".join(paragraphs) for title, paragraphs in sections.items() if paragraphs
+    }
+
+
+def scrape_lovevery_care_page(pages: PageCache) -> dict[str, Any]:
     """Scrape the Lovevery care instructions page for cleaning guidelines."""
     log.info("Fetching Lovevery care page: %s", LOVEVERY_CARE_URL)
-    html = fetch_page(LOVEVERY_CARE_URL, session)
+    html = pages.fetch(LOVEVERY_CARE_URL)
     if not html:
         return {}
 
-    soup = BeautifulSoup(html, "lxml")
-    care_data: dict[str, Any] = {}
-
-    # Extract care instruction sections
-    for section in soup.find_all(["div", "section"]):
-        heading = section.find(["h2", "h3"])
-        if heading:
-            title = heading.get_text(strip=True)
-            paragraphs = section.find_all("p")
-            text = " ".join(p.get_text(strip=True) for p in paragraphs)
-            if text:
-                care_data[title] = text
-
+    care_data = extract_care_sections(html)
     log.info("  Found %d care sections", len(care_data))
     return care_data
 
 
 def scrape_kit_product_page(
-    slug: str, session: requests.Session
+    slug: str, pages: PageCache
 ) -> list[dict[str, Any]]:
     """Scrape a kit product page for toy names and material hints."""
     url = f"https://lovevery.com/products/the-play-kits-the-{slug}"
     log.info("Scraping product page for '%s'", slug)
-    html = fetch_page(url, session)
+    html = pages.fetch(url)
     if not html:
         return []
 
@@ -244,16 +438,9 @@ def scrape_kit_product_page(
         if next_el:
             desc = next_el.get_text(strip=True)[:500]
 
-        material = detect_material(f"{name} {desc}")
-        toys.append(
-            {
-                "name": name,
-                "description": desc,
-                "material_cn": material[0] if material else "未知",
-                "material_en": material[1] if material else "Unknown",
-            }
-        )
+        toys.append({"name": name, "description": desc})
 
+    classify_toy_materials(toys)
     log.info("  Found %d toy entries for '%s'", len(toys), slug)
     return toys
 
@@ -263,49 +450,95 @@ def scrape_kit_product_page(
 # ---------------------------------------------------------------------------
 
 
-def enrich_with_llm(
-    toys: list[dict[str, Any]], kit_slug: str
-) -> list[dict[str, Any]]:
-    """
-    Use an LLM to identify materials and generate cleaning instructions
-    for toys that are missing this information.
-    """
-    try:
-        from openai import OpenAI
-    except ImportError:
-        log.error("openai package not installed. Run: pip install openai")
-        return toys
+def toy_cache_key(toy: dict[str, Any]) -> str:
+    """Key a toy by its normalised name and a hash of its description.
 
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        log.error("OPENAI_API_KEY not set. Cannot enrich data.")
-        return toys
+    The same toy sold in several kits shares one key; a toy whose
+    description changes gets a new one and is classified again.
+    """
+    description = " ".join(toy.get("description", "").split())
+    digest = hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+    return f"{normalize_toy_name(toy.get('name', ''))}:{digest}"
 
-    client = OpenAI()
 
-    # Find toys needing enrichment
-    needs_enrichment = [
-        t for t in toys if t.get("material_cn") == "未知"
-    ]
+class EnrichmentCache:
+    """Persistent LLM answers per toy, keyed by toy_cache_key().
 
-    if not needs_enrichment:
-        return toys
+    Every answer is written to disk as soon as its batch completes, so an
+    interrupted run loses nothing and no toy is ever sent to the LLM twice.
+    """
 
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+        if path and path.is_file():
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def get(self, key: str) -> dict[str, str] | None:
+        return self.entries.get(key)
+
+    def update(self, answers: dict[str, dict[str, str]]) -> None:
+        """Add *answers* and save the cache atomically."""
+        with self._lock:
+            self.entries.update(answers)
+            if self.path is None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(dict(sorted(self.entries.items())), f, ensure_ascii=False, indent=2)
+                f.write("\n")
+            os.replace(tmp, self.path)
+
+
+def apply_enrichment(toy: dict[str, Any], answer: dict[str, str]) -> None:
+    """Copy an LLM answer onto a toy, keeping its current material if absent."""
+    toy["material_cn"] = answer.get("material_cn") or toy["material_cn"]
+    toy["material_en"] = answer.get("material_en") or toy["material_en"]
+    toy["cleaning_cn"] = answer.get("cleaning_cn", "")
+    toy["cleaning_en"] = answer.get("cleaning_en", "")
+
+
+def pack_toy_batches(
+    toys: list[dict[str, Any]],
+    max_toys: int = ENRICH_BATCH_TOYS,
+    max_chars: int = ENRICH_BATCH_CHARS,
+) -> list[list[dict[str, Any]]]:
+    """Split toys into batches of at most *max_toys* toys and ~*max_chars* of prompt."""
+    batches: list[list[dict[str, Any]]] = []
+    current: list[dict[str, Any]] = []
+    size = 0
+    for toy in toys:
+        cost = len(toy.get("name", "")) + min(len(toy.get("description", "")), 200)
+        if current and (len(current) >= max_toys or size + cost > max_chars):
+            batches.append(current)
+            current, size = [], 0
+        current.append(toy)
+        size += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def enrich_batch(client: Any, batch: list[dict[str, Any]]) -> dict[int, dict[str, str]]:
+    """Ask the LLM about one batch of toys; returns answers by batch index."""
     toy_list = "\n".join(
-        f"- {t['name']}: {t.get('description', 'No description')[:200]}"
-        for t in needs_enrichment
+        f"{i}. {t['name']}: {(t.get('description') or 'No description')[:200]}"
+        for i, t in enumerate(batch)
     )
 
-    prompt = f"""For the following Lovevery "{kit_slug}" Play Kit toys, identify the most likely
+    prompt = f"""For the following Lovevery Play Kit toys, identify the most likely
 material and provide cleaning instructions in both Chinese and English.
 
 Toys:
 {toy_list}
 
-Respond as a JSON array:
+Respond as a JSON array with one entry per toy, using the toy's number as "id":
 [
   {{
-    "name": "toy name",
+    "id": 0,
     "material_cn": "材质中文",
     "material_en": "Material English",
     "cleaning_cn": "清洗说明中文",
@@ -313,39 +546,114 @@ Respond as a JSON array:
   }}
 ]"""
 
+    response = client.chat.completions.create(
+        model=ENRICH_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that identifies toy materials "
+                "and provides cleaning advice. Respond with valid JSON only.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.2,
+        max_tokens=120 * len(batch) + 200,
+    )
+    content = response.choices[0].message.content or ""
+    # Extract JSON array
+    json_match = re.search(r"\[[\s\S]*\]", content)
+    if not json_match:
+        return {}
+    answers: dict[int, dict[str, str]] = {}
+    for entry in json.loads(json_match.group()):
+        try:
+            index = int(entry.pop("id"))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= index < len(batch):
+            answers[index] = {k: str(v) for k, v in entry.items()}
+    return answers
+
+
+def enrich_with_llm(
+    toys: list[dict[str, Any]],
+    cache: EnrichmentCache,
+    batch_toys: int = ENRICH_BATCH_TOYS,
+    batch_chars: int = ENRICH_BATCH_CHARS,
+    concurrency: int = DEFAULT_LLM_CONCURRENCY,
+) -> int:
+    """
+    Use an LLM to identify materials and generate cleaning instructions
+    for toys that are missing this information.
+
+    *toys* may span every kit.  Unknown toys are deduplicated by
+    toy_cache_key(); cached answers are applied without any request, and
+    the rest are sent in size-bounded batches, *concurrency* at a time.
+    Returns the number of toys enriched.
+    """
+    pending: dict[str, list[dict[str, Any]]] = {}
+    enriched = 0
+    for toy in toys:
+        if toy.get("material_cn") != "未知":
+            continue
+        key = toy_cache_key(toy)
+        answer = cache.get(key)
+        if answer:
+            apply_enrichment(toy, answer)
+            enriched += 1
+        else:
+            pending.setdefault(key, []).append(toy)
+    if enriched:
+        log.info("  Enrichment cache answered %d toys", enriched)
+    if not pending:
+        return enriched
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that identifies toy materials "
-                    "and provides cleaning advice. Respond with valid JSON only.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-            max_tokens=1000,
-        )
-        content = response.choices[0].message.content or ""
-        # Extract JSON array
-        json_match = re.search(r"\[[\s\S]*\]", content)
-        if json_match:
-            enriched = json.loads(json_match.group())
-            # Merge enriched data back
-            enriched_map = {e["name"]: e for e in enriched}
-            for toy in toys:
-                if toy["name"] in enriched_map:
-                    e = enriched_map[toy["name"]]
-                    toy["material_cn"] = e.get("material_cn", toy["material_cn"])
-                    toy["material_en"] = e.get("material_en", toy["material_en"])
-                    toy["cleaning_cn"] = e.get("cleaning_cn", "")
-                    toy["cleaning_en"] = e.get("cleaning_en", "")
-            log.info("  LLM enriched %d toys for '%s'", len(enriched), kit_slug)
-    except Exception as exc:
-        log.error("  LLM enrichment failed for '%s': %s", kit_slug, exc)
+        from openai import OpenAI
+    except ImportError:
+        log.error("openai package not installed. Run: pip install openai")
+        return enriched
 
-    return toys
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        log.error("OPENAI_API_KEY not set. Cannot enrich %d toys.", len(pending))
+        return enriched
+
+    client = OpenAI()
+    keys = list(pending)
+    representatives = [pending[key][0] for key in keys]
+    batches = pack_toy_batches(representatives, batch_toys, batch_chars)
+    log.info(
+        "  Asking the LLM about %d unique toys in %d batches (%d toys share an entry)",
+        len(keys),
+        len(batches),
+        sum(len(v) for v in pending.values()) - len(keys),
+    )
+
+    def run(batch_keys: list[str], batch: list[dict[str, Any]]) -> int:
+        try:
+            answers = enrich_batch(client, batch)
+        except Exception as exc:
+            log.error("  LLM enrichment batch failed: %s", exc)
+            return 0
+        by_key = {batch_keys[i]: answer for i, answer in answers.items()}
+        cache.update(by_key)
+        count = 0
+        for key, answer in by_key.items():
+            for toy in pending[key]:
+                apply_enrichment(toy, answer)
+                count += 1
+        return count
+
+    offset = 0
+    jobs = []
+    for batch in batches:
+        jobs.append((keys[offset : offset + len(batch)], batch))
+        offset += len(batch)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        enriched += sum(pool.map(lambda job: run(*job), jobs))
+    log.info("  LLM enriched %d toys", enriched)
+    return enriched
 
 
 # ---------------------------------------------------------------------------
@@ -411,6 +719,7 @@ Examples:
   %(prog)s --enrich                         # Use LLM to fill missing data
   %(prog)s --input existing_data.json       # Enrich existing data file
   %(prog)s -o output/cleaning_guide.json    # Custom output path
+  %(prog)s --stream --enrich                # Stream kits to disk as they finish
         """,
     )
     parser.add_argument(
@@ -438,12 +747,75 @@ Examples:
         help="Use LLM to identify materials and generate cleaning advice "
         "for toys with missing data (requires OPENAI_API_KEY)",
     )
+    parser.add_argument(
+        "--classifier-data",
+        type=str,
+        default=str(DEFAULT_CLASSIFIER_DATA),
+        help="Labelled toys for the offline material classifier: a generated "
+        "toyCleaningGuide.ts or cleaning guide JSON (default: "
+        "client/src/data/toyCleaningGuide.ts)",
+    )
+    parser.add_argument(
+        "--no-classifier",
+        action="store_true",
+        help="Skip the offline nearest-neighbour material classifier",
+    )
+    parser.add_argument(
+        "--enrich-cache",
+        type=str,
+        default=str(DEFAULT_ENRICH_CACHE),
+        help="Per-toy cache of LLM answers; cached toys are never sent again "
+        "(default: scripts/toy_enrichment_cache.json)",
+    )
+    parser.add_argument(
+        "--no-enrich-cache",
+        action="store_true",
+        help="Do not read or write the enrichment cache",
+    )
+    parser.add_argument(
+        "--enrich-batch-size",
+        type=int,
+        default=ENRICH_BATCH_TOYS,
+        help=f"Maximum toys per LLM request (default: {ENRICH_BATCH_TOYS})",
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=DEFAULT_LLM_CONCURRENCY,
+        help=f"LLM requests in flight (default: {DEFAULT_LLM_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Append each kit to <output>.jsonl as it completes and convert it "
+        "to the JSON array at the end; a rerun resumes an interrupted stream",
+    )
     parser.add_argument(
         "--delay",
         type=float,
         default=REQUEST_DELAY,
         help=f"Delay between requests in seconds (default: {REQUEST_DELAY})",
     )
+    parser.add_argument(
+        "--page-cache",
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help="Directory of the lovevery.com page cache shared with "
+        "scrape_lovevery_official.py (default: scripts/.page_cache)",
+    )
+    parser.add_argument(
+        "--no-page-cache",
+        action="store_true",
+        help="Do not read or write the on-disk page cache",
+    )
+    parser.add_argument(
+        "--page-cache-max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE_MINUTES,
+        metavar="MINUTES",
+        help="Use cached pages younger than this without revalidating "
+        f"(default: {DEFAULT_MAX_AGE_MINUTES:g})",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -464,15 +836,70 @@ Examples:
         log.error("Unknown kit slug(s): %s", ", ".join(invalid))
         sys.exit(1)
 
-    session = requests.Session()
+    output_path = Path(args.output)
+    if args.stream and output_path.suffix == ".jsonl":
+        parser.error("--stream writes <output>.jsonl itself; -o must name the JSON array")
+
+    pages = PageCache(
+        None if args.no_page_cache else Path(args.page_cache),
+        max_age=args.page_cache_max_age * 60,
+        delay=args.delay,
+    )
 
     # Step 1: Scrape care page for general guidelines
-    care_data = scrape_lovevery_care_page(session)
-    time.sleep(args.delay)
+    care_data = scrape_lovevery_care_page(pages)
 
     # Step 2: Process each kit
     results: list[dict[str, Any]] = []
+    stream = stream_path(output_path)
+    stream_file = None
+    streamed: dict[str, int] = {}
+    if args.stream:
+        stream_file, streamed = open_stream(stream, "kit_id")
+        if streamed:
+            log.info("Resuming from %s: %d kits already done", stream, len(streamed))
+
+    total_toys = 0
+    cache = (
+        EnrichmentCache(None if args.no_enrich_cache else Path(args.enrich_cache))
+        if args.enrich
+        else None
+    )
 
+    def finish(kits: list[tuple[str, list[dict[str, Any]]]]) -> None:
+        """Classify and enrich *kits* together, then emit their guides."""
+        nonlocal total_toys
+        all_toys = [toy for _, toys in kits for toy in toys]
+        # Resolve familiar toys locally so that only the rest reach the LLM
+        if not args.no_classifier:
+            unknown = sum(1 for t in all_toys if t.get("material_cn") == "未知")
+            if unknown:
+                resolved = classify_with_knn(all_toys, Path(args.classifier_data))
+                log.info(
+                    "Nearest-neighbour classifier resolved %d of %d unknown toys",
+                    resolved,
+                    unknown,
+                )
+        if cache is not None:
+            enrich_with_llm(
+                all_toys,
+                cache,
+                batch_toys=args.enrich_batch_size,
+                concurrency=args.llm_concurrency,
+            )
+        for kit_slug, toys in kits:
+            guide = build_cleaning_guide(kit_slug, toys)
+            total_toys += len(guide["toys"])
+            if stream_file:
+                append_record(stream_file, guide)
+            else:
+                results.append(guide)
+
+    # Without --stream, kits are classified and enriched in one batch after
+    # they are all loaded, so a toy shared by several kits is asked about
+    # once.  With --stream each kit is finished and written as soon as it is
+    # loaded; toys an earlier kit shared are then answered by the cache.
+    selected: list[tuple[str, list[dict[str, Any]]]] = []
     if args.input:
         # Use existing data file as base
         log.info("Loading existing data from %s", args.input)
@@ -481,38 +908,46 @@ Examples:
 
         for kit_data in existing:
             kit_slug = kit_data.get("slug") or kit_data.get("kit_id", "")
-            if slugs and kit_slug not in slugs:
-                continue
-
-            toys = kit_data.get("toys", [])
-            if args.enrich:
-                toys = enrich_with_llm(toys, kit_slug)
-
-            guide = build_cleaning_guide(kit_slug, toys)
-            results.append(guide)
+            if kit_slug in slugs and kit_slug not in streamed:
+                selected.append((kit_slug, kit_data.get("toys", [])))
+
+        # One keyword pass over every toy of every kit, before any LLM call
+        all_toys = [toy for _, toys in selected for toy in toys]
+        classified = classify_toy_materials(all_toys)
+        log.info("Classified %d of %d toys by material keyword", classified, len(all_toys))
+        if stream_file:
+            for kit in selected:
+                finish([kit])
+            selected = []
     else:
         # Scrape from product pages
         for i, slug in enumerate(slugs):
+            if slug in streamed:
+                continue
             log.info("Processing kit: %s (%d/%d)", slug, i + 1, len(slugs))
-            toys = scrape_kit_product_page(slug, session)
-            time.sleep(args.delay)
-
-            if args.enrich:
-                toys = enrich_with_llm(toys, slug)
+            kit = (slug, scrape_kit_product_page(slug, pages))
+            if stream_file:
+                finish([kit])
+            else:
+                selected.append(kit)
 
-            guide = build_cleaning_guide(slug, toys)
-            results.append(guide)
+    pages.log_stats()
+    if selected:
+        finish(selected)
 
     # Step 3: Write output
-    output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    if stream_file:
+        stream_file.close()
+        kit_count = finalize_stream(stream, output_path, "kit_id")
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        kit_count = len(results)
 
-    total_toys = sum(len(k["toys"]) for k in results)
     log.info(
         "Done! Generated cleaning guide for %d kits (%d toys) → %s",
-        len(results),
+        kit_count,
         total_toys,
         output_path,
     )
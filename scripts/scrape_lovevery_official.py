@@ -11,6 +11,22 @@ Data is extracted from the server-rendered HTML and embedded JSON-LD / Next.js
 data payloads.  The output is a single JSON file that can be fed into
 `generate_toy_data.py` to produce TypeScript data files for the website.
 
+Without --kit, the kits to crawl are discovered from the store sitemap (or the
+Play Kits listing page), and kits that appeared or disappeared since the last
+output are reported.  Kit pages are fetched concurrently (--concurrency)
+behind a per-host rate limiter, so a full crawl is bounded by the request
+budget instead of a sleep after every page.
+
+Kit details come from the kit's HTML page, the only source of the toy list.
+The page is read without building its DOM: the JSON-LD and __NEXT_DATA__
+scripts are cut out with a regex and only <head> is parsed.  The store's
+compact Shopify product JSON (/products/<handle>.json) is fetched only for
+fields the page lacks (--strategy).
+
+Pages are fetched through the shared on-disk page cache (page_cache.py), so
+scrape_cleaning_guide.py reuses the same kit pages, and unchanged pages are
+revalidated with conditional GETs instead of being downloaded again.
+
 Usage:
     python scrape_lovevery_official.py                       # scrape all kits
     python scrape_lovevery_official.py --kit looker senser    # scrape specific kits
@@ -23,25 +39,35 @@ Requirements:
 from __future__ import annotations
 
 import argparse
+import html as html_lib
 import json
 import logging
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup, SoupStrainer
 
-import requests
-from bs4 import BeautifulSoup
+from page_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_AGE_MINUTES, PageCache
 
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
 BASE_URL = "https://lovevery.com"
-PLAY_KITS_URL = f"{BASE_URL}/products/the-play-kits"
+PLAY_KITS_PATH = "/products/the-play-kits"
 CONTENTFUL_CDN = "images.ctfassets.net"
 
+# Fields the product JSON may fill in when the kit page lacks them.  The
+# toy list only exists in the page's __NEXT_DATA__, so the page is always
+# the primary source and the JSON only a fallback
+JSON_FALLBACK_FIELDS = ("title", "price", "images")
+FETCH_STRATEGIES = ["auto", "json", "html"]
+
 # All known kit slugs (in developmental order)
 ALL_KIT_SLUGS = [
     "looker", "charmer", "senser", "explorer", "observer", "thinker",
@@ -50,18 +76,17 @@ ALL_KIT_SLUGS = [
     "challenger", "investigator", "examiner", "connector", "creative",
 ]
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    ),
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "en-US,en;q=0.9",
-}
-
 # Rate-limit: seconds between requests
 REQUEST_DELAY = 1.5
+DEFAULT_CONCURRENCY = 4  # kit pages in flight; requests still obey REQUEST_DELAY
+
+KIT_URL_RE = re.compile(r"/products/the-play-kits-the-([a-z0-9]+(?:-[a-z0-9]+)*)(?![a-z0-9-])")
+SITEMAP_LOC_RE = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>")
+# Kit pages are read without building their DOM: the data scripts are cut
+# out with a regex and only <head> goes through BeautifulSoup
+SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+HEAD_STRAINER = SoupStrainer(["title", "meta"])
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -79,17 +104,6 @@ log = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
-def fetch_page(url: str, session: requests.Session) -> str | None:
-    """Fetch a page and return its HTML text, or None on failure."""
-    try:
-        resp = session.get(url, headers=HEADERS, timeout=30)
-        resp.raise_for_status()
-        return resp.text
-    except requests.RequestException as exc:
-        log.error("Failed to fetch %s: %s", url, exc)
-        return None
-
-
 def extract_json_ld(soup: BeautifulSoup) -> list[dict]:
     """Extract all JSON-LD blocks from the page."""
     results = []
@@ -102,15 +116,29 @@ def extract_json_ld(soup: BeautifulSoup) -> list[dict]:
     return results
 
 
-def extract_next_data(soup: BeautifulSoup) -> dict | None:
-    """Extract Next.js __NEXT_DATA__ payload if present."""
-    tag = soup.find("script", id="__NEXT_DATA__")
-    if tag and tag.string:
+def extract_page_scripts(html: str) -> tuple[list[dict], dict | None]:
+    """Return a page's JSON-LD blocks and __NEXT_DATA__ payload.
+
+    Script elements are found with SCRIPT_RE instead of a DOM parse, which
+    on a full kit page is most of the parsing cost.
+    """
+    json_ld: list[dict] = []
+    next_data: dict | None = None
+    for match in SCRIPT_RE.finditer(html):
+        attrs, body = match.groups()
+        is_next_data = re.search(r"""\bid\s*=\s*["']?__NEXT_DATA__\b""", attrs)
+        is_json_ld = re.search(r"""\btype\s*=\s*["']?application/ld\+json\b""", attrs)
+        if not (is_next_data or is_json_ld):
+            continue
         try:
-            return json.loads(tag.string)
+            data = json.loads(body)
         except json.JSONDecodeError:
-            return None
-    return None
+            continue
+        if is_next_data and isinstance(data, dict):
+            next_data = data
+        elif is_json_ld and isinstance(data, dict):
+            json_ld.append(data)
+    return json_ld, next_data
 
 
 def extract_contentful_images(html: str) -> list[str]:
@@ -143,10 +171,11 @@ def extract_meta(soup: BeautifulSoup, property_name: str) -> str | None:
 # ---------------------------------------------------------------------------
 
 
-def scrape_kit_listing(session: requests.Session) -> list[dict[str, Any]]:
+def scrape_kit_listing(pages: PageCache, base_url: str = BASE_URL) -> list[dict[str, Any]]:
     """Scrape the main Play Kits listing page for an overview of all kits."""
-    log.info("Fetching Play Kits listing page: %s", PLAY_KITS_URL)
-    html = fetch_page(PLAY_KITS_URL, session)
+    listing_url = base_url + PLAY_KITS_PATH
+    log.info("Fetching Play Kits listing page: %s", listing_url)
+    html = pages.fetch(listing_url)
     if not html:
         log.warning("Could not fetch listing page; falling back to individual pages.")
         return []
@@ -173,17 +202,16 @@ def scrape_kit_listing(session: requests.Session) -> list[dict[str, Any]]:
     return kits_overview
 
 
-def scrape_kit_detail(
-    slug: str, session: requests.Session
-) -> dict[str, Any] | None:
-    """Scrape a single Kit product page for detailed information."""
-    url = f"{PLAY_KITS_URL}-the-{slug}"
-    log.info("Scraping kit: %s → %s", slug, url)
-    html = fetch_page(url, session)
-    if not html:
-        return None
+def parse_kit_html(html: str, slug: str) -> dict[str, Any]:
+    """Extract kit fields from a full Kit product page.
 
-    soup = BeautifulSoup(html, "lxml")
+    Title and meta tags are read from <head> only, JSON-LD and
+    __NEXT_DATA__ with extract_page_scripts(), and Contentful images with a
+    regex over the source, so the page body is never turned into a DOM.
+    """
+    head_end = HEAD_END_RE.search(html)
+    head = html[: head_end.end()] if head_end else html
+    soup = BeautifulSoup(head, "lxml", parse_only=HEAD_STRAINER)
 
     # Basic metadata
     title = soup.find("title")
@@ -197,9 +225,10 @@ def scrape_kit_detail(
     images = extract_contentful_images(html)
 
     # Try to extract price from JSON-LD Product schema
+    json_ld, next_data = extract_page_scripts(html)
     price = None
     currency = "USD"
-    for ld in extract_json_ld(soup):
+    for ld in json_ld:
         if ld.get("@type") == "Product":
             offers = ld.get("offers", {})
             if isinstance(offers, dict):
@@ -209,17 +238,8 @@ def scrape_kit_detail(
                 price = offers[0].get("price")
                 currency = offers[0].get("priceCurrency", "USD")
 
-    # Extract toy names from the page content
-    # Lovevery pages typically list toys in specific sections
+    # Toys come from the Next.js product data
     toys: list[dict[str, str]] = []
-    toy_sections = soup.find_all(
-        ["h3", "h4", "p", "span"],
-        string=re.compile(r".{3,80}$"),
-    )
-    # This is a heuristic; the actual structure varies by page version
-
-    # Try Next.js data for more structured info
-    next_data = extract_next_data(soup)
     if next_data:
         props = next_data.get("props", {}).get("pageProps", {})
         product = props.get("product", {})
@@ -239,8 +259,7 @@ def scrape_kit_detail(
                         }
                     )
 
-    kit_data: dict[str, Any] = {
-        "slug": slug,
+    return {
         "title": title_text,
         "description": description,
         "og_image": og_image,
@@ -248,12 +267,207 @@ def scrape_kit_detail(
         "currency": currency,
         "images": images[:20],  # Limit to first 20 images
         "toys": toys,
+    }
+
+
+def iter_json_strings(value: Any) -> Iterator[str]:
+    """Yield every string inside a decoded JSON value."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_json_strings(item)
+
+
+def parse_product_json(text: str) -> dict[str, Any]:
+    """Extract kit fields from a Shopify ``/products/<handle>.json`` payload.
+
+    Only fields actually present are returned, so the caller can tell what
+    still has to come from the HTML page.
+    """
+    try:
+        product = json.loads(text).get("product") or {}
+    except (json.JSONDecodeError, AttributeError):
+        return {}
+
+    fields: dict[str, Any] = {}
+    if product.get("title"):
+        fields["title"] = product["title"]
+    if product.get("body_html"):
+        plain = html_lib.unescape(re.sub(r"<[^>]+>", " ", product["body_html"]))
+        fields["description"] = " ".join(plain.split())
+    image = product.get("image") or {}
+    if image.get("src"):
+        fields["og_image"] = image["src"]
+
+    variants = product.get("variants") or []
+    if variants and variants[0].get("price") is not None:
+        fields["price"] = variants[0]["price"]
+        presentment = variants[0].get("presentment_prices") or []
+        if presentment:
+            fields["currency"] = presentment[0].get("price", {}).get("currency_code", "USD")
+
+    # Contentful images are referenced from the product copy and metafields
+    images = extract_contentful_images("\n".join(iter_json_strings(product)))
+    if images:
+        fields["images"] = images[:20]
+    return fields
+
+
+def scrape_kit_detail(
+    slug: str,
+    pages: PageCache,
+    base_url: str = BASE_URL,
+    strategy: str = "auto",
+) -> dict[str, Any] | None:
+    """Scrape a single Kit's details.
+
+    The kit page is the primary source, since only it lists the toys; it
+    is read without building a DOM (parse_kit_html).  With the ``auto``
+    strategy the compact Shopify product JSON is fetched only when the page
+    is unavailable or lacks one of JSON_FALLBACK_FIELDS, and then fills the
+    empty fields only.  ``html`` never fetches the JSON; ``json`` never
+    fetches the page, so it yields no toys.
+    """
+    url = f"{base_url}{PLAY_KITS_PATH}-the-{slug}"
+    log.info("Scraping kit: %s → %s", slug, url)
+
+    fields: dict[str, Any] = {}
+    if strategy != "json":
+        html = pages.fetch(url)
+        if html:
+            fields = parse_kit_html(html, slug)
+
+    missing = [f for f in JSON_FALLBACK_FIELDS if not fields.get(f)]
+    if strategy == "json" or (strategy == "auto" and missing):
+        if fields:
+            log.info("  Kit page lacks %s; reading the product JSON", ", ".join(missing))
+        text = pages.fetch(url + ".json")
+        if text:
+            for key, value in parse_product_json(text).items():
+                if not fields.get(key):
+                    fields[key] = value
+
+    if not fields:
+        return None
+
+    kit_data: dict[str, Any] = {
+        "slug": slug,
+        "title": fields.get("title", ""),
+        "description": fields.get("description", ""),
+        "og_image": fields.get("og_image", ""),
+        "price": fields.get("price"),
+        "currency": fields.get("currency", "USD"),
+        "images": fields.get("images", []),
+        "toys": fields.get("toys", []),
         "url": url,
     }
 
     return kit_data
 
 
+# ---------------------------------------------------------------------------
+# Kit discovery
+# ---------------------------------------------------------------------------
+
+
+def kit_slugs_in(text: str) -> list[str]:
+    """Return the kit slugs of every Play Kit product URL in *text*, in order."""
+    return list(dict.fromkeys(KIT_URL_RE.findall(text)))
+
+
+def discover_from_sitemap(pages: PageCache, base_url: str) -> list[str]:
+    """Find kit slugs in the store sitemap, following its product sub-sitemaps.
+
+    Sub-sitemaps are fetched from *base_url* whatever host their ``<loc>``
+    names, so a local stub can serve the whole tree.
+    """
+    index = pages.fetch(f"{base_url}/sitemap.xml")
+    if not index:
+        return []
+    slugs = kit_slugs_in(index)
+    for loc in SITEMAP_LOC_RE.findall(index):
+        if "sitemap_products" not in loc:
+            continue
+        parts = urlsplit(html_lib.unescape(loc))
+        child = pages.fetch(base_url + parts.path + (f"?{parts.query}" if parts.query else ""))
+        if child:
+            slugs.extend(kit_slugs_in(child))
+    return list(dict.fromkeys(slugs))
+
+
+def discover_kit_slugs(pages: PageCache, base_url: str = BASE_URL) -> list[str]:
+    """Discover the kits currently sold, from the sitemap or else the listing page.
+
+    Known kits keep their developmental order (ALL_KIT_SLUGS); new ones
+    follow in the order they were found.  Returns [] if nothing was found.
+    """
+    slugs = discover_from_sitemap(pages, base_url)
+    source = "sitemap"
+    if not slugs:
+        # Already fetched by scrape_kit_listing, so this is a cache hit
+        listing_html = pages.fetch(base_url + PLAY_KITS_PATH)
+        slugs = kit_slugs_in(listing_html or "")
+        source = "listing page"
+    if slugs:
+        log.info("Discovered %d kits from the %s", len(slugs), source)
+    found = set(slugs)
+    return [s for s in ALL_KIT_SLUGS if s in found] + [
+        s for s in slugs if s not in ALL_KIT_SLUGS
+    ]
+
+
+def report_kit_changes(discovered: list[str], previous: list[str]) -> None:
+    """Log kits that appeared or disappeared relative to *previous*."""
+    added = [s for s in discovered if s not in previous]
+    removed = [s for s in previous if s not in discovered]
+    if added:
+        log.info("New kits: %s", ", ".join(added))
+    if removed:
+        log.warning("Kits no longer listed: %s", ", ".join(removed))
+    if not added and not removed:
+        log.info("Kit list unchanged (%d kits)", len(discovered))
+
+
+def crawl_kits(
+    slugs: list[str],
+    pages: PageCache,
+    base_url: str = BASE_URL,
+    strategy: str = "auto",
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[dict[str, Any]]:
+    """Scrape kit details with *concurrency* workers, returning them in *slugs* order.
+
+    The page cache's per-host rate limiter spaces the actual requests, so
+    the crawl is bounded by the request budget rather than summed sleeps.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="kit") as pool:
+        futures = [
+            pool.submit(scrape_kit_detail, slug, pages, base_url, strategy) for slug in slugs
+        ]
+        results: list[dict[str, Any]] = []
+        for slug, future in zip(slugs, futures):
+            try:
+                kit_data = future.result()
+            except Exception as exc:
+                log.error("  ✗ %s failed: %s", slug, exc)
+                continue
+            if kit_data:
+                results.append(kit_data)
+                log.info(
+                    "  ✓ %s — %d images, %d toys",
+                    slug,
+                    len(kit_data["images"]),
+                    len(kit_data["toys"]),
+                )
+            else:
+                log.warning("  ✗ Failed to scrape %s", slug)
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -265,10 +479,14 @@ def main() -> None:
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  %(prog)s                                # Scrape all 22 kits
+  %(prog)s                                # Discover and scrape all kits
   %(prog)s --kit looker charmer senser    # Scrape specific kits only
   %(prog)s -o output/kits.json            # Custom output path
   %(prog)s --delay 2.0                    # Slower request rate
+  %(prog)s --concurrency 8 --no-discover  # Built-in kit list, more in flight
+  %(prog)s --page-cache-max-age 0         # Revalidate every cached page
+  %(prog)s --strategy html                # Parse full HTML pages only
+  %(prog)s --base-url http://127.0.0.1:8000 --no-page-cache   # Offline stub
         """,
     )
     parser.add_argument(
@@ -276,7 +494,8 @@ Examples:
         nargs="+",
         metavar="SLUG",
         help="Kit slug(s) to scrape (default: all kits). "
-        f"Valid slugs: {', '.join(ALL_KIT_SLUGS)}",
+        f"Known slugs: {', '.join(ALL_KIT_SLUGS)}; other slugs are checked "
+        "against the kits discovered on the store",
     )
     parser.add_argument(
         "-o",
@@ -291,6 +510,53 @@ Examples:
         default=REQUEST_DELAY,
         help=f"Delay between requests in seconds (default: {REQUEST_DELAY})",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Kit pages fetched in parallel, within the per-host rate limit "
+        f"(default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--no-discover",
+        action="store_true",
+        help="Crawl the built-in kit list instead of discovering kits from the "
+        "sitemap/listing page",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=FETCH_STRATEGIES,
+        default="auto",
+        help="auto: HTML page, product JSON only for missing fields; "
+        "json: product JSON only, no toys; html: HTML page only "
+        "(default: auto)",
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=BASE_URL,
+        help=f"Store base URL, e.g. a local shopify_stub.py (default: {BASE_URL})",
+    )
+    parser.add_argument(
+        "--page-cache",
+        type=str,
+        default=str(DEFAULT_CACHE_DIR),
+        help="Directory of the lovevery.com page cache shared with "
+        "scrape_cleaning_guide.py (default: scripts/.page_cache)",
+    )
+    parser.add_argument(
+        "--no-page-cache",
+        action="store_true",
+        help="Do not read or write the on-disk page cache",
+    )
+    parser.add_argument(
+        "--page-cache-max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE_MINUTES,
+        metavar="MINUTES",
+        help="Use cached pages younger than this without revalidating "
+        f"(default: {DEFAULT_MAX_AGE_MINUTES:g})",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -305,42 +571,57 @@ Examples:
 
     slugs = args.kit if args.kit else ALL_KIT_SLUGS
 
-    # Validate slugs
-    invalid = [s for s in slugs if s not in ALL_KIT_SLUGS]
-    if invalid:
-        log.error("Unknown kit slug(s): %s", ", ".join(invalid))
-        log.info("Valid slugs: %s", ", ".join(ALL_KIT_SLUGS))
-        sys.exit(1)
-
-    session = requests.Session()
+    output_path = Path(args.output)
+    pages = PageCache(
+        None if args.no_page_cache else Path(args.page_cache),
+        max_age=args.page_cache_max_age * 60,
+        delay=args.delay,
+    )
 
     # Step 1: Scrape listing page for overview
-    listing = scrape_kit_listing(session)
+    listing = scrape_kit_listing(pages, args.base_url)
     log.info("Listing page returned %d kit overviews.", len(listing))
 
-    # Step 2: Scrape each kit detail page
-    results: list[dict[str, Any]] = []
-    for i, slug in enumerate(slugs):
-        if i > 0:
-            time.sleep(args.delay)
-        kit_data = scrape_kit_detail(slug, session)
-        if kit_data:
-            results.append(kit_data)
-            log.info(
-                "  ✓ %s — %d images, %d toys",
-                slug,
-                len(kit_data["images"]),
-                len(kit_data["toys"]),
-            )
+    # Step 2: Discover the kits currently on sale.  Requested kits outside
+    # the built-in list are checked against the discovered ones, so a new
+    # kit can be scraped on its own as soon as the store lists it
+    unknown = [s for s in slugs if s not in ALL_KIT_SLUGS]
+    if (not args.kit or unknown) and not args.no_discover:
+        discovered = discover_kit_slugs(pages, args.base_url)
+        if args.kit:
+            invalid = [s for s in unknown if s not in discovered]
+            if invalid and discovered:
+                log.error("Unknown kit slug(s): %s", ", ".join(invalid))
+                log.info("Kits on the store: %s", ", ".join(discovered))
+                sys.exit(1)
+            if invalid:
+                log.warning(
+                    "Kit discovery found nothing; trying unknown slug(s) anyway: %s",
+                    ", ".join(invalid),
+                )
+        elif discovered:
+            previous = ALL_KIT_SLUGS
+            if output_path.is_file():
+                with open(output_path, "r", encoding="utf-8") as f:
+                    previous = [k.get("slug", "") for k in json.load(f)]
+            report_kit_changes(discovered, previous)
+            slugs = discovered
         else:
-            log.warning("  ✗ Failed to scrape %s", slug)
+            log.warning("Kit discovery found nothing; using the built-in kit list")
+    elif unknown:
+        log.warning("Not in the built-in kit list, trying anyway: %s", ", ".join(unknown))
 
-    # Step 3: Write output
-    output_path = Path(args.output)
+    # Step 3: Scrape kit details concurrently
+    start = time.monotonic()
+    results = crawl_kits(slugs, pages, args.base_url, args.strategy, args.concurrency)
+    log.info("Crawled %d kits in %.1fs", len(slugs), time.monotonic() - start)
+
+    # Step 4: Write output
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
 
+    pages.log_stats()
     log.info("Done! Scraped %d/%d kits → %s", len(results), len(slugs), output_path)
 
 
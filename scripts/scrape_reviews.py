@@ -8,35 +8,79 @@ Supported sources:
   - Amazon product reviews (via HTML scraping)
   - Xiaohongshu / 小红书 (via keyword search, requires cookie)
 
-The script collects raw review text, then optionally calls an OpenAI-compatible
-LLM to distil the reviews into concise pros and cons for each toy.
+The script collects raw review text, then optionally distils the reviews into
+concise pros and cons: with an OpenAI-compatible LLM, or offline with a local
+extractive summariser (extractive_summary.py: TextRank over TF-IDF sentence
+vectors plus a polarity lexicon).  By default the LLM is used when available
+and the local summariser covers kits it cannot summarise.
+
+Sources are independent hosts, so they are collected concurrently: each host
+has its own rate limiter (at most one request per --delay seconds), and up to
+--concurrency kits are in flight per host.  A full refresh is bounded by the
+slowest host's request budget rather than the sum of every sleep.
+
+Reddit searches are planned across kits: kit names are OR-ed together into a
+few large searches and the returned posts are routed back to the kits they
+mention by local text matching.  Popular threads match many kits; their
+comments are fetched once per run and shared (optionally persisted with
+--reddit-cache).
+
+Xiaohongshu search pages carry their results as a JSON blob
+(window.__INITIAL_STATE__) that the client renders into note cards; the blob
+is sliced out of the HTML and parsed with json.loads, and CSS selectors over
+the DOM are only a fallback for pages without it.
+
+With --incremental, the previous output is kept as the stored corpus and a
+state file records a watermark per (kit, source).  Reddit is then searched
+newest-first within the smallest time window covering the watermark, only
+newer posts are merged in, and --summarise re-runs only for kits whose corpus
+changed.
+
+With --stream, each kit is appended to <output>.jsonl as soon as it is
+collected (and summarised), so memory stays bounded by the kits in flight
+and an interrupted run keeps what it finished.  The stream is converted to
+the usual JSON array atomically at the end; rerunning after a failure
+resumes from the kits already in the stream.
 
 Usage:
     python scrape_reviews.py                              # all kits, all sources
     python scrape_reviews.py --kit looker --source reddit  # specific kit & source
     python scrape_reviews.py --summarise                   # also run LLM summary
     python scrape_reviews.py -o reviews.json               # custom output
+    python scrape_reviews.py --reddit-cache .reddit_cache.json  # reuse threads across runs
+    python scrape_reviews.py --incremental --summarise     # only new content
+    python scrape_reviews.py --stream                      # resumable JSONL stream
 
 Requirements:
     pip install requests beautifulsoup4 lxml openai
-    Environment variable: OPENAI_API_KEY (only needed with --summarise)
+    pip install numpy   (optional, for the local summariser)
+    Environment variable: OPENAI_API_KEY (only needed for LLM summaries)
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import importlib.util
 import json
 import logging
 import os
 import re
 import sys
+import threading
 import time
+import unicodedata
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import requests
 from bs4 import BeautifulSoup
 
+from jsonl_stream import append_record, finalize_stream, open_stream, stream_path
+from page_cache import RateLimiter
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -49,6 +93,18 @@ ALL_KIT_SLUGS = [
 ]
 
 REDDIT_SEARCH_URL = "https://www.reddit.com/search.json"
+REDDIT_MAX_LIMIT = 100  # largest page the search API returns
+REDDIT_PLAN_BATCH = 6  # kit names OR-ed into one planned search
+REDDIT_PLAN_PAGES = 2  # result pages fetched per planned search
+
+# Reddit search time windows, smallest first, with their length in seconds
+REDDIT_TIME_FILTERS = [
+    ("hour", 3600),
+    ("day", 86400),
+    ("week", 7 * 86400),
+    ("month", 31 * 86400),
+    ("year", 366 * 86400),
+]
 REDDIT_SUBREDDITS = ["Montessori", "beyondthebump", "Parenting", "NewParents"]
 
 HEADERS = {
@@ -59,7 +115,17 @@ HEADERS = {
     ),
 }
 
-REQUEST_DELAY = 2.0  # seconds between requests
+REQUEST_DELAY = 2.0  # seconds between requests to the same host
+REDDIT_CACHE_TTL_HOURS = 24 * 7  # persisted comment trees older than this are refetched
+DEFAULT_CONCURRENCY = 2  # kits in flight per source
+
+ALL_SOURCES = ["reddit", "amazon", "xiaohongshu"]
+
+XHS_STATE_MARKER = "window.__INITIAL_STATE__="
+# A JSON string literal or a bare `undefined`; matching strings as whole
+# tokens keeps an "undefined" inside user text (titles, descriptions) intact
+XHS_UNDEFINED_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\bundefined\b')
+XHS_MAX_NOTES = 40
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -72,6 +138,127 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+
+# One limiter per source host; see configure_rate_limits()
+RATE_LIMITERS: dict[str, RateLimiter] = {
+    source: RateLimiter(REQUEST_DELAY) for source in ALL_SOURCES
+}
+
+
+def configure_rate_limits(delay: float) -> None:
+    """Set the minimum interval between requests to each host."""
+    for limiter in RATE_LIMITERS.values():
+        limiter.interval = delay
+
+
+def rate_limit(source: str) -> None:
+    """Wait for the rate limiter of *source*'s host."""
+    RATE_LIMITERS[source].wait()
+
+
+# ---------------------------------------------------------------------------
+# Reddit thread cache
+# ---------------------------------------------------------------------------
+
+
+class RedditCache:
+    """Run-wide cache of Reddit comment trees, keyed by permalink.
+
+    A cached comment tree is reused while the post's ``num_comments`` is
+    unchanged and the entry is younger than *ttl* seconds.  Concurrent
+    requests for the same thread wait for a single fetch.  The cache can be
+    loaded from and saved to a JSON file to carry over between runs.
+    """
+
+    def __init__(self, ttl: float = REDDIT_CACHE_TTL_HOURS * 3600) -> None:
+        self.ttl = ttl
+        self.comments: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+
+    def get_comments(
+        self, permalink: str, num_comments: int, fetch: Any
+    ) -> list[str]:
+        """Return cached comments for *permalink*, calling *fetch()* on a miss."""
+        with self._lock:
+            entry = self.comments.get(permalink)
+            if (
+                entry
+                and entry["num_comments"] == num_comments
+                and time.time() - entry["fetched_at"] < self.ttl
+            ):
+                self.hits += 1
+                return entry["comments"]
+            future = self._inflight.get(permalink)
+            if future is not None:
+                self.hits += 1
+                owner = False
+            else:
+                future = self._inflight[permalink] = Future()
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            comments = fetch()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(permalink, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            # An empty list usually means the fetch failed; retry next time
+            if comments:
+                self.comments[permalink] = {
+                    "num_comments": num_comments,
+                    "fetched_at": time.time(),
+                    "comments": comments,
+                }
+            self._inflight.pop(permalink, None)
+        future.set_result(comments)
+        return comments
+
+    def load(self, path: Path) -> None:
+        """Load a persisted cache, ignoring a missing or unreadable file."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as exc:
+            log.warning("Ignoring unreadable Reddit cache %s: %s", path, exc)
+            return
+        self.comments.update(data.get("comments", {}))
+        log.info("Loaded Reddit cache: %d threads from %s", len(self.comments), path)
+
+    def save(self, path: Path) -> None:
+        """Persist the cache, dropping comment trees past their TTL."""
+        now = time.time()
+        with self._lock:
+            data = {
+                "comments": {
+                    k: v for k, v in self.comments.items()
+                    if now - v["fetched_at"] < self.ttl
+                },
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp.replace(path)
+
+
+REDDIT_CACHE = RedditCache()
+
+
 # ---------------------------------------------------------------------------
 # Reddit scraper
 # ---------------------------------------------------------------------------
@@ -82,28 +269,52 @@ def search_reddit(
     session: requests.Session,
     subreddit: str | None = None,
     limit: int = 25,
+    sort: str = "relevance",
+    time_filter: str = "all",
 ) -> list[dict[str, Any]]:
     """Search Reddit for posts matching *query* and return simplified results."""
+    return search_reddit_page(
+        query, session, subreddit, limit, sort=sort, time_filter=time_filter
+    )[0]
+
+
+def search_reddit_page(
+    query: str,
+    session: requests.Session,
+    subreddit: str | None = None,
+    limit: int = 25,
+    after: str | None = None,
+    sort: str = "relevance",
+    time_filter: str = "all",
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Fetch one page of Reddit search results.
+
+    Returns the simplified posts and the ``after`` cursor for the next page
+    (None when there are no more results or the request failed).
+    """
     params: dict[str, Any] = {
         "q": query,
         "limit": limit,
-        "sort": "relevance",
-        "t": "all",
+        "sort": sort,
+        "t": time_filter,
         "type": "link",
     }
+    if after:
+        params["after"] = after
     if subreddit:
         url = f"https://www.reddit.com/r/{subreddit}/search.json"
         params["restrict_sr"] = "on"
     else:
         url = REDDIT_SEARCH_URL
 
+    rate_limit("reddit")
     try:
         resp = session.get(url, params=params, headers=HEADERS, timeout=20)
         resp.raise_for_status()
         data = resp.json()
     except (requests.RequestException, json.JSONDecodeError) as exc:
         log.error("Reddit search failed for '%s': %s", query, exc)
-        return []
+        return [], None
 
     posts: list[dict[str, Any]] = []
     for child in data.get("data", {}).get("children", []):
@@ -119,7 +330,107 @@ def search_reddit(
                 "created_utc": post.get("created_utc", 0),
             }
         )
-    return posts
+    return posts, data.get("data", {}).get("after")
+
+
+def reddit_time_filter(since: float) -> str:
+    """Return the smallest Reddit search window (``t=``) reaching back to *since*."""
+    if since <= 0:
+        return "all"
+    age = time.time() - since
+    for name, seconds in REDDIT_TIME_FILTERS:
+        if age < seconds:
+            return name
+    return "all"
+
+
+# ---------------------------------------------------------------------------
+# Reddit query planner
+# ---------------------------------------------------------------------------
+
+
+def kit_term(slug: str) -> str:
+    """Return the search term for a kit slug ("free-spirit" -> '"free spirit"')."""
+    words = slug.split("-")
+    return f'"{" ".join(words)}"' if len(words) > 1 else slug
+
+
+def kit_mention_pattern(slug: str) -> re.Pattern[str]:
+    """Match a kit name in free text: word-bounded, any separator, optional plural."""
+    words = [re.escape(w) for w in slug.split("-")]
+    return re.compile(r"\b" + r"[\s_-]?".join(words) + r"s?\b", re.IGNORECASE)
+
+
+def plan_reddit_queries(
+    slugs: list[str], batch_size: int = REDDIT_PLAN_BATCH
+) -> list[tuple[str, list[str]]]:
+    """Group kits into OR-combined search queries.
+
+    Returns ``(query, slugs)`` pairs.  "Lovevery (a OR b)" matches a superset
+    of the old "Lovevery a review" / "Lovevery a worth it" style queries.
+    """
+    plan: list[tuple[str, list[str]]] = []
+    for i in range(0, len(slugs), batch_size):
+        batch = slugs[i:i + batch_size]
+        terms = " OR ".join(kit_term(s) for s in batch)
+        plan.append((f"Lovevery ({terms})", batch))
+    return plan
+
+
+def route_posts_to_kits(
+    posts: list[dict[str, Any]], slugs: list[str]
+) -> dict[str, list[dict[str, Any]]]:
+    """Assign each post to every kit whose name its title or body mentions."""
+    patterns = {slug: kit_mention_pattern(slug) for slug in slugs}
+    routed: dict[str, list[dict[str, Any]]] = {slug: [] for slug in slugs}
+    for post in posts:
+        text = f"{post['title']}\n{post['selftext']}"
+        for slug, pattern in patterns.items():
+            if pattern.search(text):
+                routed[slug].append(post)
+    return routed
+
+
+def search_reddit_planned(
+    slugs: list[str],
+    session: requests.Session,
+    batch_size: int = REDDIT_PLAN_BATCH,
+    pages: int = REDDIT_PLAN_PAGES,
+    since: dict[str, float] | None = None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Run the planned searches for *slugs* and route the posts back per kit.
+
+    *since* maps kits to a ``created_utc`` watermark: batches whose kits all
+    have one are searched newest-first within the matching time window and
+    stop paging once results fall behind it, and each kit only receives
+    posts newer than its own watermark.
+    """
+    since = since or {}
+    seen: dict[str, dict[str, Any]] = {}
+    requests_made = 0
+    for query, batch in plan_reddit_queries(slugs, batch_size):
+        oldest = min(since.get(s, 0) for s in batch)
+        sort = "new" if oldest else "relevance"
+        after: str | None = None
+        for _ in range(pages):
+            posts, after = search_reddit_page(
+                query, session, limit=REDDIT_MAX_LIMIT, after=after,
+                sort=sort, time_filter=reddit_time_filter(oldest),
+            )
+            requests_made += 1
+            for post in posts:
+                seen.setdefault(post["url"], post)
+            if not after or (oldest and posts and posts[-1]["created_utc"] <= oldest):
+                break
+
+    routed = route_posts_to_kits(list(seen.values()), slugs)
+    for slug, posts in routed.items():
+        routed[slug] = [p for p in posts if p["created_utc"] > since.get(slug, 0)]
+    log.info(
+        "  Reddit planner: %d searches for %d kits (was %d), %d unique posts",
+        requests_made, len(slugs), 3 * len(slugs), len(seen),
+    )
+    return routed
 
 
 def fetch_reddit_comments(
@@ -127,6 +438,7 @@ def fetch_reddit_comments(
 ) -> list[str]:
     """Fetch top-level comments from a Reddit post."""
     url = f"https://www.reddit.com{permalink}.json"
+    rate_limit("reddit")
     try:
         resp = session.get(
             url, params={"limit": limit}, headers=HEADERS, timeout=20
@@ -147,33 +459,54 @@ def fetch_reddit_comments(
 
 
 def scrape_reddit_reviews(
-    kit_slug: str, session: requests.Session
+    kit_slug: str,
+    session: requests.Session,
+    posts: list[dict[str, Any]] | None = None,
+    since: float = 0,
 ) -> list[dict[str, Any]]:
-    """Collect Reddit posts and comments about a Lovevery kit."""
-    queries = [
-        f"Lovevery {kit_slug} play kit",
-        f"Lovevery {kit_slug} review",
-        f"Lovevery play kit {kit_slug} worth it",
-    ]
-    all_posts: list[dict[str, Any]] = []
-    seen_urls: set[str] = set()
+    """Collect Reddit posts and comments about a Lovevery kit.
 
-    for query in queries:
-        posts = search_reddit(query, session)
-        for post in posts:
-            if post["url"] not in seen_urls:
-                seen_urls.add(post["url"])
-                all_posts.append(post)
-        time.sleep(REQUEST_DELAY)
+    *posts* are search results already routed to this kit by the query
+    planner; when omitted, the kit is searched on its own.  Only posts
+    created after the *since* watermark are kept.
+    """
+    if posts is None:
+        queries = [
+            f"Lovevery {kit_slug} play kit",
+            f"Lovevery {kit_slug} review",
+            f"Lovevery play kit {kit_slug} worth it",
+        ]
+        posts = [
+            p
+            for query in queries
+            for p in search_reddit(
+                query, session,
+                sort="new" if since else "relevance",
+                time_filter=reddit_time_filter(since),
+            )
+        ]
+    posts = [p for p in posts if p["created_utc"] > since]
 
-    # Fetch comments for top posts (by score)
+    all_posts: list[dict[str, Any]] = []
+    seen_urls: set[str] = set()
+    for post in posts:
+        if post["url"] not in seen_urls:
+            seen_urls.add(post["url"])
+            # Copy: planned results are shared between kits
+            post = dict(post)
+            all_posts.append(post)
+
+    # Fetch comments for top posts (by score); threads shared with other
+    # kits come from the run-wide cache
     all_posts.sort(key=lambda p: p["score"], reverse=True)
     for post in all_posts[:5]:
         permalink = post["url"].replace("https://reddit.com", "")
         if permalink:
-            comments = fetch_reddit_comments(permalink, session)
-            post["comments"] = comments
-            time.sleep(REQUEST_DELAY)
+            post["comments"] = REDDIT_CACHE.get_comments(
+                permalink,
+                post["num_comments"],
+                lambda: fetch_reddit_comments(permalink, session),
+            )
 
     log.info("  Reddit: %d posts collected for '%s'", len(all_posts), kit_slug)
     return all_posts
@@ -197,6 +530,7 @@ def scrape_amazon_reviews(
     search_url = "https://www.amazon.com/s"
     params = {"k": f"Lovevery {kit_slug} play kit", "i": "toys-and-games"}
 
+    rate_limit("amazon")
     try:
         resp = session.get(
             search_url, params=params, headers=HEADERS, timeout=20
@@ -285,6 +619,7 @@ def scrape_xiaohongshu_reviews(
     if cookie:
         headers["Cookie"] = cookie
 
+    rate_limit("xiaohongshu")
     try:
         resp = session.get(search_url, headers=headers, timeout=20)
         if resp.status_code != 200:
@@ -298,19 +633,105 @@ def scrape_xiaohongshu_reviews(
         log.error("  Xiaohongshu search failed for '%s': %s", kit_slug, exc)
         return []
 
-    soup = BeautifulSoup(resp.text, "lxml")
+    results, parser = parse_xhs_search_page(resp.text)
+    log.info("  Xiaohongshu: %d notes for '%s' (%s)", len(results), kit_slug, parser)
+    return results
+
+
+def extract_initial_state(html: str) -> dict[str, Any] | None:
+    """Return the page's ``window.__INITIAL_STATE__`` object, or None.
+
+    The blob is sliced straight out of the HTML, from the marker to the end
+    of its <script>, and parsed with json.loads; no DOM is built.  The only
+    non-JSON in it is JavaScript's ``undefined`` as a value, which becomes
+    null.
+    """
+    start = html.find(XHS_STATE_MARKER)
+    if start < 0:
+        return None
+    start += len(XHS_STATE_MARKER)
+    end = html.find("</script>", start)
+    blob = html[start:end if end >= 0 else len(html)].strip().rstrip(";")
+    blob = XHS_UNDEFINED_RE.sub(
+        lambda m: m.group() if m.group().startswith('"') else "null", blob
+    )
+    try:
+        state = json.loads(blob)
+    except json.JSONDecodeError as exc:
+        log.warning("  Xiaohongshu initial state is not valid JSON: %s", exc)
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def _unref(value: Any) -> Any:
+    """Unwrap a serialised Vue ref (``{"_value": ...}``) if *value* is one."""
+    if isinstance(value, dict):
+        for key in ("_value", "_rawValue", "value"):
+            if key in value:
+                return value[key]
+    return value
+
+
+def parse_xhs_count(value: Any) -> int:
+    """Parse an interaction count such as ``"356"``, ``"1.2万"`` or ``"10+"``."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value or "").strip().rstrip("+").lower()
+    multiplier = 1
+    for suffix, factor in (("万", 10_000), ("w", 10_000), ("千", 1_000), ("k", 1_000)):
+        if text.endswith(suffix):
+            text, multiplier = text[: -len(suffix)], factor
+            break
+    try:
+        return int(float(text) * multiplier)
+    except ValueError:
+        return 0
+
+
+def notes_from_state(state: dict[str, Any]) -> list[dict[str, Any]]:
+    """Turn the search feed of an initial-state object into note records."""
+    feeds = _unref((state.get("search") or {}).get("feeds")) or []
+    notes: list[dict[str, Any]] = []
+    for item in feeds:
+        if not isinstance(item, dict) or item.get("modelType", "note") != "note":
+            continue  # recommended queries, ads, user cards
+        card = item.get("noteCard") or item.get("note_card") or {}
+        note_id = item.get("id") or card.get("noteId")
+        if not note_id:
+            continue
+        title = card.get("displayTitle") or card.get("title") or ""
+        description = card.get("desc") or item.get("desc") or ""
+        if not (title or description):
+            continue
+        interact = card.get("interactInfo") or card.get("interact_info") or {}
+        notes.append(
+            {
+                "title": title,
+                "description": description,
+                "likes": parse_xhs_count(interact.get("likedCount") or interact.get("liked_count")),
+                "url": f"https://www.xiaohongshu.com/explore/{note_id}",
+            }
+        )
+    return notes[:XHS_MAX_NOTES]
+
+
+def notes_from_cards(html: str) -> list[dict[str, Any]]:
+    """Fallback: scrape note cards from server-rendered search markup."""
+    soup = BeautifulSoup(html, "lxml")
     results: list[dict[str, Any]] = []
 
     # Extract note cards from search results
-    for card in soup.select("[class*='note-item']")[:10]:
+    for card in soup.select("[class*='note-item']")[:XHS_MAX_NOTES]:
         title_el = card.select_one("[class*='title']")
         desc_el = card.select_one("[class*='desc']")
+        likes_el = card.select_one("[class*='count']")
         link_el = card.select_one("a")
 
         results.append(
             {
                 "title": title_el.get_text(strip=True) if title_el else "",
                 "description": desc_el.get_text(strip=True) if desc_el else "",
+                "likes": parse_xhs_count(likes_el.get_text(strip=True) if likes_el else 0),
                 "url": (
                     f"https://www.xiaohongshu.com{link_el['href']}"
                     if link_el and link_el.get("href")
@@ -318,22 +739,401 @@ def scrape_xiaohongshu_reviews(
                 ),
             }
         )
-
-    log.info("  Xiaohongshu: %d notes for '%s'", len(results), kit_slug)
     return results
 
 
+def parse_xhs_search_page(html: str) -> tuple[list[dict[str, Any]], str]:
+    """Extract notes from a search page; returns (notes, parser used).
+
+    The embedded initial state is used whenever present, since the note
+    cards are rendered client-side from it; CSS selectors over a parsed DOM
+    are only tried when the page has no state blob.
+    """
+    state = extract_initial_state(html)
+    if state is not None:
+        return notes_from_state(state), "initial state"
+    return notes_from_cards(html), "selectors"
+
+
+# ---------------------------------------------------------------------------
+# Concurrent collection
+# ---------------------------------------------------------------------------
+
+
+def collect_reviews(
+    slugs: list[str],
+    sources: list[str],
+    xhs_cookie: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    plan_reddit: bool = True,
+    reddit_since: dict[str, float] | None = None,
+    on_kit: Callable[[dict[str, Any]], None] | None = None,
+) -> list[dict[str, Any]]:
+    """Collect reviews for every (kit, source) pair concurrently.
+
+    Each source gets its own session and *concurrency* worker threads; the
+    per-host rate limiters keep request spacing polite no matter how many
+    workers are waiting.  With *plan_reddit*, Reddit is searched once for
+    all kits up front (see search_reddit_planned).  *reddit_since* holds
+    per-kit ``created_utc`` watermarks for incremental runs.  Results are
+    returned in *slugs* order; with *on_kit*, each kit is instead handed to
+    the callback as soon as all of its sources finish, and not retained.
+    """
+    reddit_since = reddit_since or {}
+    results: dict[str, dict[str, Any]] = {slug: {"kit_slug": slug} for slug in slugs}
+    sessions = {source: requests.Session() for source in sources}
+    reddit_plan: Future | None = None
+
+    def reddit_posts(slug: str) -> list[dict[str, Any]] | None:
+        return reddit_plan.result().get(slug, []) if reddit_plan else None
+
+    scrapers = {
+        "reddit": lambda slug: scrape_reddit_reviews(
+            slug, sessions["reddit"], reddit_posts(slug), reddit_since.get(slug, 0)
+        ),
+        "amazon": lambda slug: scrape_amazon_reviews(slug, sessions["amazon"]),
+        "xiaohongshu": lambda slug: scrape_xiaohongshu_reviews(
+            slug, sessions["xiaohongshu"], xhs_cookie
+        ),
+    }
+
+    pools = {
+        source: ThreadPoolExecutor(
+            max_workers=max(1, concurrency), thread_name_prefix=source
+        )
+        for source in sources
+    }
+    try:
+        if plan_reddit and "reddit" in sources:
+            # Submitted first, so it runs before the per-kit tasks that wait on it
+            reddit_plan = pools["reddit"].submit(
+                search_reddit_planned, slugs, sessions["reddit"], since=reddit_since
+            )
+        futures = {
+            (slug, source): pools[source].submit(scrapers[source], slug)
+            for slug in slugs
+            for source in sources
+        }
+        done_kits = 0
+        for slug in slugs:
+            for source in sources:
+                try:
+                    results[slug][source] = futures[(slug, source)].result()
+                except Exception as exc:
+                    log.error("  %s collection failed for '%s': %s", source, slug, exc)
+                    results[slug][source] = []
+            done_kits += 1
+            log.info("Collected reviews for kit: %s (%d/%d)", slug, done_kits, len(slugs))
+            if on_kit:
+                on_kit(results.pop(slug))
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True)
+
+    return [results[slug] for slug in slugs if slug in results]
+
+
+# ---------------------------------------------------------------------------
+# Incremental state
+# ---------------------------------------------------------------------------
+
+
+def default_state_path(output: Path) -> Path:
+    """Return the state file kept next to an output file."""
+    return output.with_name(output.stem + ".state.json")
+
+
+def load_json_file(path: Path, default: Any) -> Any:
+    """Load JSON from *path*, returning *default* if it does not exist."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON to *path* via a temporary file, so readers never see half of it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def item_key(item: dict[str, Any]) -> str:
+    """Identify a collected item (post, product or note) across runs."""
+    return item.get("url") or item.get("title", "")
+
+
+def merge_kit_reviews(
+    stored: dict[str, Any] | None, fresh: dict[str, Any], sources: list[str]
+) -> dict[str, Any]:
+    """Merge freshly collected items for one kit into its stored corpus.
+
+    Items are matched by URL; fresh items come first and replace stored
+    copies of the same item.  Sources not collected this run are kept as is.
+    """
+    merged = dict(stored or {"kit_slug": fresh["kit_slug"]})
+    for source in sources:
+        new_items = fresh.get(source, [])
+        new_keys = {item_key(i) for i in new_items}
+        merged[source] = new_items + [
+            i for i in merged.get(source, []) if item_key(i) not in new_keys
+        ]
+    return merged
+
+
+def corpus_hash(kit_reviews: dict[str, Any]) -> str:
+    """Hash a kit's collected review items (everything except its summary)."""
+    corpus = {k: v for k, v in kit_reviews.items() if k != "summary"}
+    blob = json.dumps(corpus, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def update_watermarks(
+    state: dict[str, Any], kit_reviews: dict[str, Any], sources: list[str]
+) -> None:
+    """Record the newest ``created_utc`` and newest item seen per (kit, source)."""
+    kit_marks = state.setdefault("watermarks", {}).setdefault(kit_reviews["kit_slug"], {})
+    for source in sources:
+        items = kit_reviews.get(source, [])
+        newest = max(items, key=lambda i: i.get("created_utc", 0), default=None)
+        kit_marks[source] = {
+            "created_utc": newest.get("created_utc", 0) if newest else 0,
+            "latest_id": item_key(newest) if newest else "",
+            "updated_at": time.time(),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate elimination (MinHash + LSH)
+# ---------------------------------------------------------------------------
+
+SHINGLE_SIZE = 5  # characters; works for both English and Chinese text
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+DUPLICATE_THRESHOLD = 0.7  # estimated Jaccard at which excerpts count as duplicates
+EXCERPT_CHARS = 500
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MINHASH_PARAMS = [
+    (
+        zlib.crc32(f"a{i}".encode()) * 2654435761 % _MERSENNE_PRIME | 1,
+        zlib.crc32(f"b{i}".encode()) * 2246822519 % _MERSENNE_PRIME,
+    )
+    for i in range(MINHASH_PERMUTATIONS)
+]
+
+
+def collect_review_excerpts(raw_reviews: dict[str, Any]) -> list[dict[str, Any]]:
+    """Gather review texts with the Reddit score of the post they belong to.
+
+    Comments carry no score of their own in the stored data, so they
+    inherit their post's.
+    """
+    excerpts: list[dict[str, Any]] = []
+    for source, items in raw_reviews.items():
+        if source == "kit_slug" or not isinstance(items, list):
+            continue
+        for item in items:
+            if isinstance(item, dict):
+                # Reddit score, or Xiaohongshu likes
+                score = item.get("score") or item.get("likes") or 0
+                text = item.get("selftext") or item.get("description") or item.get("title", "")
+                if text:
+                    excerpts.append({"text": text[:EXCERPT_CHARS], "score": score})
+                for comment in item.get("comments", []):
+                    excerpts.append({"text": comment[:EXCERPT_CHARS], "score": score})
+    return excerpts
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """Return hashed character shingles of normalised text.
+
+    Text is NFKC-folded, lowercased and stripped of punctuation so that
+    quoted or re-punctuated copies shingle identically.
+    """
+    folded = unicodedata.normalize("NFKC", text).lower()
+    folded = "".join(
+        " " if unicodedata.category(ch)[0] in "PS" else ch for ch in folded
+    )
+    norm = " ".join(folded.split())
+    if len(norm) <= size:
+        return {zlib.crc32(norm.encode("utf-8"))}
+    return {
+        zlib.crc32(norm[i:i + size].encode("utf-8"))
+        for i in range(len(norm) - size + 1)
+    }
+
+
+def minhash_signature(shingle_set: set[int]) -> list[int]:
+    """Compute a MinHash signature with universal hashing (a*x + b mod p)."""
+    return [
+        min((a * x + b) % _MERSENNE_PRIME for x in shingle_set)
+        for a, b in _MINHASH_PARAMS
+    ]
+
+
+def dedupe_excerpts(
+    excerpts: list[dict[str, Any]],
+    threshold: float = DUPLICATE_THRESHOLD,
+    bands: int = LSH_BANDS,
+) -> list[dict[str, Any]]:
+    """Keep one representative per near-duplicate cluster, highest score first.
+
+    Signatures are split into *bands*; excerpts sharing any band bucket are
+    candidates, and a candidate is dropped when its estimated Jaccard
+    similarity to an already kept excerpt reaches *threshold*.  The result
+    is ordered by descending score.
+    """
+    rows = MINHASH_PERMUTATIONS // bands
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    kept: list[tuple[dict[str, Any], list[int]]] = []
+
+    # Stable sort: equal scores keep their source order
+    for excerpt in sorted(excerpts, key=lambda e: -e["score"]):
+        sig = minhash_signature(shingles(excerpt["text"]))
+        keys = [(b, tuple(sig[b * rows:(b + 1) * rows])) for b in range(bands)]
+        candidates = {i for key in keys for i in buckets.get(key, [])}
+        if any(
+            sum(x == y for x, y in zip(sig, kept[i][1])) / len(sig) >= threshold
+            for i in candidates
+        ):
+            continue
+        for key in keys:
+            buckets.setdefault(key, []).append(len(kept))
+        kept.append((excerpt, sig))
+
+    return [excerpt for excerpt, _ in kept]
+
+
 # ---------------------------------------------------------------------------
 # LLM Summarisation
 # ---------------------------------------------------------------------------
 
 
+SUMMARY_MODEL = "gpt-4.1-mini"
+CHUNK_TOKEN_BUDGET = 3000  # prompt tokens of review text per map call
+DEFAULT_LLM_CONCURRENCY = 4  # map calls in flight per kit
+LLM_TIMEOUT = 60.0  # seconds per LLM request before giving up
+SUMMARY_BACKENDS = ["auto", "llm", "local"]
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You are a helpful assistant that summarises product reviews. "
+    "Always respond with valid JSON only."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheaply estimate the token count of *text*.
+
+    CJK characters are roughly one token each; everything else averages
+    about four characters per token.  Good enough for budgeting chunks
+    without pulling in a tokenizer.
+    """
+    wide = sum(1 for ch in text if unicodedata.east_asian_width(ch) in "WF")
+    return wide + (len(text) - wide + 3) // 4
+
+
+def pack_chunks(texts: list[str], budget: int = CHUNK_TOKEN_BUDGET) -> list[list[str]]:
+    """Greedily pack *texts*, in order, into chunks of at most *budget* tokens.
+
+    A single text larger than the budget gets a chunk of its own.
+    """
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    used = 0
+    for text in texts:
+        cost = estimate_tokens(text) + 2  # separator
+        if current and used + cost > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _complete_json(client: Any, prompt: str, max_tokens: int) -> dict[str, Any] | None:
+    """Run one chat completion and parse the first JSON object in the reply."""
+    response = client.chat.completions.create(
+        model=SUMMARY_MODEL,
+        messages=[
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.3,
+        max_tokens=max_tokens,
+    )
+    content = response.choices[0].message.content or ""
+    # Extract JSON from response
+    json_match = re.search(r"\{[^{}]+\}", content, re.DOTALL)
+    if json_match:
+        return json.loads(json_match.group())
+    return None
+
+
+def summarise_chunk(client: Any, kit_slug: str, texts: list[str]) -> dict[str, Any] | None:
+    """Map step: extract English pros/cons lists from one chunk of excerpts."""
+    combined = "\n---\n".join(texts)
+    prompt = f"""Based on the following parent reviews about the Lovevery "{kit_slug}" Play Kit,
+list the distinct pros and cons parents mention. Keep each point short.
+
+Format your response as JSON:
+{{
+  "pros": ["point", "..."],
+  "cons": ["point", "..."]
+}}
+
+Reviews:
+{combined}"""
+    return _complete_json(client, prompt, max_tokens=400)
+
+
+def reduce_summaries(
+    client: Any, kit_slug: str, partials: list[tuple[int, dict[str, Any]]]
+) -> dict[str, str] | None:
+    """Reduce step: merge per-chunk pros/cons into the bilingual summary shape."""
+    sections = []
+    for i, (count, partial) in enumerate(partials, 1):
+        pros = "\n".join(f"  + {p}" for p in partial.get("pros", []))
+        cons = "\n".join(f"  - {c}" for c in partial.get("cons", []))
+        sections.append(f"Batch {i} ({count} reviews):\n{pros}\n{cons}")
+    combined = "\n\n".join(sections)
+
+    prompt = f"""The following are pros (+) and cons (-) extracted from batches of parent reviews
+about the Lovevery "{kit_slug}" Play Kit. Merge them into one summary, weighting points
+that recur across batches. Provide the summary in both Chinese and English.
+
+Format your response as JSON:
+{{
+  "pros_cn": "优点摘要（中文）",
+  "pros_en": "Pros summary (English)",
+  "cons_cn": "缺点摘要（中文）",
+  "cons_en": "Cons summary (English)"
+}}
+
+{combined}"""
+    return _complete_json(client, prompt, max_tokens=500)
+
+
 def summarise_reviews_with_llm(
-    kit_slug: str, raw_reviews: dict[str, Any]
+    kit_slug: str,
+    raw_reviews: dict[str, Any],
+    token_budget: int = CHUNK_TOKEN_BUDGET,
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    timeout: float = LLM_TIMEOUT,
 ) -> dict[str, str] | None:
     """
     Use an OpenAI-compatible LLM to summarise raw reviews into pros and cons.
 
+    All deduplicated excerpts are packed into chunks of *token_budget* tokens.
+    A single chunk is summarised directly; otherwise chunks are summarised
+    concurrently (map) and the partial results merged by one final call
+    (reduce), so wall-clock time stays near two LLM round trips.
+
     Returns a dict with keys: pros_cn, pros_en, cons_cn, cons_en
     """
     try:
@@ -347,28 +1147,27 @@ def summarise_reviews_with_llm(
         log.error("OPENAI_API_KEY not set. Cannot summarise reviews.")
         return None
 
-    client = OpenAI()
+    client = OpenAI(timeout=timeout, max_retries=1)
 
-    # Collect all review text
-    review_texts: list[str] = []
-    for source, items in raw_reviews.items():
-        if source == "kit_slug":
-            continue
-        for item in items:
-            if isinstance(item, dict):
-                text = item.get("selftext") or item.get("description") or item.get("title", "")
-                if text:
-                    review_texts.append(text[:500])
-                for comment in item.get("comments", []):
-                    review_texts.append(comment[:500])
+    # Collect all review text, dropping cross-posts and quoted duplicates
+    excerpts = collect_review_excerpts(raw_reviews)
+    unique = dedupe_excerpts(excerpts)
+    review_texts = [e["text"] for e in unique]
 
     if not review_texts:
         log.warning("  No review text to summarise for '%s'", kit_slug)
         return None
 
-    combined = "\n---\n".join(review_texts[:30])  # Limit to 30 excerpts
+    chunks = pack_chunks(review_texts, token_budget)
+    log.info(
+        "  Dedup: %d excerpts -> %d unique in %d chunk(s) for '%s'",
+        len(excerpts), len(unique), len(chunks), kit_slug,
+    )
 
-    prompt = f"""Based on the following parent reviews about the Lovevery "{kit_slug}" Play Kit,
+    try:
+        if len(chunks) == 1:
+            combined = "\n---\n".join(chunks[0])
+            prompt = f"""Based on the following parent reviews about the Lovevery "{kit_slug}" Play Kit,
 summarise the key pros and cons. Provide the summary in both Chinese and English.
 
 Format your response as JSON:
@@ -381,33 +1180,93 @@ Format your response as JSON:
 
 Reviews:
 {combined}"""
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that summarises product reviews. "
-                    "Always respond with valid JSON only.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            max_tokens=500,
-        )
-        content = response.choices[0].message.content or ""
-        # Extract JSON from response
-        json_match = re.search(r"\{[^{}]+\}", content, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group())
+            summary = _complete_json(client, prompt, max_tokens=500)
         else:
-            log.warning("  LLM response did not contain valid JSON for '%s'", kit_slug)
-            return None
+            workers = max(1, min(llm_concurrency, len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as pool:
+                futures = [
+                    (len(chunk), pool.submit(summarise_chunk, client, kit_slug, chunk))
+                    for chunk in chunks
+                ]
+                partials: list[tuple[int, dict[str, Any]]] = []
+                for count, future in futures:
+                    try:
+                        partial = future.result()
+                    except Exception as exc:
+                        log.warning("  Chunk summary failed for '%s': %s", kit_slug, exc)
+                        continue
+                    if partial:
+                        partials.append((count, partial))
+            if not partials:
+                log.warning("  No chunk summaries succeeded for '%s'", kit_slug)
+                return None
+            if len(partials) < len(chunks):
+                log.warning(
+                    "  Reducing %d of %d chunk summaries for '%s'",
+                    len(partials), len(chunks), kit_slug,
+                )
+            summary = reduce_summaries(client, kit_slug, partials)
     except Exception as exc:
         log.error("  LLM summarisation failed for '%s': %s", kit_slug, exc)
         return None
 
+    if summary is None:
+        log.warning("  LLM response did not contain valid JSON for '%s'", kit_slug)
+    return summary
+
+
+def summarise_reviews_locally(kit_slug: str, raw_reviews: dict[str, Any]) -> dict[str, str] | None:
+    """Summarise reviews offline with extractive_summary.py (TextRank + lexicon).
+
+    Returns the same shape as summarise_reviews_with_llm, or None if numpy
+    is missing or there is no usable review text.
+    """
+    try:
+        from extractive_summary import summarise_excerpts
+    except ImportError:
+        log.error("numpy not installed. Run: pip install numpy")
+        return None
+
+    unique = dedupe_excerpts(collect_review_excerpts(raw_reviews))
+    start = time.perf_counter()
+    summary = summarise_excerpts(unique)
+    if summary is None:
+        log.warning("  No review text to summarise for '%s'", kit_slug)
+    else:
+        log.info(
+            "  Local summary of %d excerpts for '%s' in %.0f ms",
+            len(unique), kit_slug, (time.perf_counter() - start) * 1000,
+        )
+    return summary
+
+
+def llm_available() -> bool:
+    """Whether the openai package and an API key are both present."""
+    return bool(os.environ.get("OPENAI_API_KEY")) and importlib.util.find_spec("openai") is not None
+
+
+def summarise_reviews(
+    kit_slug: str,
+    raw_reviews: dict[str, Any],
+    backend: str = "auto",
+    token_budget: int = CHUNK_TOKEN_BUDGET,
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    timeout: float = LLM_TIMEOUT,
+) -> tuple[dict[str, str] | None, str]:
+    """Summarise with *backend*; returns (summary, backend that produced it).
+
+    "auto" tries the LLM and falls back to the local summariser when the
+    LLM returns nothing (error, timeout or unparseable reply).
+    """
+    if backend in ("auto", "llm"):
+        summary = summarise_reviews_with_llm(
+            kit_slug, raw_reviews, token_budget, llm_concurrency, timeout
+        )
+        if summary or backend == "llm":
+            return summary, "llm"
+        log.info("  Falling back to the local summary for '%s'", kit_slug)
+    return summarise_reviews_locally(kit_slug, raw_reviews), "local"
+
 
 # ---------------------------------------------------------------------------
 # Main
@@ -424,9 +1283,12 @@ Examples:
   %(prog)s --kit looker charmer                    # Specific kits
   %(prog)s --source reddit                         # Reddit only
   %(prog)s --source reddit amazon                  # Reddit + Amazon
-  %(prog)s --summarise                             # Also generate LLM summaries
+  %(prog)s --summarise                             # Also generate summaries
+  %(prog)s --summarise --summary-backend local     # Offline extractive summaries
   %(prog)s --xhs-cookie "cookie_string_here"       # Xiaohongshu with auth
   %(prog)s -o output/reviews.json --delay 3.0      # Custom output & delay
+  %(prog)s --concurrency 1                         # One kit at a time per source
+  %(prog)s --stream --summarise                    # Stream kits to disk as they finish
         """,
     )
     parser.add_argument(
@@ -438,8 +1300,8 @@ Examples:
     parser.add_argument(
         "--source",
         nargs="+",
-        choices=["reddit", "amazon", "xiaohongshu"],
-        default=["reddit", "amazon", "xiaohongshu"],
+        choices=ALL_SOURCES,
+        default=ALL_SOURCES,
         help="Review sources to scrape (default: all)",
     )
     parser.add_argument(
@@ -452,7 +1314,16 @@ Examples:
     parser.add_argument(
         "--summarise",
         action="store_true",
-        help="Use LLM to summarise reviews into pros/cons (requires OPENAI_API_KEY)",
+        help="Summarise reviews into pros/cons (see --summary-backend)",
+    )
+    parser.add_argument(
+        "--summary-backend",
+        choices=SUMMARY_BACKENDS,
+        default="auto",
+        help="auto: LLM, falling back to the local extractive summariser when "
+        "the LLM is unavailable or fails; llm: LLM only (requires "
+        "OPENAI_API_KEY); local: offline extractive summary (requires numpy) "
+        "(default: auto)",
     )
     parser.add_argument(
         "--xhs-cookie",
@@ -464,7 +1335,73 @@ Examples:
         "--delay",
         type=float,
         default=REQUEST_DELAY,
-        help=f"Delay between requests in seconds (default: {REQUEST_DELAY})",
+        help="Minimum delay between requests to the same host, in seconds "
+        f"(default: {REQUEST_DELAY})",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Kits collected concurrently per source, within each host's "
+        f"rate limit (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Append each kit to <output>.jsonl as it completes and convert it "
+        "to the JSON array at the end; a rerun resumes an interrupted stream",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Merge only content newer than the stored watermarks into the "
+        "existing output file, and re-summarise only kits that changed",
+    )
+    parser.add_argument(
+        "--state",
+        type=str,
+        help="Watermark/summary state file (default: <output>.state.json; "
+        "only kept with --incremental or --state)",
+    )
+    parser.add_argument(
+        "--reddit-search",
+        choices=["planned", "per-kit"],
+        default="planned",
+        help="planned: a few OR-combined searches routed back to kits locally; "
+        "per-kit: three searches per kit (default: planned)",
+    )
+    parser.add_argument(
+        "--reddit-cache",
+        type=str,
+        help="JSON file to persist Reddit threads across runs (default: in-memory only)",
+    )
+    parser.add_argument(
+        "--reddit-cache-ttl",
+        type=float,
+        default=REDDIT_CACHE_TTL_HOURS,
+        help="Hours a cached comment tree stays valid while its comment count "
+        f"is unchanged (default: {REDDIT_CACHE_TTL_HOURS})",
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=CHUNK_TOKEN_BUDGET,
+        help="Token budget of review text per LLM map call "
+        f"(default: {CHUNK_TOKEN_BUDGET})",
+    )
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=DEFAULT_LLM_CONCURRENCY,
+        help="LLM chunk calls in flight per kit when summarising "
+        f"(default: {DEFAULT_LLM_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--llm-timeout",
+        type=float,
+        default=LLM_TIMEOUT,
+        help="Seconds per LLM request before it counts as failed "
+        f"(default: {LLM_TIMEOUT:g})",
     )
     parser.add_argument(
         "--verbose",
@@ -486,41 +1423,141 @@ Examples:
         log.error("Unknown kit slug(s): %s", ", ".join(invalid))
         sys.exit(1)
 
-    session = requests.Session()
-    all_results: list[dict[str, Any]] = []
+    configure_rate_limits(args.delay)
+    sources = [s for s in ALL_SOURCES if s in args.source]
 
-    for i, slug in enumerate(slugs):
-        log.info("Collecting reviews for kit: %s (%d/%d)", slug, i + 1, len(slugs))
-        kit_reviews: dict[str, Any] = {"kit_slug": slug}
+    REDDIT_CACHE.ttl = args.reddit_cache_ttl * 3600
+    if args.reddit_cache:
+        REDDIT_CACHE.load(Path(args.reddit_cache))
 
-        if "reddit" in args.source:
-            kit_reviews["reddit"] = scrape_reddit_reviews(slug, session)
-            time.sleep(args.delay)
-
-        if "amazon" in args.source:
-            kit_reviews["amazon"] = scrape_amazon_reviews(slug, session)
-            time.sleep(args.delay)
+    output_path = Path(args.output)
+    if args.stream and output_path.suffix == ".jsonl":
+        parser.error("--stream writes <output>.jsonl itself; -o must name the JSON array")
+    # Ad-hoc runs leave no state file behind; only runs that may be
+    # continued incrementally keep one
+    state_path: Path | None = None
+    if args.state:
+        state_path = Path(args.state)
+    elif args.incremental:
+        state_path = default_state_path(output_path)
+    state: dict[str, Any] = load_json_file(state_path, {}) if state_path else {}
+    stored: dict[str, dict[str, Any]] = {}
+    reddit_since: dict[str, float] = {}
+    if args.incremental:
+        stored = {k["kit_slug"]: k for k in load_json_file(output_path, [])}
+        marks = state.get("watermarks", {})
+        # A kit with no posts yet was still searched up to its last update
+        reddit_since = {
+            slug: mark["created_utc"] or mark["updated_at"]
+            for slug in slugs
+            if slug in stored
+            for mark in [marks.get(slug, {}).get("reddit")]
+            if mark
+        }
+        log.info(
+            "Incremental run: %d stored kits, %d with Reddit watermarks",
+            len(stored), len(reddit_since),
+        )
 
-        if "xiaohongshu" in args.source:
-            kit_reviews["xiaohongshu"] = scrape_xiaohongshu_reviews(
-                slug, session, args.xhs_cookie
+    stream = stream_path(output_path)
+    stream_file = None
+    streamed: dict[str, int] = {}
+    pending = slugs
+    if args.stream:
+        stream_file, streamed = open_stream(stream, "kit_slug")
+        pending = [s for s in slugs if s not in streamed]
+        if streamed:
+            log.info(
+                "Resuming from %s: %d kits already collected", stream, len(streamed)
             )
-            time.sleep(args.delay)
 
-        if args.summarise:
-            summary = summarise_reviews_with_llm(slug, kit_reviews)
-            if summary:
-                kit_reviews["summary"] = summary
+    summarised = state.setdefault("summaries", {}) if args.summarise else {}
+    skipped = 0
+    backend = args.summary_backend
+    if args.summarise and backend == "auto" and not llm_available():
+        log.info("No OpenAI package or API key; summarising with the local backend")
+        backend = "local"
+
+    def finish_kit(fresh: dict[str, Any]) -> None:
+        """Merge, summarise and store (or stream) one collected kit."""
+        nonlocal skipped
+        slug = fresh["kit_slug"]
+        previous = stored.pop(slug, None)
+        kit_reviews = merge_kit_reviews(previous, fresh, sources)
+        update_watermarks(state, kit_reviews, sources)
 
-        all_results.append(kit_reviews)
+        if args.summarise:
+            digest = corpus_hash(kit_reviews)
+            # Local summaries are recorded as "local:<hash>", so an LLM run
+            # upgrades them while a local run accepts either kind
+            current = summarised.get(slug)
+            summary_current = current == digest or (
+                backend == "local" and current == f"local:{digest}"
+            )
+            if args.incremental and "summary" in kit_reviews and summary_current:
+                skipped += 1
+            else:
+                summary, produced_by = summarise_reviews(
+                    slug,
+                    kit_reviews,
+                    backend,
+                    token_budget=args.chunk_tokens,
+                    llm_concurrency=args.llm_concurrency,
+                    timeout=args.llm_timeout,
+                )
+                if summary:
+                    kit_reviews["summary"] = summary
+                    summarised[slug] = digest if produced_by == "llm" else f"local:{digest}"
+
+        if stream_file:
+            append_record(stream_file, kit_reviews)
+            streamed[slug] = 0
+            # Keep watermarks in step with the stream so a resumed run is consistent
+            if state_path:
+                write_json_atomic(state_path, state)
+        else:
+            stored[slug] = kit_reviews
+
+    start = time.monotonic()
+    collect_reviews(
+        pending,
+        sources,
+        args.xhs_cookie,
+        args.concurrency,
+        plan_reddit=args.reddit_search == "planned",
+        reddit_since=reddit_since,
+        on_kit=finish_kit,
+    )
+    log.info("Collection finished in %.1fs", time.monotonic() - start)
+    if "reddit" in sources:
+        log.info(
+            "Reddit comment cache: %d hits, %d fetches",
+            REDDIT_CACHE.hits,
+            REDDIT_CACHE.misses,
+        )
+    if args.reddit_cache:
+        REDDIT_CACHE.save(Path(args.reddit_cache))
+    if skipped:
+        log.info("Skipped summaries for %d kits with unchanged corpus", skipped)
 
     # Write output
-    output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(all_results, f, ensure_ascii=False, indent=2)
-
-    log.info("Done! Collected reviews for %d kits → %s", len(all_results), output_path)
+    if stream_file:
+        # Stored kits outside this run are carried over unchanged
+        for slug, kit_reviews in stored.items():
+            if slug not in streamed:
+                append_record(stream_file, kit_reviews)
+        stream_file.close()
+        count = finalize_stream(stream, output_path, "kit_slug", ALL_KIT_SLUGS)
+    else:
+        all_results = [stored[s] for s in ALL_KIT_SLUGS if s in stored]
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(all_results, f, ensure_ascii=False, indent=2)
+        count = len(all_results)
+    if state_path:
+        write_json_atomic(state_path, state)
+
+    log.info("Done! Collected reviews for %d kits → %s", count, output_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+shopify_stub.py — Record lovevery.com product JSON and serve it from a local
+stub, so scrape_lovevery_official.py can be run and tested offline.
+
+The stub maps the last segment of a request path to a file in the fixture
+directory (``/products/the-play-kits-the-looker.json`` ->
+``the-play-kits-the-looker.json``; paths without an extension get ``.html``)
+and answers conditional requests with 304 using a content-hash ETag, so the
+page cache's revalidation path can be exercised too.
+
+Usage:
+    python shopify_stub.py record --kit looker charmer      # save live product JSON
+    python shopify_stub.py record --html                     # also save the HTML pages
+    python shopify_stub.py serve --port 8000                 # serve fixtures/shopify/
+
+    python scrape_lovevery_official.py --base-url http://127.0.0.1:8000 \\
+        --no-page-cache --kit looker
+
+Requirements:
+    pip install requests   (only for `record`)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+DEFAULT_FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "shopify"
+DEFAULT_PORT = 8000
+
+CONTENT_TYPES = {
+    ".json": "application/json; charset=utf-8",
+    ".xml": "application/xml; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+}
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+)
+log = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Stub server
+# ---------------------------------------------------------------------------
+
+
+def fixture_name(path: str) -> str:
+    """Map a request path to its fixture file name."""
+    name = path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1] or "index"
+    return name if Path(name).suffix in CONTENT_TYPES else name + ".html"
+
+
+def make_handler(fixture_dir: Path) -> type[BaseHTTPRequestHandler]:
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+            path = fixture_dir / fixture_name(self.path)
+            if not path.is_file():
+                self.send_error(404, f"No fixture {path.name}")
+                return
+            body = path.read_bytes()
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPES[path.suffix])
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            log.info("%s %s", self.address_string(), format % args)
+
+    return StubHandler
+
+
+def serve(fixture_dir: Path, port: int) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fixture_dir))
+    log.info("Serving %s on http://127.0.0.1:%d", fixture_dir, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+
+def record(slugs: list[str], fixture_dir: Path, include_html: bool) -> None:
+    import requests
+
+    from page_cache import HEADERS
+    from scrape_lovevery_official import BASE_URL, PLAY_KITS_PATH
+
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    session = requests.Session()
+    for slug in slugs:
+        url = f"{BASE_URL}{PLAY_KITS_PATH}-the-{slug}"
+        for target in [url + ".json"] + ([url] if include_html else []):
+            try:
+                resp = session.get(target, headers=HEADERS, timeout=30)
+                resp.raise_for_status()
+            except requests.RequestException as exc:
+                log.error("Failed to record %s: %s", target, exc)
+                continue
+            path = fixture_dir / fixture_name(target)
+            path.write_bytes(resp.content)
+            log.info("Recorded %s (%d bytes)", path.name, len(resp.content))
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Record and serve Lovevery product JSON for offline scraping.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s serve                          # Serve fixtures/shopify on :8000
+  %(prog)s serve --port 9000 --dir /tmp/fixtures
+  %(prog)s record --kit looker            # Refresh one fixture from the live store
+  %(prog)s record --html                  # All kits, JSON and HTML
+        """,
+    )
+    parser.add_argument(
+        "--dir",
+        type=str,
+        default=str(DEFAULT_FIXTURE_DIR),
+        help="Fixture directory (default: scripts/fixtures/shopify)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Serve recorded fixtures")
+    serve_parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})"
+    )
+
+    record_parser = subparsers.add_parser("record", help="Record live product JSON")
+    record_parser.add_argument(
+        "--kit", nargs="+", metavar="SLUG", help="Kit slug(s) to record (default: all kits)"
+    )
+    record_parser.add_argument(
+        "--html", action="store_true", help="Also record the full HTML kit pages"
+    )
+
+    args = parser.parse_args()
+    fixture_dir = Path(args.dir)
+
+    if args.command == "serve":
+        if not fixture_dir.is_dir():
+            log.error("Fixture directory not found: %s", fixture_dir)
+            sys.exit(1)
+        serve(fixture_dir, args.port)
+    else:
+        from scrape_lovevery_official import ALL_KIT_SLUGS
+
+        record(args.kit or ALL_KIT_SLUGS, fixture_dir, args.html)
+
+
+if __name__ == "__main__":
+    main()
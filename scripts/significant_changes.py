@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+significant_changes.py — Publish a fresh alternatives scrape only when a
+visitor would notice the difference.
+
+Every Amazon scrape moves some numbers a little: a review count goes from
+1245 to 1247, a price is reformatted, a rating wobbles in its second
+decimal, an image URL gains a different size suffix.  Committing those
+diffs costs a commit, a push and a full site rebuild each time while
+nothing on the page changes.  This script compares a candidate scrape with
+the committed lovevery_alternatives.json field by field and overwrites the
+committed file only if at least one difference is significant:
+
+  - price        relative change of at least --price-pct percent (prices
+                 are compared as numbers, so "$19.99" == "19.99")
+  - rating       absolute change of at least --rating-delta
+  - reviewCount  moves to another logarithmic bucket (--review-buckets per
+                 power of ten), i.e. the shown magnitude changes
+  - imageUrl     the Amazon image ID changes (size suffixes are ignored)
+  - anything else (names, reasons, links, added, removed or reordered kits,
+    toys and alternatives) is always significant.
+
+Insignificant differences are recorded in a side cache (not committed) with
+both the committed and the latest value.  Drift accumulates against the
+committed value, so a price that creeps up by 1% a week is published once
+the total reaches the threshold.  When something significant changed, the
+whole candidate is published, including the pending small changes.
+
+Usage:
+    python significant_changes.py --candidate /tmp/alternatives.json
+    python significant_changes.py --candidate new.json --price-pct 10 --dry-run
+
+Requirements:
+    No external dependencies (stdlib only).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_COMMITTED = SCRIPT_DIR / "lovevery_alternatives.json"
+DEFAULT_SIDE_CACHE = SCRIPT_DIR / ".alternatives_churn.json"
+
+DEFAULT_PRICE_PCT = 5.0
+DEFAULT_RATING_DELTA = 0.1
+DEFAULT_REVIEW_BUCKETS = 4  # per power of ten: 1000, 1778, 3162, 5623, 10000, ...
+
+PRICE_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+AMAZON_IMAGE_ID_RE = re.compile(r"/images/I/([^./]+)")
+MAX_LOGGED_CHANGES = 20
+
+# ---------------------------------------------------------------------------
+# Logging
+# ---------------------------------------------------------------------------
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    datefmt="%H:%M:%S",
+)
+log = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# Significance rules
+# ---------------------------------------------------------------------------
+
+
+class Thresholds(NamedTuple):
+    price_pct: float = DEFAULT_PRICE_PCT
+    rating_delta: float = DEFAULT_RATING_DELTA
+    review_buckets: int = DEFAULT_REVIEW_BUCKETS
+
+
+class Change(NamedTuple):
+    key: str  # "kit", "kit/toy" or "kit/toy/asin"; "" for the structure
+    field: str
+    old: Any
+    new: Any
+    significant: bool
+
+
+def parse_price(value: Any) -> float | None:
+    """Numeric value of a price such as ``"$1,299.00"``; None if there is none."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = PRICE_RE.search(str(value or ""))
+    return float(match.group().replace(",", "")) if match else None
+
+
+def price_significant(old: Any, new: Any, thresholds: Thresholds) -> bool:
+    old_value, new_value = parse_price(old), parse_price(new)
+    if old_value is None or new_value is None:
+        # "N/A" and friends: only a real switch to or from a price counts
+        return (old_value is None) != (new_value is None) or str(old) != str(new)
+    if old_value == 0:
+        return new_value != 0
+    return abs(new_value - old_value) / old_value * 100 >= thresholds.price_pct
+
+
+def rating_significant(old: Any, new: Any, thresholds: Thresholds) -> bool:
+    if old is None or new is None:
+        return (old is None) != (new is None)
+    # The epsilon keeps 4.5 -> 4.6 significant despite float rounding
+    return abs(float(new) - float(old)) >= thresholds.rating_delta - 1e-9
+
+
+def review_bucket(count: Any, buckets: int) -> int:
+    """Logarithmic bucket of a review count; -1 for none."""
+    if not count or count <= 0:
+        return -1
+    return math.floor(math.log10(count) * buckets)
+
+
+def review_count_significant(old: Any, new: Any, thresholds: Thresholds) -> bool:
+    return review_bucket(old, thresholds.review_buckets) != review_bucket(
+        new, thresholds.review_buckets
+    )
+
+
+def image_id(url: Any) -> str:
+    """Amazon image ID of *url* (``71xKqLJlHRL``), or the URL itself otherwise."""
+    match = AMAZON_IMAGE_ID_RE.search(str(url or ""))
+    return match.group(1) if match else str(url or "")
+
+
+def image_significant(old: Any, new: Any, thresholds: Thresholds) -> bool:
+    return image_id(old) != image_id(new)
+
+
+# Fields not listed here are significant on any change
+FIELD_RULES: dict[str, Callable[[Any, Any, Thresholds], bool]] = {
+    "price": price_significant,
+    "rating": rating_significant,
+    "reviewCount": review_count_significant,
+    "imageUrl": image_significant,
+}
+
+# ---------------------------------------------------------------------------
+# Semantic diff
+# ---------------------------------------------------------------------------
+
+
+def flatten(data: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Map every kit, toy and alternative to its scalar fields, in file order."""
+    records: dict[str, dict[str, Any]] = {}
+    for kit in data:
+        kit_key = kit.get("kitId", "")
+        records[kit_key] = {k: v for k, v in kit.items() if k != "toys"}
+        for toy in kit.get("toys", []):
+            toy_key = f"{kit_key}/{toy.get('toyName', '')}"
+            records[toy_key] = {k: v for k, v in toy.items() if k != "alternatives"}
+            for alt in toy.get("alternatives", []):
+                records[f"{toy_key}/{alt.get('asin') or alt.get('name', '')}"] = dict(alt)
+    return records
+
+
+def diff_alternatives(
+    committed: list[dict[str, Any]],
+    candidate: list[dict[str, Any]],
+    thresholds: Thresholds,
+) -> list[Change]:
+    """List every field-level difference, each marked significant or not."""
+    old_records, new_records = flatten(committed), flatten(candidate)
+    changes: list[Change] = []
+    if list(old_records) != list(new_records):
+        added = [k for k in new_records if k not in old_records]
+        removed = [k for k in old_records if k not in new_records]
+        changes.append(Change("", "structure", removed, added, True))
+    for key, new in new_records.items():
+        old = old_records.get(key)
+        if old is None:
+            continue
+        for field in list(old) + [f for f in new if f not in old]:
+            old_value, new_value = old.get(field), new.get(field)
+            if old_value == new_value:
+                continue
+            rule = FIELD_RULES.get(field)
+            significant = rule(old_value, new_value, thresholds) if rule else True
+            changes.append(Change(key, field, old_value, new_value, significant))
+    return changes
+
+
+# ---------------------------------------------------------------------------
+# Side cache and publishing
+# ---------------------------------------------------------------------------
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def save_side_cache(path: Path, committed_path: Path, pending: list[Change]) -> None:
+    """Record the held-back changes against the committed file they apply to."""
+    entries: dict[str, dict[str, Any]] = {}
+    for change in pending:
+        entries.setdefault(change.key, {})[change.field] = {
+            "committed": change.old,
+            "latest": change.new,
+        }
+    cache = {
+        "committed_sha256": file_digest(committed_path),
+        "checked_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "pending": entries,
+    }
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def publish(candidate_path: Path, committed_path: Path) -> None:
+    """Replace the committed file with the candidate's exact bytes."""
+    tmp = committed_path.with_suffix(".tmp")
+    shutil.copyfile(candidate_path, tmp)
+    os.replace(tmp, committed_path)
+
+
+def log_changes(changes: list[Change], significant: bool) -> None:
+    selected = [c for c in changes if c.significant == significant]
+    level = logging.INFO if significant else logging.DEBUG
+    for change in selected[:MAX_LOGGED_CHANGES]:
+        if change.field == "structure":
+            log.log(level, "  structure: removed %s, added %s", change.old, change.new)
+        else:
+            log.log(level, "  %s %s: %r -> %r", change.key, change.field, change.old, change.new)
+    if len(selected) > MAX_LOGGED_CHANGES:
+        log.log(level, "  ... and %d more", len(selected) - MAX_LOGGED_CHANGES)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Publish an alternatives scrape only if it changes something visible.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --candidate /tmp/alternatives.json          # Publish if significant
+  %(prog)s --candidate new.json --dry-run -v           # Show every difference
+  %(prog)s --candidate new.json --price-pct 10 --rating-delta 0.2
+        """,
+    )
+    parser.add_argument(
+        "--candidate",
+        type=str,
+        required=True,
+        help="Freshly scraped alternatives JSON",
+    )
+    parser.add_argument(
+        "--committed",
+        type=str,
+        default=str(DEFAULT_COMMITTED),
+        help="Published alternatives JSON, overwritten only on a significant "
+        "change (default: scripts/lovevery_alternatives.json)",
+    )
+    parser.add_argument(
+        "--side-cache",
+        type=str,
+        default=str(DEFAULT_SIDE_CACHE),
+        help="Where held-back insignificant changes are recorded "
+        "(default: scripts/.alternatives_churn.json)",
+    )
+    parser.add_argument(
+        "--price-pct",
+        type=float,
+        default=DEFAULT_PRICE_PCT,
+        help=f"Relative price change that is significant, in percent (default: {DEFAULT_PRICE_PCT:g})",
+    )
+    parser.add_argument(
+        "--rating-delta",
+        type=float,
+        default=DEFAULT_RATING_DELTA,
+        help=f"Absolute rating change that is significant (default: {DEFAULT_RATING_DELTA:g})",
+    )
+    parser.add_argument(
+        "--review-buckets",
+        type=int,
+        default=DEFAULT_REVIEW_BUCKETS,
+        help="Review-count buckets per power of ten; crossing a bucket boundary "
+        f"is significant (default: {DEFAULT_REVIEW_BUCKETS})",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the differences without writing any file",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Also list insignificant differences"
+    )
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    candidate_path, committed_path = Path(args.candidate), Path(args.committed)
+    try:
+        with open(candidate_path, "r", encoding="utf-8") as f:
+            candidate = json.load(f)
+    except (OSError, json.JSONDecodeError) as exc:
+        log.error("Cannot read candidate %s: %s", candidate_path, exc)
+        sys.exit(1)
+
+    if not committed_path.is_file():
+        log.info("No committed file yet; publishing %s", candidate_path)
+        if not args.dry_run:
+            publish(candidate_path, committed_path)
+        return
+    with open(committed_path, "r", encoding="utf-8") as f:
+        committed = json.load(f)
+
+    thresholds = Thresholds(args.price_pct, args.rating_delta, max(args.review_buckets, 1))
+    changes = diff_alternatives(committed, candidate, thresholds)
+    significant = [c for c in changes if c.significant]
+    pending = [c for c in changes if not c.significant]
+    log.info(
+        "%d significant and %d insignificant difference(s) from %s",
+        len(significant),
+        len(pending),
+        committed_path.name,
+    )
+    log_changes(changes, significant=True)
+    log_changes(changes, significant=False)
+
+    if args.dry_run:
+        return
+    if significant:
+        publish(candidate_path, committed_path)
+        log.info("Published %s", committed_path)
+        pending = []
+    else:
+        log.info("Nothing visible changed; %s left untouched", committed_path.name)
+    save_side_cache(Path(args.side_cache), committed_path, pending)
+
+
+if __name__ == "__main__":
+    main()